@@ -285,14 +285,19 @@ def run_research(
     do_polish_article: bool = True,
 ) -> None:
     runner = _make_default_runner(output_dir)
-    runner.run(
-        topic=topic,
-        do_research=do_research,
-        do_generate_outline=do_generate_outline,
-        do_generate_article=do_generate_article,
-        do_polish_article=do_polish_article,
-    )
-    runner.post_run()
+    try:
+        runner.run(
+            topic=topic,
+            do_research=do_research,
+            do_generate_outline=do_generate_outline,
+            do_generate_article=do_generate_article,
+            do_polish_article=do_polish_article,
+        )
+        runner.post_run()
+    finally:
+        # Runners built by custom factories may not hold any resources
+        if hasattr(runner, "close"):
+            runner.close()
 
     if vault:
         try:
@@ -71,6 +71,22 @@ def main(argv=None):
     )
     ingest_p.add_argument("--reddit-client-id")
     ingest_p.add_argument("--reddit-client-secret")
+    ingest_p.add_argument(
+        "--workers",
+        type=int,
+        help="Fetch workers for the ingestion pipeline (0 handles files inline)",
+    )
+    ingest_p.add_argument(
+        "--once",
+        action="store_true",
+        help="Ingest new or changed files under --root and exit instead of watching",
+    )
+    ingest_p.add_argument(
+        "--no-scan",
+        dest="scan",
+        action="store_false",
+        help="Do not catch up on existing files before watching",
+    )
 
     args = parser.parse_args(argv)
 
@@ -124,14 +140,22 @@ def main(argv=None):
             )
             raise SystemExit(message)
 
-        start_watcher(
+        report = start_watcher(
             root=args.root,
             twitter_limit=args.twitter_limit,
             reddit_limit=args.reddit_limit,
             fourchan_limit=args.fourchan_limit,
             reddit_client_id=args.reddit_client_id,
             reddit_client_secret=args.reddit_client_secret,
+            workers=args.workers,
+            once=args.once,
+            scan=args.scan,
         )
+        if args.once and report is not None:
+            print(
+                f"Ingested {len(report.new)} new and {len(report.changed)} changed "
+                f"files ({report.unchanged} unchanged, {len(report.removed)} removed)"
+            )
     elif args.command == "search":
         results = search_sync(
             args.query,
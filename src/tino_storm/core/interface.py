@@ -1,15 +1,19 @@
+import asyncio
 import concurrent.futures
 import dspy
 import functools
 import hashlib
+import inspect
 import json
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from typing import Dict, List, Optional, Union, TYPE_CHECKING
 
 from .utils import ArticleTextProcessing
+from ..ratelimit import bind_flow
 
 logging.basicConfig(
     level=logging.INFO, format="%(name)s : %(levelname)-8s : %(message)s"
@@ -251,6 +255,10 @@ class Article(ABC):
             return node
 
 
+# Pool size per ``max_thread``: room for several concurrent callers
+_POOL_HEADROOM = 4
+
+
 class Retriever:
     """
     An abstract base class for retriever modules. It provides a template for retrieving information based on a query.
@@ -260,9 +268,81 @@ class Retriever:
     The retrieval model/search engine used for each part should be declared with a suffix '_rm' in the attribute name.
     """
 
-    def __init__(self, rm: dspy.Retrieve, max_thread: int = 1):
+    def __init__(
+        self, rm: dspy.Retrieve, max_thread: int = 1, timeout: Optional[float] = None
+    ):
         self.max_thread = max_thread
         self.rm = rm
+        # Default per-query deadline in seconds, counted from when the query
+        # starts running; ``None`` waits for every query
+        self.timeout = timeout
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Pool workers currently running a query, including queries that
+        # were abandoned at their deadline and are still blocked
+        self._busy = 0
+
+    def _pool_size(self) -> int:
+        return max(1, self.max_thread) * _POOL_HEADROOM
+
+    def _pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        # Created on first use and reused by every turn until ``close``. Each
+        # call runs at most ``max_thread`` queries at once; the headroom lets
+        # concurrent callers (one per persona) share the pool.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._pool_size(),
+                    thread_name_prefix="storm-retriever",
+                )
+            return self._executor
+
+    def _submit(self, fn, *args) -> concurrent.futures.Future:
+        """Run ``fn(*args)`` on a free pool worker or on a thread of its own.
+
+        Work is never queued inside the pool: once every worker is busy, for
+        instance blocked on queries abandoned at their deadline, the call
+        gets a dedicated thread so it cannot wait behind a hung backend.
+        """
+        pool = self._pool()
+        with self._executor_lock:
+            overflow = self._executor is not pool or self._busy >= self._pool_size()
+            if not overflow:
+                self._busy += 1
+
+        if overflow:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+
+            def run_alone() -> None:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+
+            threading.Thread(
+                target=run_alone, name="storm-retriever-overflow", daemon=True
+            ).start()
+            return future
+
+        def run_pooled():
+            try:
+                return fn(*args)
+            finally:
+                with self._executor_lock:
+                    if self._executor is pool:
+                        self._busy -= 1
+
+        return pool.submit(run_pooled)
+
+    def close(self) -> None:
+        """Shut down the worker threads; a later ``retrieve`` starts new ones."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            self._busy = 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def collect_and_reset_rm_usage(self):
         combined_usage = []
@@ -279,38 +359,142 @@ class Retriever:
 
         return name_to_usage
 
+    @staticmethod
+    def _to_information(q: str, retrieved_data_list) -> List[Information]:
+        local_to_return = []
+        for data in retrieved_data_list or []:
+            for i in range(len(data["snippets"])):
+                # STORM generate the article with citations. We do not consider multi-hop citations.
+                # Remove citations in the source to avoid confusion.
+                data["snippets"][i] = ArticleTextProcessing.remove_citations(
+                    data["snippets"][i]
+                )
+            storm_info = Information.from_dict(data)
+            storm_info.meta["query"] = q
+            local_to_return.append(storm_info)
+        return local_to_return
+
+    def _process_query(self, q: str, exclude_urls: List[str]) -> List[Information]:
+        return self._to_information(
+            q, self.rm(query_or_queries=[q], exclude_urls=exclude_urls)
+        )
+
     def retrieve(
-        self, query: Union[str, List[str]], exclude_urls: List[str] = []
+        self,
+        query: Union[str, List[str]],
+        exclude_urls: List[str] = [],
+        *,
+        timeout: Optional[float] = None,
     ) -> List[Information]:
+        """Retrieve *query* in parallel on the retriever's worker threads.
+
+        At most ``max_thread`` of the queries run at once. A query still
+        running *timeout* seconds (``self.timeout`` by default) after it
+        started is logged and left out of the result, so one hung backend
+        does not hold up the caller. Queries start right away: when hung
+        queries occupy every pool worker, new ones run on threads of their
+        own.
+        """
         queries = query if isinstance(query, list) else [query]
-        to_return = []
-
-        def process_query(q):
-            retrieved_data_list = self.rm(
-                query_or_queries=[q], exclude_urls=exclude_urls
+        timeout = self.timeout if timeout is None else timeout
+        process_query = bind_flow(self._process_query)
+        started: Dict[int, float] = {}
+
+        def run(i: int, q: str) -> List[Information]:
+            started[i] = time.monotonic()
+            return process_query(q, exclude_urls)
+
+        results: List[List[Information]] = [[] for _ in queries]
+        pending = list(enumerate(queries))[::-1]
+        running: Dict[concurrent.futures.Future, int] = {}
+        while pending or running:
+            while pending and len(running) < max(1, self.max_thread):
+                i, q = pending.pop()
+                running[self._submit(run, i, q)] = i
+
+            wait_for = None
+            if timeout is not None:
+                deadlines = [
+                    started[i] + timeout for i in running.values() if i in started
+                ]
+                # Until a query starts there is no deadline to wait for; poll
+                wait_for = (
+                    max(0.0, min(deadlines) - time.monotonic())
+                    if deadlines
+                    else timeout
+                )
+            done, _ = concurrent.futures.wait(
+                running,
+                timeout=wait_for,
+                return_when=concurrent.futures.FIRST_COMPLETED,
             )
-            local_to_return = []
-            for data in retrieved_data_list:
-                for i in range(len(data["snippets"])):
-                    # STORM generate the article with citations. We do not consider multi-hop citations.
-                    # Remove citations in the source to avoid confusion.
-                    data["snippets"][i] = ArticleTextProcessing.remove_citations(
-                        data["snippets"][i]
-                    )
-                storm_info = Information.from_dict(data)
-                storm_info.meta["query"] = q
-                local_to_return.append(storm_info)
-            return local_to_return
-
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_thread
-        ) as executor:
-            results = list(executor.map(process_query, queries))
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+            if timeout is not None:
+                now = time.monotonic()
+                for future, i in list(running.items()):
+                    if i in started and now - started[i] >= timeout:
+                        # The worker stays busy until the backend returns, but
+                        # this call moves on to its remaining queries
+                        del running[future]
+                        logger.warning(
+                            "Retrieval for %r exceeded the %ss deadline; skipping",
+                            queries[i],
+                            timeout,
+                        )
+        return [info for result in results for info in result]
+
+    async def retrieve_async(
+        self,
+        query: Union[str, List[str]],
+        exclude_urls: List[str] = [],
+        *,
+        timeout: Optional[float] = None,
+    ) -> List[Information]:
+        """Asynchronous :meth:`retrieve`.
 
-        for result in results:
-            to_return.extend(result)
+        Retrieval models with an ``aforward`` coroutine are awaited directly;
+        others run on the retriever's worker threads, at most ``max_thread``
+        at a time. The deadline applies the same way as in :meth:`retrieve`.
+        """
+        queries = query if isinstance(query, list) else [query]
+        timeout = self.timeout if timeout is None else timeout
+        aforward = getattr(self.rm, "aforward", None)
+        native = aforward is not None and inspect.iscoroutinefunction(aforward)
+        loop = asyncio.get_running_loop()
+        process_query = bind_flow(self._process_query)
+        slots = asyncio.Semaphore(max(1, self.max_thread))
+
+        async def run_in_pool(q: str) -> List[Information]:
+            started = asyncio.Event()
+
+            def run() -> List[Information]:
+                loop.call_soon_threadsafe(started.set)
+                return process_query(q, exclude_urls)
+
+            future = asyncio.wrap_future(self._submit(run))
+            await started.wait()
+            return await asyncio.wait_for(future, timeout)
+
+        async def bounded(q: str) -> List[Information]:
+            try:
+                if native:
+                    data = await asyncio.wait_for(
+                        aforward(query_or_queries=[q], exclude_urls=exclude_urls),
+                        timeout,
+                    )
+                    return self._to_information(q, data)
+                async with slots:
+                    return await run_in_pool(q)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Retrieval for %r exceeded the %ss deadline; skipping", q, timeout
+                )
+                return []
 
-        return to_return
+        results = await asyncio.gather(*(bounded(q) for q in queries))
+        return [info for result in results for info in result]
 
 
 class KnowledgeCurationModule(ABC):
@@ -503,6 +687,18 @@ class Engine(ABC):
 
         return wrapper
 
+    def close(self):
+        """Release the worker threads held by the engine's retriever."""
+        retriever = getattr(self, "retriever", None)
+        if retriever is not None and hasattr(retriever, "close"):
+            retriever.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def apply_decorators(self):
         """Apply decorators to methods that need them."""
         methods_to_decorate = [
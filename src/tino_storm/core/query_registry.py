@@ -0,0 +1,123 @@
+"""Run-scoped sharing of retrieval results between concurrent conversations.
+
+STORM simulates one conversation per persona in parallel, and the personas
+tend to ask overlapping search queries. A :class:`QueryRegistry` lives for one
+knowledge curation run and sits in front of the :class:`Retriever`: queries
+are normalized with :func:`~tino_storm.core.rm_cache.normalize_query`, a query
+that is already being retrieved by another thread is waited for instead of
+sent again, and repeated queries are served from the run's earlier results.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Sequence, Tuple
+
+from .interface import Information, Retriever
+from .rm_cache import normalize_query
+
+_Key = Tuple[str, Tuple[str, ...]]
+
+
+def _copy(info: Information) -> Information:
+    # Callers merge snippets into the objects they receive, so never share them
+    return Information(
+        url=info.url,
+        description=info.description,
+        snippets=list(info.snippets),
+        title=info.title,
+        meta=dict(info.meta),
+    )
+
+
+class QueryRegistry:
+    """Coalesce and reuse retrievals of identical queries within one run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: Dict[_Key, "Future[List[Information]]"] = {}
+        self.requested = 0
+        self.retrieved = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def retrieve(
+        self, retriever: Retriever, queries: Sequence[str], exclude_urls: List[str]
+    ) -> List[Information]:
+        """Retrieve *queries* through *retriever*, sharing results across callers."""
+
+        excluded = tuple(sorted(set(exclude_urls)))
+        keys: Dict[_Key, str] = {}
+        for query in queries:
+            keys.setdefault((normalize_query(query), excluded), query)
+
+        owned: Dict[_Key, "Future[List[Information]]"] = {}
+        waiting: Dict[_Key, "Future[List[Information]]"] = {}
+        with self._lock:
+            self.requested += len(keys)
+            for key in keys:
+                future = self._results.get(key)
+                if future is None:
+                    future = self._results[key] = Future()
+                    owned[key] = future
+                elif future.done():
+                    self.cache_hits += 1
+                else:
+                    self.coalesced += 1
+                waiting[key] = future
+            self.retrieved += len(owned)
+
+        if owned:
+            self._retrieve_owned(retriever, keys, owned, exclude_urls)
+
+        collected: List[Information] = []
+        for key, query in keys.items():
+            for info in waiting[key].result():
+                info = _copy(info)
+                info.meta["query"] = query
+                collected.append(info)
+        return collected
+
+    def _retrieve_owned(
+        self,
+        retriever: Retriever,
+        keys: Dict[_Key, str],
+        owned: Dict[_Key, "Future[List[Information]]"],
+        exclude_urls: List[str],
+    ) -> None:
+        by_query: Dict[str, List[Information]] = {keys[key]: [] for key in owned}
+        try:
+            results = retriever.retrieve(list(by_query), exclude_urls=exclude_urls)
+        except BaseException as exc:
+            with self._lock:
+                for key, future in owned.items():
+                    # Let a later turn retry instead of replaying the failure
+                    self._results.pop(key, None)
+                    future.set_exception(exc)
+            raise
+        for info in results:
+            by_query.setdefault(info.meta.get("query"), []).append(info)
+        with self._lock:
+            for key, future in owned.items():
+                # Empty results are usually a swallowed backend error or a
+                # query skipped at its deadline; answer the current waiters
+                # but let a later turn retry
+                if not by_query[keys[key]]:
+                    self._results.pop(key, None)
+                future.set_result(by_query[keys[key]])
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many retrievals the registry saved."""
+
+        with self._lock:
+            return {
+                "requested": self.requested,
+                "retrieved": self.retrieved,
+                "cache_hits": self.cache_hits,
+                "coalesced": self.coalesced,
+                "saved": self.cache_hits + self.coalesced,
+            }
+
+
+__all__ = ["QueryRegistry"]
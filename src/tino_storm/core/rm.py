@@ -1,18 +1,96 @@
+import atexit
 import logging
 import os
-from typing import Callable, Union, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Union, List, Optional, Tuple
 
 import asyncio
 import backoff
 import dspy
 import requests
+from requests.adapters import HTTPAdapter
 
+from ..env import env_int
+from ..ratelimit import bind_flow, throttle
 from ..security import log_request
 from dsp import backoff_hdlr, giveup_hdlr
 from ..events import ResearchAdded, event_emitter
 
 from .utils import WebPageHelper
 
+# Concurrent search API calls per process, shared by every retriever
+SEARCH_THREADS = max(1, env_int("STORM_SEARCH_THREADS", 8))
+
+_SESSION: Optional[requests.Session] = None
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def search_session() -> requests.Session:
+    """Return the pooled HTTP session shared by the search retrievers."""
+
+    global _SESSION
+    with _POOL_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=SEARCH_THREADS, pool_maxsize=SEARCH_THREADS
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _search_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _POOL_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, SEARCH_THREADS), thread_name_prefix="storm-search"
+            )
+            atexit.register(_EXECUTOR.shutdown, wait=False, cancel_futures=True)
+        return _EXECUTOR
+
+
+def _capture(
+    search: Callable[[str], Any], query: str
+) -> Tuple[Any, Optional[Exception]]:
+    try:
+        return search(query), None
+    except Exception as exc:  # noqa: BLE001 - handled by the caller per query
+        return None, exc
+
+
+def map_queries(
+    search: Callable[[str], Any], queries: List[str]
+) -> List[Tuple[str, Any, Optional[Exception]]]:
+    """Run ``search(query)`` for all *queries* concurrently.
+
+    Returns ``(query, result, error)`` in query order; exceptions are returned
+    instead of raised so each retriever keeps its own error handling.
+    """
+
+    if len(queries) <= 1:
+        return [(q, *_capture(search, q)) for q in queries]
+    executor = _search_executor()
+    futures = [executor.submit(bind_flow(_capture), search, q) for q in queries]
+    return [(q, *f.result()) for q, f in zip(queries, futures)]
+
+
+def _note_query(result: Dict[str, Any], query: str) -> Dict[str, Any]:
+    """Add *query* to the ``queries`` that returned *result*.
+
+    Retrievers that merge the results of several queries tag them this way so
+    :class:`~tino_storm.core.rm_cache.CachedRM` can cache them per query.
+    """
+
+    queries = result.setdefault("queries", [])
+    if query not in queries:
+        queries.append(query)
+    return result
+
 
 class YouRM(dspy.Retrieve):
     def __init__(self, ydc_api_key=None, k=3, is_valid_source: Callable = None):
@@ -62,6 +140,7 @@ class YouRM(dspy.Retrieve):
             try:
                 headers = {"X-API-Key": self.ydc_api_key}
                 url = f"https://api.ydc-index.io/search?query={query}"
+                throttle(url)
                 log_request("GET", url)
                 results = requests.get(
                     url,
@@ -127,6 +206,7 @@ class BingSearch(dspy.Retrieve):
             self.bing_api_key = os.environ["BING_SEARCH_API_KEY"]
         self.endpoint = "https://api.bing.microsoft.com/v7.0/search"
         self.params = {"mkt": mkt, "setLang": language, "count": k, **kwargs}
+        self.session = search_session()
         self.webpage_helper = WebPageHelper(
             min_char_count=min_char_count,
             snippet_chunk_size=snippet_chunk_size,
@@ -173,32 +253,44 @@ class BingSearch(dspy.Retrieve):
         url_to_results = {}
 
         headers = {"Ocp-Apim-Subscription-Key": self.bing_api_key}
-
-        for query in queries:
-            try:
-                log_request("GET", self.endpoint)
-                results = requests.get(
-                    self.endpoint,
-                    headers=headers,
-                    params={**self.params, "q": query},
-                    timeout=self.timeout if timeout is None else timeout,
-                ).json()
-
-                for d in results["webPages"]["value"]:
-                    if self.is_valid_source(d["url"]) and d["url"] not in exclude_urls:
-                        url_to_results[d["url"]] = {
-                            "url": d["url"],
-                            "title": d["name"],
-                            "description": d["snippet"],
-                        }
-            except requests.RequestException as e:
-                logging.error(f"Error occurs when searching query {query}: {e}")
+        timeout = self.timeout if timeout is None else timeout
+
+        def search(query):
+            throttle(self.endpoint)
+            log_request("GET", self.endpoint)
+            return self.session.get(
+                self.endpoint,
+                headers=headers,
+                params={**self.params, "q": query},
+                timeout=timeout,
+            ).json()
+
+        for query, results, error in map_queries(search, queries):
+            if isinstance(error, requests.RequestException):
+                logging.error(f"Error occurs when searching query {query}: {error}")
                 asyncio.run(
                     event_emitter.emit(
-                        ResearchAdded(topic=query, information_table={"error": str(e)})
+                        ResearchAdded(
+                            topic=query, information_table={"error": str(error)}
+                        )
                     )
                 )
                 return []
+            if error is not None:
+                logging.error(f"Error occurs when searching query {query}: {error}")
+                continue
+            try:
+                for d in results["webPages"]["value"]:
+                    if self.is_valid_source(d["url"]) and d["url"] not in exclude_urls:
+                        result = url_to_results.setdefault(
+                            d["url"],
+                            {
+                                "url": d["url"],
+                                "title": d["name"],
+                                "description": d["snippet"],
+                            },
+                        )
+                        _note_query(result, query)
             except Exception as e:  # noqa: BLE001
                 logging.error(f"Error occurs when searching query {query}: {e}")
 
@@ -404,6 +496,7 @@ class StanfordOvalArxivRM(dspy.Retrieve):
     def _retrieve(self, query: str):
         payload = {"query": query, "num_blocks": self.k, "rerank": self.rerank}
 
+        throttle(self.endpoint)
         log_request("POST", self.endpoint)
         response = requests.post(
             self.endpoint, json=payload, headers={"Content-Type": "application/json"}
@@ -517,6 +610,7 @@ class SerperRM(dspy.Retrieve):
             self.serper_search_api_key = os.environ["SERPER_API_KEY"]
 
         self.base_url = "https://google.serper.dev"
+        self.session = search_session()
 
     def serper_runner(self, query_params):
         self.search_url = f"{self.base_url}/search"
@@ -526,9 +620,10 @@ class SerperRM(dspy.Retrieve):
             "Content-Type": "application/json",
         }
 
+        throttle(self.search_url)
         log_request("POST", self.search_url)
-        response = requests.request(
-            "POST", self.search_url, headers=headers, json=query_params
+        response = self.session.post(
+            self.search_url, headers=headers, json=query_params
         )
 
         if response is None:
@@ -562,61 +657,66 @@ class SerperRM(dspy.Retrieve):
         )
 
         self.usage += len(queries)
-        self.results = []
-        collected_results = []
-        for query in queries:
-            if query == "Queries:":
-                continue
-            query_params = self.query_params
-
-            # All available parameters can be found in the playground: https://serper.dev/playground
-            # Sets the json value for query to be the query that is being parsed.
-            query_params["q"] = query
-
-            # Sets the type to be search, can be images, video, places, maps etc that Google provides.
-            query_params["type"] = "search"
 
-            self.result = self.serper_runner(query_params)
-            self.results.append(self.result)
+        # All available parameters can be found in the playground: https://serper.dev/playground
+        # The type can be search, images, video, places, maps etc that Google provides.
+        def search(query):
+            return self.serper_runner(
+                {**self.query_params, "q": query, "type": "search"}
+            )
 
-        # Array of dictionaries that will be used by Storm to create the jsons
-        collected_results = []
+        self.results = []
+        responses = []
+        for query, result, error in map_queries(
+            search, [q for q in queries if q != "Queries:"]
+        ):
+            if error is not None:
+                raise error
+            self.result = result
+            self.results.append(result)
+            responses.append((query, result))
+
+        # Deduplicate results across queries so every page is fetched once
+        organic_by_url = {}
+        queries_by_url = {}
+        for query, result in responses:
+            knowledge_graph = result.get("knowledgeGraph")
+            for organic in result.get("organic") or []:
+                url = organic.get("link")
+                if url not in organic_by_url:
+                    organic_by_url[url] = (organic, knowledge_graph)
+                _note_query(queries_by_url.setdefault(url, {}), query)
 
         if self.ENABLE_EXTRA_SNIPPET_EXTRACTION:
-            urls = []
-            for result in self.results:
-                organic_results = result.get("organic", [])
-                for organic in organic_results:
-                    url = organic.get("link")
-                    if url:
-                        urls.append(url)
-            valid_url_to_snippets = self.webpage_helper.urls_to_snippets(urls)
+            valid_url_to_snippets = self.webpage_helper.urls_to_snippets(
+                [url for url in organic_by_url if url]
+            )
         else:
             valid_url_to_snippets = {}
 
-        for result in self.results:
+        # Array of dictionaries that will be used by Storm to create the jsons
+        collected_results = []
+        for url, (organic, knowledge_graph) in organic_by_url.items():
             try:
                 # An array of dictionaries that contains the snippets, title of the document and url that will be used.
-                organic_results = result.get("organic")
-                knowledge_graph = result.get("knowledgeGraph")
-                for organic in organic_results:
-                    snippets = [organic.get("snippet")]
-                    if self.ENABLE_EXTRA_SNIPPET_EXTRACTION:
-                        snippets.extend(
-                            valid_url_to_snippets.get(url, {}).get("snippets", [])
-                        )
-                    collected_results.append(
-                        {
-                            "snippets": snippets,
-                            "title": organic.get("title"),
-                            "url": organic.get("link"),
-                            "description": (
-                                knowledge_graph.get("description")
-                                if knowledge_graph is not None
-                                else ""
-                            ),
-                        }
+                snippets = [organic.get("snippet")]
+                if self.ENABLE_EXTRA_SNIPPET_EXTRACTION:
+                    snippets.extend(
+                        valid_url_to_snippets.get(url, {}).get("snippets", [])
                     )
+                collected_results.append(
+                    {
+                        "snippets": snippets,
+                        "title": organic.get("title"),
+                        "url": url,
+                        "description": (
+                            knowledge_graph.get("description")
+                            if knowledge_graph is not None
+                            else ""
+                        ),
+                        "queries": queries_by_url[url]["queries"],
+                    }
+                )
             except Exception:
                 continue
 
@@ -636,6 +736,7 @@ class BraveRM(dspy.Retrieve):
             self.brave_search_api_key = brave_search_api_key
         else:
             self.brave_search_api_key = os.environ["BRAVE_API_KEY"]
+        self.session = search_session()
         self.usage = 0
 
         # If not None, is_valid_source shall be a function that takes a URL and returns a boolean.
@@ -668,31 +769,41 @@ class BraveRM(dspy.Retrieve):
             else query_or_queries
         )
         self.usage += len(queries)
+        headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "X-Subscription-Token": self.brave_search_api_key,
+        }
+
+        def search(query):
+            url = f"https://api.search.brave.com/res/v1/web/search?result_filter=web&q={query}"
+            throttle(url)
+            log_request("GET", url)
+            return self.session.get(url, headers=headers).json()
+
         collected_results = []
-        for query in queries:
+        by_url = {}
+        for query, response, error in map_queries(search, queries):
+            if error is not None:
+                logging.error(f"Error occurs when searching query {query}: {error}")
+                continue
             try:
-                headers = {
-                    "Accept": "application/json",
-                    "Accept-Encoding": "gzip",
-                    "X-Subscription-Token": self.brave_search_api_key,
-                }
-                url = f"https://api.search.brave.com/res/v1/web/search?result_filter=web&q={query}"
-                log_request("GET", url)
-                response = requests.get(
-                    url,
-                    headers=headers,
-                ).json()
                 results = response.get("web", {}).get("results", [])
 
                 for result in results:
-                    collected_results.append(
+                    if result.get("url") in by_url:
+                        _note_query(by_url[result.get("url")], query)
+                        continue
+                    by_url[result.get("url")] = _note_query(
                         {
                             "snippets": result.get("extra_snippets", []),
                             "title": result.get("title"),
                             "url": result.get("url"),
                             "description": result.get("description"),
-                        }
+                        },
+                        query,
                     )
+                    collected_results.append(by_url[result.get("url")])
             except Exception as e:
                 logging.error(f"Error occurs when searching query {query}: {e}")
 
@@ -722,6 +833,7 @@ class SearXNG(dspy.Retrieve):
             raise RuntimeError("You must supply searxng_api_url")
         self.searxng_api_url = searxng_api_url
         self.searxng_api_key = searxng_api_key
+        self.session = search_session()
         self.usage = 0
 
         if is_valid_source:
@@ -759,25 +871,36 @@ class SearXNG(dspy.Retrieve):
             else {}
         )
 
-        for query in queries:
+        def search(query):
+            params = {"q": query, "format": "json"}
+            throttle(self.searxng_api_url)
+            log_request("GET", self.searxng_api_url)
+            return self.session.get(
+                self.searxng_api_url, headers=headers, params=params
+            ).json()
+
+        by_url = {}
+        for query, results, error in map_queries(search, queries):
+            if error is not None:
+                logging.error(f"Error occurs when searching query {query}: {error}")
+                continue
             try:
-                params = {"q": query, "format": "json"}
-                log_request("GET", self.searxng_api_url)
-                response = requests.get(
-                    self.searxng_api_url, headers=headers, params=params
-                )
-                results = response.json()
-
                 for r in results["results"]:
-                    if self.is_valid_source(r["url"]) and r["url"] not in exclude_urls:
-                        collected_results.append(
+                    if r["url"] in by_url:
+                        _note_query(by_url[r["url"]], query)
+                    elif (
+                        self.is_valid_source(r["url"]) and r["url"] not in exclude_urls
+                    ):
+                        by_url[r["url"]] = _note_query(
                             {
                                 "description": r.get("content", ""),
                                 "snippets": [r.get("content", "")],
                                 "title": r.get("title", ""),
                                 "url": r["url"],
-                            }
+                            },
+                            query,
                         )
+                        collected_results.append(by_url[r["url"]])
             except Exception as e:
                 logging.error(f"Error occurs when searching query {query}: {e}")
 
@@ -994,10 +1117,14 @@ class TavilySearchRM(dspy.Retrieve):
         self.usage += len(queries)
 
         collected_results = []
+        by_url = {}
 
-        for query in queries:
+        for query, responseData, error in map_queries(
+            self.tavily_client.search, queries
+        ):
+            if error is not None:
+                raise error
             #  list of dicts that will be parsed to return
-            responseData = self.tavily_client.search(query)
             results = responseData.get("results")
             for d in results:
                 # assert d is dict
@@ -1019,13 +1146,19 @@ class TavilySearchRM(dspy.Retrieve):
                     # raise exception of missing key(s)
                     if not all([url, title, description, snippets]):
                         raise ValueError(f"Missing key(s) in result: {d}")
+                    if url in by_url:
+                        _note_query(by_url[url], query)
+                        continue
                     if self.is_valid_source(url) and url not in exclude_urls:
-                        result = {
-                            "url": url,
-                            "title": title,
-                            "description": description,
-                            "snippets": snippets,
-                        }
+                        result = by_url[url] = _note_query(
+                            {
+                                "url": url,
+                                "title": title,
+                                "description": description,
+                                "snippets": snippets,
+                            },
+                            query,
+                        )
                         collected_results.append(result)
                     else:
                         print(f"invalid source {url} or url in exclude_urls")
@@ -1085,9 +1218,12 @@ class GoogleSearch(dspy.Retrieve):
         else:
             self.is_valid_source = lambda x: True
 
+        self._build = build
+        self._local = threading.local()
         self.service = build(
             "customsearch", "v1", developerKey=self.google_search_api_key
         )
+        self._local.service = self.service
         self.webpage_helper = WebPageHelper(
             min_char_count=min_char_count,
             snippet_chunk_size=snippet_chunk_size,
@@ -1100,6 +1236,15 @@ class GoogleSearch(dspy.Retrieve):
         self.usage = 0
         return {"GoogleSearch": usage}
 
+    def _thread_service(self):
+        """Return a service for this thread; API client objects are not thread-safe."""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self._build(
+                "customsearch", "v1", developerKey=self.google_search_api_key
+            )
+        return service
+
     def forward(
         self, query_or_queries: Union[str, List[str]], exclude_urls: List[str] = []
     ):
@@ -1121,29 +1266,38 @@ class GoogleSearch(dspy.Retrieve):
 
         url_to_results = {}
 
-        for query in queries:
-            try:
-                response = (
-                    self.service.cse()
-                    .list(
-                        q=query,
-                        cx=self.google_cse_id,
-                        num=self.k,
-                    )
-                    .execute()
+        def search(query):
+            return (
+                self._thread_service()
+                .cse()
+                .list(
+                    q=query,
+                    cx=self.google_cse_id,
+                    num=self.k,
                 )
+                .execute()
+            )
 
+        for query, response, error in map_queries(search, queries):
+            if error is not None:
+                logging.error(f"Error occurred while searching query {query}: {error}")
+                continue
+            try:
                 for item in response.get("items", []):
                     if (
                         self.is_valid_source(item["link"])
                         and item["link"] not in exclude_urls
                     ):
-                        url_to_results[item["link"]] = {
-                            "title": item["title"],
-                            "url": item["link"],
-                            # "snippet": item.get("snippet", ""),  # Google search snippet is very short.
-                            "description": item.get("snippet", ""),
-                        }
+                        result = url_to_results.setdefault(
+                            item["link"],
+                            {
+                                "title": item["title"],
+                                "url": item["link"],
+                                # "snippet": item.get("snippet", ""),  # Google search snippet is very short.
+                                "description": item.get("snippet", ""),
+                            },
+                        )
+                        _note_query(result, query)
 
             except Exception as e:
                 logging.error(f"Error occurred while searching query {query}: {e}")
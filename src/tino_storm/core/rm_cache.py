@@ -0,0 +1,242 @@
+"""Persistent cache for retrieval model results.
+
+:class:`CachedRM` wraps any retrieval model (a ``dspy.Retrieve`` subclass from
+:mod:`tino_storm.core.rm` or anything called the same way) and serves repeated
+queries from a SQLite cache shared across runs. Entries are keyed by backend,
+normalized query, ``k`` and the set of excluded URLs, so STORM personas and
+Co-STORM experts asking the same question only reach the search API once.
+
+Only queries that miss the cache are forwarded, all of them in one call so
+the backend can deduplicate URLs and fetch pages in a single batch. The
+wrapped model's usage counts real API calls; cache hits are reported
+separately by :meth:`CachedRM.get_usage_and_reset`. Results are split by the
+``queries`` entry retrievers tag them with; untagged results of a
+multi-query call are returned but not cached.
+
+Configuration is read from the environment:
+
+``STORM_RETRIEVAL_CACHE``
+    Set to ``0``/``off``/``false`` to disable the cache.
+``STORM_RETRIEVAL_CACHE_PATH``
+    Location of the SQLite file, ``~/.tino_storm/retrieval_cache.sqlite3`` by
+    default.
+``STORM_RETRIEVAL_CACHE_TTL``
+    Seconds before an entry expires (default one day, ``0`` never expires).
+``STORM_RETRIEVAL_CACHE_SIZE``
+    Maximum number of entries kept on disk (default 10000).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..env import env_flag, env_float, env_int
+from ..sqlite_cache import SQLiteCache
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+_DEFAULT = object()
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, whitespace and trailing punctuation of *query*."""
+
+    return _SPACE.sub(" ", query).strip().strip("\"'").rstrip("?.!").strip().casefold()
+
+
+def retrieval_cache_key(
+    backend: str, query: str, k: Optional[int], exclude_urls: Sequence[str] = ()
+) -> str:
+    """Return the cache key for *query* sent to *backend*."""
+
+    payload = json.dumps(
+        [backend, normalize_query(query), k, sorted(set(exclude_urls))],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_CACHES: Dict[str, SQLiteCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def retrieval_cache() -> Optional[SQLiteCache]:
+    """Return the process-wide retrieval cache configured by the environment.
+
+    ``None`` is returned when the cache is disabled via
+    ``STORM_RETRIEVAL_CACHE``.
+    """
+
+    if not env_flag("STORM_RETRIEVAL_CACHE"):
+        return None
+    path = str(
+        Path(
+            os.environ.get("STORM_RETRIEVAL_CACHE_PATH")
+            or Path.home() / ".tino_storm" / "retrieval_cache.sqlite3"
+        ).expanduser()
+    )
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = SQLiteCache(
+                path,
+                ttl=env_float("STORM_RETRIEVAL_CACHE_TTL", DEFAULT_TTL),
+                max_entries=env_int("STORM_RETRIEVAL_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+            )
+            _CACHES[path] = cache
+        return cache
+
+
+class CachedRM:
+    """Serve a retrieval model's results from a persistent cache.
+
+    Parameters
+    ----------
+    rm:
+        The retrieval model to wrap, called as
+        ``rm(query_or_queries=[...], exclude_urls=[...])``.
+    cache:
+        Backing :class:`SQLiteCache`; defaults to :func:`retrieval_cache`.
+        ``None`` disables caching.
+    backend:
+        Name the entries are stored under, the class name of *rm* by default.
+    """
+
+    def __init__(
+        self, rm: Any, *, cache: Any = _DEFAULT, backend: Optional[str] = None
+    ):
+        self.rm = rm
+        self.backend = backend or type(rm).__name__
+        self.cache = retrieval_cache() if cache is _DEFAULT else cache
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.forward(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose the wrapped model's attributes (``usage``, ``is_valid_source``...)
+        if name == "rm":
+            raise AttributeError(name)
+        return getattr(self.rm, name)
+
+    def get_usage_and_reset(self) -> Dict[str, int]:
+        usage = {}
+        if hasattr(self.rm, "get_usage_and_reset"):
+            usage.update(self.rm.get_usage_and_reset())
+        with self._lock:
+            hits, self.hits = self.hits, 0
+        usage[f"{self.backend} (cache hits)"] = hits
+        return usage
+
+    def forward(
+        self,
+        query_or_queries: Union[str, List[str]],
+        exclude_urls: List[str] = [],
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """Return cached results for known queries and retrieve the rest."""
+
+        queries = (
+            [query_or_queries]
+            if isinstance(query_or_queries, str)
+            else list(query_or_queries)
+        )
+        if self.cache is None:
+            return self._retrieve(queries, exclude_urls, **kwargs)
+
+        # ``k`` is read per call: callers may change it on the wrapped model
+        k = getattr(self.rm, "k", None)
+        keys = {
+            q: retrieval_cache_key(self.backend, q, k, exclude_urls) for q in queries
+        }
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        missing: Dict[str, str] = {}
+        for query, key in keys.items():
+            if key in results or key in missing.values():
+                continue
+            cached = self.cache.get(key)
+            if cached is None:
+                missing[query] = key
+                continue
+            try:
+                results[key] = json.loads(cached)
+            except ValueError:
+                missing[query] = key
+                continue
+            with self._lock:
+                self.hits += 1
+
+        unattributed: List[Dict[str, Any]] = []
+        if missing:
+            retrieved = self._retrieve(list(missing), exclude_urls, **kwargs)
+            by_query, unattributed = _split_by_query(retrieved, list(missing))
+            for query, key in missing.items():
+                data = by_query[query]
+                results[key] = data
+                # Empty results are usually a swallowed backend error
+                if data:
+                    try:
+                        self.cache.set(key, json.dumps(data))
+                    except (TypeError, ValueError) as exc:
+                        logging.debug("Not caching results for %r: %s", query, exc)
+
+        collected: List[Dict[str, Any]] = []
+        seen_keys = set()
+        seen_urls = set()
+        for key in [*keys.values(), None]:
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            for item in results.get(key, []) if key is not None else unattributed:
+                url = item.get("url")
+                if url is not None:
+                    if url in seen_urls:
+                        continue
+                    seen_urls.add(url)
+                collected.append(item)
+        return collected
+
+    def _retrieve(
+        self, queries: List[str], exclude_urls: List[str], **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        return list(
+            self.rm(query_or_queries=queries, exclude_urls=exclude_urls, **kwargs) or []
+        )
+
+
+def _split_by_query(
+    results: List[Dict[str, Any]], queries: List[str]
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Group *results* of one call for *queries* by the query that returned them.
+
+    Returns the groups and the results that cannot be attributed.
+    """
+
+    by_query: Dict[str, List[Dict[str, Any]]] = {q: [] for q in queries}
+    unattributed: List[Dict[str, Any]] = []
+    for item in results:
+        tagged = [q for q in item.get("queries") or () if q in by_query]
+        if not tagged and len(queries) == 1:
+            tagged = queries
+        for query in tagged:
+            by_query[query].append(item)
+        if not tagged:
+            unattributed.append(item)
+    return by_query, unattributed
+
+
+__all__ = [
+    "CachedRM",
+    "normalize_query",
+    "retrieval_cache",
+    "retrieval_cache_key",
+]
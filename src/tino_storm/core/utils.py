@@ -3,6 +3,7 @@ from __future__ import annotations
 import concurrent.futures
 import httpx
 
+from ..ratelimit import bind_flow, throttle
 from ..security import log_request
 import json
 import logging
@@ -11,6 +12,7 @@ import pickle
 import re
 import regex
 import sys
+import time
 import toml
 from typing import TYPE_CHECKING, Dict, List
 from tqdm import tqdm
@@ -20,8 +22,15 @@ if TYPE_CHECKING:  # pragma: no cover - used for type hints only
     from langchain_huggingface import HuggingFaceEmbeddings
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from trafilatura import extract
-
+from ..ingest.chunking import SEPARATORS
+from ..ingestion.extraction import (
+    EXTRACTOR,
+    get_page_extractor,
+    max_page_bytes as default_max_page_bytes,
+    process_pages,
+)
+from ..ingestion.fetcher import ResponseTooLarge
+from ..ingestion.http_cache import cached_get, http_cache
 from ..lm import LitellmModel
 
 logging.getLogger("httpx").setLevel(logging.WARNING)  # Disable INFO logging for httpx.
@@ -282,19 +291,7 @@ class QdrantVectorStoreManager:
             chunk_overlap=chunk_overlap,
             length_function=len,
             add_start_index=True,
-            separators=[
-                "\n\n",
-                "\n",
-                ".",
-                "\uff0e",  # Fullwidth full stop
-                "\u3002",  # Ideographic full stop
-                ",",
-                "\uff0c",  # Fullwidth comma
-                "\u3001",  # Ideographic comma
-                " ",
-                "\u200b",  # Zero-width space
-                "",
-            ],
+            separators=list(SEPARATORS),
         )
         split_documents = text_splitter.split_documents(documents)
 
@@ -729,75 +726,170 @@ class WebPageHelper:
         min_char_count: int = 150,
         snippet_chunk_size: int = 1000,
         max_thread_num: int = 10,
+        max_page_bytes: int | None = None,
     ):
         """
         Args:
             min_char_count: Minimum character count for the article to be considered valid.
             snippet_chunk_size: Maximum character count for each snippet.
             max_thread_num: Maximum number of threads to use for concurrent requests (e.g., downloading webpages).
+            max_page_bytes: Largest page body to download; ``0`` means no limit. Defaults to ``STORM_WEBPAGE_MAX_BYTES``.
         """
         self.httpx_client = httpx.Client(verify=False)
+        self.http_cache = http_cache()
+        self.page_extractor = get_page_extractor()
         self.min_char_count = min_char_count
         self.max_thread_num = max_thread_num
+        self.max_page_bytes = (
+            max_page_bytes if max_page_bytes is not None else default_max_page_bytes()
+        )
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=snippet_chunk_size,
             chunk_overlap=0,
             length_function=len,
             is_separator_regex=False,
-            separators=[
-                "\n\n",
-                "\n",
-                ".",
-                "\uff0e",  # Fullwidth full stop
-                "\u3002",  # Ideographic full stop
-                ",",
-                "\uff0c",  # Fullwidth comma
-                "\u3001",  # Ideographic comma
-                " ",
-                "\u200b",  # Zero-width space
-                "",
-            ],
+            separators=list(SEPARATORS),
         )
 
     def download_webpage(self, url: str):
-        try:
+        def _send(headers):
+            throttle(url)
             log_request("GET", url)
-            res = self.httpx_client.get(url, timeout=4)
-            if res.status_code >= 400:
-                res.raise_for_status()
-            return res.content
+            with self.httpx_client.stream(
+                "GET", url, timeout=4, headers=headers
+            ) as res:
+                if res.status_code >= 400:
+                    res.raise_for_status()
+                return self._read_limited(url, res)
+
+        try:
+            return cached_get(url, _send, self.http_cache).body
+        except ResponseTooLarge:
+            logging.warning(
+                "Skipping %s larger than %d bytes", url, self.max_page_bytes
+            )
+            return None
         except httpx.HTTPError as exc:
             print(f"Error while requesting {exc.request.url!r} - {exc!r}")
             return None
 
-    def urls_to_articles(self, urls: List[str]) -> Dict:
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_thread_num
-        ) as executor:
-            htmls = list(executor.map(self.download_webpage, urls))
-
-        articles = {}
-
-        for h, u in zip(htmls, urls):
-            if h is None:
-                continue
-            article_text = extract(
-                h,
-                include_tables=False,
-                include_comments=False,
-                output_format="txt",
-            )
-            if article_text is not None and len(article_text) > self.min_char_count:
-                articles[u] = {"text": article_text}
+    def _read_limited(self, url: str, res: httpx.Response) -> httpx.Response:
+        """Read a streamed response, giving up once it exceeds ``max_page_bytes``."""
+        limit = self.max_page_bytes
+        length = res.headers.get("Content-Length", "")
+        if limit and length.isdigit() and int(length) > limit:
+            raise ResponseTooLarge(url)
+        body = bytearray()
+        for chunk in res.iter_bytes():
+            body.extend(chunk)
+            if limit and len(body) > limit:
+                raise ResponseTooLarge(url)
+        # The body is already decoded, so drop the encoding headers
+        headers = [
+            (k, v)
+            for k, v in res.headers.multi_items()
+            if k.lower() not in {"content-encoding", "content-length"}
+        ]
+        return httpx.Response(
+            res.status_code, headers=headers, content=bytes(body), request=res.request
+        )
 
-        return articles
+    def urls_to_articles(self, urls: List[str]) -> Dict:
+        articles = dict(self.iter_articles(urls))
+        return {u: articles[u] for u in dict.fromkeys(urls) if u in articles}
 
     def urls_to_snippets(self, urls: List[str]) -> Dict:
-        articles = self.urls_to_articles(urls)
-        for u in articles:
-            articles[u]["snippets"] = self.text_splitter.split_text(articles[u]["text"])
-
-        return articles
+        articles = dict(self.iter_articles(urls, snippets=True))
+        return {u: articles[u] for u in dict.fromkeys(urls) if u in articles}
+
+    def iter_articles(self, urls: List[str], snippets: bool = False):
+        """Yield ``(url, article)`` for valid articles in completion order.
+
+        Each finished download is queued for extraction (and snippet
+        splitting if *snippets* is true) right away. The page extractor
+        receives them in batches: a batch is submitted once it is full, when
+        no other batch is being extracted, or after the extractor's
+        ``linger``. Pages whose text is already cached skip the extractor.
+        Articles are yielded as soon as they are done, while other pages are
+        still downloading, and raw HTML is dropped once its batch has been
+        processed.
+        """
+        splitter = self.text_splitter if snippets else None
+        extractor = self.page_extractor
+        cache = self.http_cache
+        min_chars = self.min_char_count
+        jobs = {}
+        batch = []
+        batch_started = 0.0
+
+        def submit():
+            if batch:
+                items = list(batch)
+                batch.clear()
+                jobs[extractor.submit(items, min_chars, splitter)] = items
+
+        def articles(items, results):
+            for (url, html, _), (_, text, page_snippets) in zip(items, results):
+                if cache is not None and html is not None:
+                    cache.set_text(url, EXTRACTOR, html, text or "")
+                if text and len(text) > min_chars:
+                    article = {"text": text}
+                    if snippets:
+                        article["snippets"] = page_snippets
+                    yield url, article
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_thread_num
+        )
+        try:
+            downloads = {
+                executor.submit(bind_flow(self.download_webpage), u): u
+                for u in dict.fromkeys(urls)
+            }
+            while downloads or jobs:
+                linger = None
+                if batch:
+                    linger = max(
+                        0.0, batch_started + extractor.linger - time.monotonic()
+                    )
+                done, _ = concurrent.futures.wait(
+                    [*downloads, *jobs],
+                    timeout=linger,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future in downloads:
+                        url = downloads.pop(future)
+                        html = future.result()
+                        if html is None:
+                            continue
+                        text = cache.get_text(url, EXTRACTOR, html) if cache else None
+                        if text is not None:
+                            # Only splitting is left; not worth a trip to the pool
+                            item = [(url, None, text)]
+                            yield from articles(
+                                item, process_pages(item, min_chars, splitter)
+                            )
+                            continue
+                        if not batch:
+                            batch_started = time.monotonic()
+                        batch.append((url, html, None))
+                        if len(batch) >= extractor.batch_size:
+                            submit()
+                        continue
+                    items = jobs.pop(future)
+                    results = extractor.result(future, items, min_chars, splitter)
+                    yield from articles(items, results)
+                    # Release the raw HTML before waiting for more work
+                    del items, results
+                if batch and (
+                    not downloads
+                    or not jobs
+                    or time.monotonic() - batch_started >= extractor.linger
+                ):
+                    submit()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 def user_input_appropriateness_check(user_input):
@@ -0,0 +1,52 @@
+"""Read ``STORM_*`` settings from the environment.
+
+Unset, empty and malformed values fall back to the default, so a typo in a
+tuning knob never keeps the process from starting. Switches count as off
+when set to ``0``, ``off``, ``false`` or ``no`` (in any case).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+_OFF = frozenset({"0", "off", "false", "no"})
+
+
+def env_float(name: str, default: Optional[float]) -> Optional[float]:
+    """Return ``$name`` as a float, or *default*."""
+
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """Return ``$name`` as an integer, or *default*.
+
+    Values written as floats, such as ``10.0``, are truncated.
+    """
+
+    value = env_float(name, None)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, OverflowError):
+        return default
+
+
+def env_flag(name: str, default: bool = True) -> bool:
+    """Return whether the switch ``$name`` is on, or *default* when unset."""
+
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    return value.lower() not in _OFF
+
+
+__all__ = ["env_flag", "env_float", "env_int"]
@@ -5,6 +5,15 @@ emitted. Use :meth:`EventEmitter.emit` within asynchronous code and
 :meth:`EventEmitter.emit_sync` from synchronous code. Both methods invoke each
 handler safely and log errors without interrupting other subscribers.
 
+By default handlers run inline in the emitting call. With
+``dispatch="queued"`` (or ``STORM_EVENT_DISPATCH=queued`` for the global
+:data:`event_emitter`) events are put on a bounded queue drained by background
+worker threads so emitting never waits on handlers. When the queue is full the
+``overflow`` policy either drops the event or blocks the emitter. Use
+:meth:`EventEmitter.flush` to wait for queued events, e.g. in tests or on
+shutdown, and :meth:`EventEmitter.stats` to inspect dropped, failed and slow
+handler counters.
+
 Example:
     >>> emitter = EventEmitter()
     >>> emitter.subscribe(ResearchAdded, handle_research)
@@ -16,8 +25,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable, Dict, List, Type, Any, TYPE_CHECKING, Optional
 import asyncio
+import atexit
 import inspect
 import logging
+import os
+import queue
+import threading
+import time
+
+from .env import env_int
 
 if TYPE_CHECKING:
     from .storm_wiki.modules.storm_dataclass import StormArticle
@@ -39,9 +55,106 @@ class DocGenerated:
     article: "StormArticle"
 
 
+ErrorCallback = Callable[[Callable[[Any], Any], Any, Exception], None]
+
+DISPATCH_MODES = ("inline", "queued")
+OVERFLOW_POLICIES = ("drop", "block")
+
+_STOP = object()
+
+
+def _log_handler_error(handler: Callable[[Any], Any], event: Any) -> None:
+    handler_name = getattr(handler, "__name__", repr(handler))
+    logging.exception(
+        "Error in handler %s for event %s",
+        handler_name,
+        type(event).__name__,
+    )
+
+
 class EventEmitter:
-    def __init__(self) -> None:
+    """Publish events to subscribed handlers.
+
+    Args:
+        dispatch: ``"inline"`` runs handlers in the emitting call;
+            ``"queued"`` hands events to background workers.
+        max_queue: Capacity of the queue used in queued mode.
+        workers: Number of worker threads draining the queue.
+        overflow: ``"drop"`` discards events when the queue is full,
+            ``"block"`` waits for space.
+        handler_concurrency: Maximum number of concurrent invocations of a
+            single handler across workers.
+        slow_handler_threshold: Handlers taking longer than this many seconds
+            are logged and counted as slow.
+    """
+
+    def __init__(
+        self,
+        *,
+        dispatch: str = "inline",
+        max_queue: int = 1000,
+        workers: int = 1,
+        overflow: str = "drop",
+        handler_concurrency: int = 1,
+        slow_handler_threshold: float = 1.0,
+    ) -> None:
         self._subscribers: Dict[Type[Any], List[Callable[[Any], Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._workers: List[threading.Thread] = []
+        self._handler_slots: Dict[Any, threading.BoundedSemaphore] = {}
+        self._atexit_registered = False
+        self._counters = {
+            "emitted": 0,
+            "dispatched": 0,
+            "dropped": 0,
+            "failed": 0,
+            "slow": 0,
+        }
+        self.configure(
+            dispatch=dispatch,
+            max_queue=max_queue,
+            workers=workers,
+            overflow=overflow,
+            handler_concurrency=handler_concurrency,
+            slow_handler_threshold=slow_handler_threshold,
+        )
+
+    def configure(
+        self,
+        *,
+        dispatch: Optional[str] = None,
+        max_queue: Optional[int] = None,
+        workers: Optional[int] = None,
+        overflow: Optional[str] = None,
+        handler_concurrency: Optional[int] = None,
+        slow_handler_threshold: Optional[float] = None,
+    ) -> None:
+        """Change the dispatch settings.
+
+        Pending queued events are delivered and running workers stopped before
+        the new settings take effect.
+        """
+
+        if dispatch is not None and dispatch not in DISPATCH_MODES:
+            raise ValueError(f"dispatch must be one of {DISPATCH_MODES}")
+        if overflow is not None and overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self.shutdown()
+        if dispatch is not None:
+            self.dispatch = dispatch
+        if max_queue is not None:
+            self.max_queue = max_queue
+        if workers is not None:
+            self.workers = max(1, workers)
+        if overflow is not None:
+            self.overflow = overflow
+        if handler_concurrency is not None:
+            self.handler_concurrency = max(1, handler_concurrency)
+            self._handler_slots = {}
+        if slow_handler_threshold is not None:
+            self.slow_handler_threshold = slow_handler_threshold
 
     def subscribe(self, event_type: Type[Any], handler: Callable[[Any], Any]) -> None:
         self._subscribers.setdefault(event_type, []).append(handler)
@@ -85,6 +198,10 @@ class EventEmitter:
             on_error: Optional callback ``(handler, event, exception)`` used
                 for custom error logging.
         """
+        if self.dispatch == "queued":
+            if not self._try_enqueue(event, on_error):
+                await asyncio.to_thread(self._enqueue_blocking, event, on_error)
+            return
         for handler in self._subscribers.get(type(event), []):
             try:
                 result = handler(event)
@@ -94,12 +211,7 @@ class EventEmitter:
                 if on_error is not None:
                     on_error(handler, event, exc)
                 else:
-                    handler_name = getattr(handler, "__name__", repr(handler))
-                    logging.exception(
-                        "Error in handler %s for event %s",
-                        handler_name,
-                        type(event).__name__,
-                    )
+                    _log_handler_error(handler, event)
 
     def emit_sync(
         self,
@@ -118,6 +230,10 @@ class EventEmitter:
             on_error: Optional callback ``(handler, event, exception)`` used
                 for custom error logging.
         """
+        if self.dispatch == "queued":
+            if not self._try_enqueue(event, on_error):
+                self._enqueue_blocking(event, on_error)
+            return
         loop: Optional[asyncio.AbstractEventLoop] = None
         for handler in self._subscribers.get(type(event), []):
             try:
@@ -130,14 +246,157 @@ class EventEmitter:
                 if on_error is not None:
                     on_error(handler, event, exc)
                 else:
-                    handler_name = getattr(handler, "__name__", repr(handler))
-                    logging.exception(
-                        "Error in handler %s for event %s",
-                        handler_name,
-                        type(event).__name__,
-                    )
+                    _log_handler_error(handler, event)
         if loop is not None:
             loop.close()
 
+    # -- queued dispatch -------------------------------------------------
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._counters[name] += 1
+
+    def _ensure_workers(self) -> queue.Queue:
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._workers = [
+                    threading.Thread(
+                        target=self._worker,
+                        args=(self._queue,),
+                        name=f"event-emitter-{i}",
+                        daemon=True,
+                    )
+                    for i in range(self.workers)
+                ]
+                for worker in self._workers:
+                    worker.start()
+                if not self._atexit_registered:
+                    atexit.register(self.shutdown)
+                    self._atexit_registered = True
+            return self._queue
+
+    def _try_enqueue(self, event: Any, on_error: Optional[ErrorCallback]) -> bool:
+        """Queue *event*; return ``False`` if the caller should block."""
+
+        if not self._subscribers.get(type(event)):
+            return True
+        q = self._ensure_workers()
+        self._count("emitted")
+        try:
+            q.put_nowait((event, on_error))
+        except queue.Full:
+            if self.overflow == "block":
+                return False
+            self._count("dropped")
+            logging.warning("Event queue full; dropping %s event", type(event).__name__)
+        return True
+
+    def _enqueue_blocking(self, event: Any, on_error: Optional[ErrorCallback]) -> None:
+        self._ensure_workers().put((event, on_error))
+
+    def _slot(self, handler: Callable[[Any], Any]) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._handler_slots.get(handler)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.handler_concurrency)
+                self._handler_slots[handler] = slot
+            return slot
+
+    def _worker(self, q: queue.Queue) -> None:
+        loop: Optional[asyncio.AbstractEventLoop] = None
+        try:
+            while True:
+                item = q.get()
+                try:
+                    if item is _STOP:
+                        return
+                    event, on_error = item
+                    for handler in list(self._subscribers.get(type(event), [])):
+                        start = time.monotonic()
+                        try:
+                            with self._slot(handler):
+                                result = handler(event)
+                                if inspect.isawaitable(result):
+                                    if loop is None:
+                                        loop = asyncio.new_event_loop()
+                                    loop.run_until_complete(result)
+                        except Exception as exc:  # noqa: BLE001
+                            self._count("failed")
+                            if on_error is not None:
+                                on_error(handler, event, exc)
+                            else:
+                                _log_handler_error(handler, event)
+                        elapsed = time.monotonic() - start
+                        if elapsed > self.slow_handler_threshold:
+                            self._count("slow")
+                            logging.warning(
+                                "Slow handler %s for event %s took %.2fs",
+                                getattr(handler, "__name__", repr(handler)),
+                                type(event).__name__,
+                                elapsed,
+                            )
+                    self._count("dispatched")
+                finally:
+                    q.task_done()
+        finally:
+            if loop is not None:
+                loop.close()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued events have been handled.
+
+        Returns ``False`` if *timeout* elapsed first. In inline mode this
+        returns ``True`` immediately.
+        """
+
+        q = self._queue
+        if q is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Deliver pending events and stop the background workers."""
+
+        with self._lock:
+            q, workers = self._queue, self._workers
+            self._queue, self._workers = None, []
+        if q is None:
+            return
+        for _ in workers:
+            q.put(_STOP)
+        for worker in workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Return dispatch counters and the current queue length."""
+
+        q = self._queue
+        with self._stats_lock:
+            counters = dict(self._counters)
+        counters["queued"] = q.qsize() if q is not None else 0
+        return counters
+
+
+def _emitter_from_env() -> EventEmitter:
+    """Build the global emitter using ``STORM_EVENT_*`` settings."""
+
+    dispatch = os.environ.get("STORM_EVENT_DISPATCH", "inline").lower()
+    overflow = os.environ.get("STORM_EVENT_OVERFLOW", "drop").lower()
+    return EventEmitter(
+        dispatch=dispatch if dispatch in DISPATCH_MODES else "inline",
+        max_queue=env_int("STORM_EVENT_QUEUE_SIZE", 1000),
+        workers=env_int("STORM_EVENT_WORKERS", 1),
+        overflow=overflow if overflow in OVERFLOW_POLICIES else "drop",
+    )
+
 
-event_emitter = EventEmitter()
+event_emitter = _emitter_from_env()
@@ -43,15 +43,37 @@ class _WatchdogProxy:
         return f"<Missing watchdog proxy for {self._name}>"
 
 
-try:
-    from .watcher import start_watcher, VaultIngestHandler, load_txt_documents
-except (ImportError, MissingExtraError) as exc:  # pragma: no cover - optional dependency
-    message = str(exc)
-    if "watchdog is required" not in message and "vector-store" not in message:
-        raise
-    start_watcher = _WatchdogProxy("start_watcher", message)
-    VaultIngestHandler = _WatchdogProxy("VaultIngestHandler", message)
-    load_txt_documents = _WatchdogProxy("load_txt_documents", message)
+_WATCHER_ATTRS = ("start_watcher", "VaultIngestHandler", "load_txt_documents")
+
+
+def _watcher_attr(name: str):
+    """Import ``name`` from :mod:`.watcher` on first use.
+
+    The watcher pulls in watchdog, trafilatura and the vector store, so it is
+    only imported when ingestion is actually requested. When the optional
+    dependencies are missing a :class:`_WatchdogProxy` is cached instead.
+    """
+
+    if name in globals():
+        return globals()[name]
+    try:
+        from . import watcher
+    except (ImportError, MissingExtraError) as exc:  # pragma: no cover - optional dependency
+        message = str(exc)
+        if "watchdog is required" not in message and "vector-store" not in message:
+            raise
+        for attr in _WATCHER_ATTRS:
+            globals().setdefault(attr, _WatchdogProxy(attr, message))
+    else:
+        for attr in _WATCHER_ATTRS:
+            globals().setdefault(attr, getattr(watcher, attr))
+    return globals()[name]
+
+
+def __getattr__(name: str):
+    if name in _WATCHER_ATTRS:
+        return _watcher_attr(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def ingest_path(
@@ -72,7 +94,7 @@ def ingest_path(
     triggered programmatically, e.g. from the ``/ingest`` API endpoint.
     """
 
-    handler = VaultIngestHandler(
+    handler = _watcher_attr("VaultIngestHandler")(
         root or str(Path(path).expanduser().parent),
         chroma_path=chroma_path,
         twitter_limit=twitter_limit,
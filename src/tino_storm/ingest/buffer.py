@@ -0,0 +1,278 @@
+"""Write buffering for vault ingestion.
+
+:class:`IngestWriteBuffer` accumulates documents per ``(client, vault)`` pair
+and writes each batch with a single ``collection.add`` call. A batch is
+flushed once it reaches ``batch_size`` documents, when the oldest pending
+document has waited ``max_latency`` seconds, or when :meth:`flush` is called
+explicitly (including on leaving the buffer's context manager). Every flushed
+batch emits one aggregated :class:`~tino_storm.events.ResearchAdded` event.
+
+A batch that fails to embed or write is logged, handed to ``on_error`` and
+reported as a ``ResearchAdded`` event with an ``error`` entry; the failure
+never propagates, so the latency timer keeps running.
+
+Documents buffered without an embedding are embedded together, with one
+``embed`` call per batch, right before the batch is written.
+
+With ``upsert=True`` batches are written with ``collection.upsert`` when the
+collection provides it, so re-writing a content-addressed id replaces the
+stored document instead of failing or duplicating it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..env import env_float, env_int
+from ..events import ResearchAdded, event_emitter
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_MAX_LATENCY = 2.0
+
+
+@dataclass
+class _PendingBatch:
+    collection: Any
+    vault: str
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    ids: List[str] = field(default_factory=list)
+    embeddings: List[Optional[List[float]]] = field(default_factory=list)
+
+
+class IngestWriteBuffer:
+    """Batch ``collection.add`` calls across ingested documents.
+
+    Parameters
+    ----------
+    batch_size:
+        Number of documents written per ``add`` call. Defaults to
+        ``STORM_INGEST_BATCH_SIZE`` or 64.
+    max_latency:
+        Seconds a document may stay buffered before a background flush.
+        Defaults to ``STORM_INGEST_FLUSH_INTERVAL`` or 2 seconds; ``0``
+        disables the timer so only size and explicit flushes apply.
+    upsert:
+        Write with ``collection.upsert`` when available instead of ``add``.
+    on_write:
+        Called as ``on_write(vault, ids, metadatas)`` after each successful
+        write.
+    on_error:
+        Called as ``on_error(vault, ids, metadatas)`` when writing a batch
+        fails.
+    embed:
+        Maps a list of documents to their vectors. Used for documents added
+        with ``embedding=None``; without it such batches are written without
+        embeddings so the vector store computes them.
+    before_write:
+        Called as ``before_write(vault, collection, documents, embeddings)``
+        right before each write and returns the embeddings to write; raising
+        from it fails the batch like a failed write.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: Optional[int] = None,
+        max_latency: Optional[float] = None,
+        upsert: bool = False,
+        on_write: Optional[
+            Callable[[str, List[str], List[Dict[str, Any]]], None]
+        ] = None,
+        on_error: Optional[
+            Callable[[str, List[str], List[Dict[str, Any]]], None]
+        ] = None,
+        embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        before_write: Optional[
+            Callable[
+                [str, Any, List[str], Optional[List[List[float]]]],
+                Optional[List[List[float]]],
+            ]
+        ] = None,
+    ) -> None:
+        self.batch_size = max(
+            1,
+            int(
+                batch_size
+                if batch_size is not None
+                else env_int("STORM_INGEST_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+            ),
+        )
+        self.max_latency = (
+            max_latency
+            if max_latency is not None
+            else env_float("STORM_INGEST_FLUSH_INTERVAL", DEFAULT_MAX_LATENCY)
+        )
+        self.upsert = upsert
+        self.on_write = on_write
+        self.on_error = on_error
+        self.embed = embed
+        self.before_write = before_write
+        self._pending: Dict[Tuple[Hashable, str], _PendingBatch] = {}
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(b.documents) for b in self._pending.values())
+
+    def add(
+        self,
+        client_key: Hashable,
+        collection: Any,
+        vault: str,
+        document: str,
+        metadata: Dict[str, Any],
+        doc_id: str,
+        embedding: Optional[List[float]] = None,
+    ) -> None:
+        """Buffer a single document, flushing its batch when full.
+
+        A document whose *doc_id* is already pending in the vault's batch is
+        dropped; ids are content-addressed, so it repeats the pending one.
+        """
+
+        full: Optional[_PendingBatch] = None
+        with self._lock:
+            key = (client_key, vault)
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _PendingBatch(collection, vault)
+            if doc_id in batch.ids:
+                logging.debug("Dropping repeated document %s", doc_id)
+                return
+            batch.documents.append(document)
+            batch.metadatas.append(metadata)
+            batch.ids.append(doc_id)
+            batch.embeddings.append(embedding)
+            if len(batch.documents) >= self.batch_size:
+                full = self._pending.pop(key)
+            else:
+                self._schedule_locked()
+        if full is not None:
+            self._write(full)
+
+    def _schedule_locked(self) -> None:
+        if self._timer is not None or not self.max_latency or self.max_latency <= 0:
+            return
+        self._timer = threading.Timer(self.max_latency, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self, vault: Optional[str] = None) -> int:
+        """Write pending batches (optionally only for *vault*).
+
+        Returns the number of documents written; failed batches are not
+        counted.
+        """
+
+        with self._lock:
+            keys = [k for k in self._pending if vault is None or k[1] == vault]
+            batches = [self._pending.pop(k) for k in keys]
+            if not self._pending and self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        written = 0
+        for batch in batches:
+            if self._write(batch):
+                written += len(batch.documents)
+        return written
+
+    def _embeddings(self, batch: _PendingBatch) -> Optional[List[List[float]]]:
+        missing = [i for i, e in enumerate(batch.embeddings) if e is None]
+        if not missing:
+            return batch.embeddings  # type: ignore[return-value]
+        if self.embed is None:
+            return None
+        vectors = self.embed([batch.documents[i] for i in missing])
+        embeddings = list(batch.embeddings)
+        for i, vector in zip(missing, vectors):
+            embeddings[i] = vector
+        return embeddings  # type: ignore[return-value]
+
+    def _write(self, batch: _PendingBatch) -> bool:
+        """Write *batch*, returning ``False`` if it failed and was reported."""
+
+        try:
+            embeddings = self._embeddings(batch)
+            if self.before_write is not None:
+                embeddings = self.before_write(
+                    batch.vault, batch.collection, batch.documents, embeddings
+                )
+            write = getattr(batch.collection, "upsert", None) if self.upsert else None
+            (write or batch.collection.add)(
+                documents=batch.documents,
+                embeddings=embeddings,
+                metadatas=batch.metadatas,
+                ids=batch.ids,
+            )
+            if self.on_write is not None:
+                self.on_write(batch.vault, list(batch.ids), batch.metadatas)
+        except Exception as exc:  # noqa: BLE001 - report instead of losing the batch
+            self._report_error(batch, exc)
+            return False
+        sources = [m.get("source") for m in batch.metadatas]
+        logging.debug(
+            "Wrote %d documents to vault %s", len(batch.documents), batch.vault
+        )
+        event_emitter.emit_sync(
+            ResearchAdded(
+                topic=batch.vault,
+                information_table={
+                    "source": sources[0],
+                    "doc_id": batch.ids[0],
+                    "sources": sources,
+                    "doc_ids": list(batch.ids),
+                    "count": len(batch.ids),
+                },
+            )
+        )
+        return True
+
+    def _report_error(self, batch: _PendingBatch, exc: Exception) -> None:
+        logging.error(
+            "Writing %d documents to vault %s failed",
+            len(batch.documents),
+            batch.vault,
+            exc_info=exc,
+        )
+        if self.on_error is not None:
+            try:
+                self.on_error(batch.vault, list(batch.ids), batch.metadatas)
+            except Exception:  # pragma: no cover - defensive logging
+                logging.exception("on_error failed for vault %s", batch.vault)
+        sources = [m.get("source") for m in batch.metadatas]
+        event_emitter.emit_sync(
+            ResearchAdded(
+                topic=batch.vault,
+                information_table={
+                    "error": str(exc),
+                    "stage": "write",
+                    "sources": sources,
+                    "doc_ids": list(batch.ids),
+                    "count": len(batch.ids),
+                },
+            )
+        )
+
+    def close(self) -> None:
+        """Cancel the latency timer and write everything still buffered."""
+
+        self.flush()
+
+    def __enter__(self) -> "IngestWriteBuffer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+__all__ = ["IngestWriteBuffer"]
@@ -0,0 +1,245 @@
+"""Split ingested documents into overlapping, sentence-aware chunks.
+
+:func:`split_text` splits on the same separators :class:`WebPageHelper` uses
+for snippets (paragraphs, lines, sentence ends, commas, spaces), preferring the
+coarsest separator that yields pieces below ``chunk_size``. Pieces are merged
+back into chunks of at most ``chunk_size`` characters, and consecutive chunks
+share up to ``chunk_overlap`` characters. Each :class:`Chunk` records its
+character offsets in the original text.
+
+:class:`Chunker` applies these settings and moves large batches of documents
+to a process pool. Defaults come from the environment:
+
+``STORM_INGEST_CHUNK_SIZE``
+    Maximum characters per chunk (default 1000, ``0`` disables chunking).
+``STORM_INGEST_CHUNK_OVERLAP``
+    Characters shared by consecutive chunks (default 100).
+``STORM_INGEST_CHUNK_PROCESSES``
+    Worker processes for large batches (default ``min(4, cpu_count)``,
+    ``1`` splits inline).
+``STORM_INGEST_CHUNK_PARALLEL_CHARS``
+    Total characters a batch needs before it is sent to the process pool
+    (default 200000).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
+
+from ..env import env_int
+
+# Shared with ``WebPageHelper`` so snippets and vault chunks break alike.
+SEPARATORS: Tuple[str, ...] = (
+    "\n\n",
+    "\n",
+    ".",
+    "\uff0e",  # Fullwidth full stop
+    "\u3002",  # Ideographic full stop
+    ",",
+    "\uff0c",  # Fullwidth comma
+    "\u3001",  # Ideographic comma
+    " ",
+    "\u200b",  # Zero-width space
+    "",
+)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 100
+DEFAULT_PARALLEL_CHARS = 200_000
+
+Span = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A slice ``text == source[start:end]`` of a larger document."""
+
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+def _atomic_spans(
+    text: str, start: int, end: int, size: int, separators: Sequence[str]
+) -> List[Span]:
+    """Cut ``text[start:end]`` into contiguous spans of at most *size*."""
+
+    if end - start <= size:
+        return [(start, end)]
+    for i, sep in enumerate(separators):
+        if sep == "":
+            break
+        if text.find(sep, start, end) == -1:
+            continue
+        rest = separators[i + 1 :]
+        spans: List[Span] = []
+        pos = start
+        while pos < end:
+            idx = text.find(sep, pos, end)
+            # Keep the separator with the preceding piece so sentences end
+            # with their full stop.
+            cut = end if idx == -1 else idx + len(sep)
+            if cut - pos <= size:
+                spans.append((pos, cut))
+            else:
+                spans.extend(_atomic_spans(text, pos, cut, size, rest))
+            pos = cut
+        return spans
+    return [(pos, min(pos + size, end)) for pos in range(start, end, size)]
+
+
+def _merge_spans(spans: List[Span], size: int, overlap: int) -> List[Span]:
+    merged: List[Span] = []
+    current: List[Span] = []
+    for span in spans:
+        if current and span[1] - current[0][0] > size:
+            merged.append((current[0][0], current[-1][1]))
+            tail_end = current[-1][1]
+            keep: List[Span] = []
+            for piece in reversed(current):
+                if tail_end - piece[0] > overlap:
+                    break
+                keep.insert(0, piece)
+            while keep and span[1] - keep[0][0] > size:
+                keep.pop(0)
+            current = keep
+        current.append(span)
+    if current:
+        merged.append((current[0][0], current[-1][1]))
+    return merged
+
+
+def split_text(
+    text: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    separators: Sequence[str] = SEPARATORS,
+) -> List[Chunk]:
+    """Split *text* into :class:`Chunk` objects.
+
+    A ``chunk_size`` of ``0`` or less returns the whole text as one chunk.
+    Leading and trailing whitespace is trimmed from every chunk and
+    whitespace-only chunks are dropped.
+    """
+
+    if chunk_size <= 0 or len(text) <= chunk_size:
+        spans = [(0, len(text))]
+    else:
+        overlap = max(0, min(chunk_overlap, chunk_size // 2))
+        atoms = _atomic_spans(text, 0, len(text), chunk_size, separators)
+        spans = _merge_spans(atoms, chunk_size, overlap)
+
+    chunks: List[Chunk] = []
+    for start, end in spans:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            chunks.append(Chunk(len(chunks), start, end, text[start:end]))
+    return chunks
+
+
+class Chunker:
+    """Split documents with shared settings, using processes for big batches.
+
+    Parameters
+    ----------
+    chunk_size, chunk_overlap:
+        Passed to :func:`split_text`; default to ``STORM_INGEST_CHUNK_SIZE``
+        and ``STORM_INGEST_CHUNK_OVERLAP``.
+    processes:
+        Size of the process pool used by :meth:`split_many`.
+    parallel_chars:
+        Minimum total characters for :meth:`split_many` to use the pool.
+    """
+
+    def __init__(
+        self,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        *,
+        processes: Optional[int] = None,
+        parallel_chars: Optional[int] = None,
+        separators: Sequence[str] = SEPARATORS,
+    ) -> None:
+        self.chunk_size = (
+            chunk_size
+            if chunk_size is not None
+            else env_int("STORM_INGEST_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+        )
+        self.chunk_overlap = (
+            chunk_overlap
+            if chunk_overlap is not None
+            else env_int("STORM_INGEST_CHUNK_OVERLAP", DEFAULT_CHUNK_OVERLAP)
+        )
+        self.processes = (
+            processes
+            if processes is not None
+            else env_int("STORM_INGEST_CHUNK_PROCESSES", min(4, os.cpu_count() or 1))
+        )
+        self.parallel_chars = (
+            parallel_chars
+            if parallel_chars is not None
+            else env_int("STORM_INGEST_CHUNK_PARALLEL_CHARS", DEFAULT_PARALLEL_CHARS)
+        )
+        self.separators = tuple(separators)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def split(self, text: str) -> List[Chunk]:
+        return split_text(text, self.chunk_size, self.chunk_overlap, self.separators)
+
+    def should_parallelize(self, texts: Sequence[str]) -> bool:
+        """Return ``True`` if :meth:`split_many` would use the process pool."""
+
+        return (
+            self.processes > 1
+            and len(texts) > 1
+            and sum(len(t) for t in texts) >= self.parallel_chars
+        )
+
+    def split_many(self, texts: Sequence[str]) -> List[List[Chunk]]:
+        """Split every text in *texts*, in parallel for large batches."""
+
+        if not self.should_parallelize(texts):
+            return [self.split(t) for t in texts]
+        func = partial(
+            split_text,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            separators=self.separators,
+        )
+        chunksize = max(1, len(texts) // (self.processes * 4))
+        try:
+            return list(self._pool().map(func, texts, chunksize=chunksize))
+        except Exception as exc:  # noqa: BLE001 - fall back to inline splitting
+            logging.warning("Chunking process pool failed, splitting inline: %s", exc)
+            self.close()
+            return [self.split(t) for t in texts]
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(self.close)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = ["Chunk", "Chunker", "SEPARATORS", "split_text"]
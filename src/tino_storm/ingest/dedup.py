@@ -0,0 +1,205 @@
+"""Content-addressed document ids and a per-vault deduplication index.
+
+Documents are identified by a hash of their source and normalized text, so
+re-ingesting the same file or manifest produces the same ids. The
+:class:`DedupIndex` remembers which ids each vault already holds, which lets
+:class:`~tino_storm.ingest.watcher.VaultIngestHandler` skip unchanged
+documents without touching the vector store.
+
+Configuration is read from the environment:
+
+``STORM_INGEST_DEDUP``
+    Set to ``0``/``off``/``false`` to disable the index (ids stay
+    content-addressed, so writes are still idempotent upserts).
+``STORM_INGEST_INDEX_PATH``
+    Location of the SQLite index, ``<chroma path>/ingest_index.sqlite3`` by
+    default.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..env import env_flag
+from ..sqlite_cache import open_sqlite
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Return *text* in a canonical form used for hashing.
+
+    Unicode is NFC-normalized and runs of whitespace collapse to one space, so
+    documents that differ only in line endings or indentation hash the same.
+    """
+
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of the normalized *text*."""
+
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def content_id(text: str, source: str) -> str:
+    """Return a deterministic document id for *text* ingested from *source*."""
+
+    digest = hashlib.sha256()
+    digest.update(source.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DedupIndex:
+    """Record the document ids stored in each vault.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file, or ``None`` to keep the index in memory only.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self._lock = threading.Lock()
+        self._known: Dict[str, Set[str]] = {}
+        self._conn = open_sqlite(
+            self.path,
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "vault TEXT NOT NULL, doc_id TEXT NOT NULL, source TEXT, "
+            "content_hash TEXT, added REAL NOT NULL, "
+            "PRIMARY KEY (vault, doc_id))",
+            "CREATE INDEX IF NOT EXISTS documents_source ON documents (vault, source)",
+            what="Ingest index",
+        )
+
+    def _ids_locked(self, vault: str) -> Set[str]:
+        ids = self._known.get(vault)
+        if ids is None:
+            ids = set()
+            if self._conn is not None:
+                rows = self._conn.execute(
+                    "SELECT doc_id FROM documents WHERE vault = ?", (vault,)
+                )
+                ids.update(row[0] for row in rows)
+            self._known[vault] = ids
+        return ids
+
+    def __contains__(self, item: Tuple[str, str]) -> bool:
+        vault, doc_id = item
+        return self.contains(vault, doc_id)
+
+    def contains(self, vault: str, doc_id: str) -> bool:
+        """Return ``True`` if *doc_id* has already been written to *vault*."""
+
+        with self._lock:
+            return doc_id in self._ids_locked(vault)
+
+    def add(
+        self, vault: str, entries: Iterable[Tuple[str, Optional[str], Optional[str]]]
+    ) -> None:
+        """Record ``(doc_id, source, content_hash)`` *entries* for *vault*."""
+
+        entries = list(entries)
+        if not entries:
+            return
+        now = time.time()
+        with self._lock:
+            self._ids_locked(vault).update(doc_id for doc_id, _, _ in entries)
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO documents "
+                    "(vault, doc_id, source, content_hash, added) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(vault, d, s, h, now) for d, s, h in entries],
+                )
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk errors
+                logging.warning("Failed to update ingest index: %s", exc)
+
+    def ids_for_source(self, vault: str, source: str) -> List[str]:
+        """Return the ids recorded for documents of *source* in *vault*.
+
+        A memory-only index does not keep sources and returns an empty list.
+        """
+
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT doc_id FROM documents WHERE vault = ? AND source = ?",
+                (vault, source),
+            )
+            return [row[0] for row in rows]
+
+    def remove(self, vault: str, ids: Iterable[str]) -> None:
+        """Forget *ids* in *vault*, e.g. after their chunks were deleted."""
+
+        ids = list(ids)
+        with self._lock:
+            self._ids_locked(vault).difference_update(ids)
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    "DELETE FROM documents WHERE vault = ? AND doc_id = ?",
+                    [(vault, doc_id) for doc_id in ids],
+                )
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk errors
+                logging.warning("Failed to update ingest index: %s", exc)
+
+    def count(self, vault: str) -> int:
+        with self._lock:
+            return len(self._ids_locked(vault))
+
+    def forget(self, vault: str) -> None:
+        """Drop every entry for *vault*, e.g. after its collection is deleted."""
+
+        with self._lock:
+            self._known.pop(vault, None)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM documents WHERE vault = ?", (vault,))
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def dedup_index_for(chroma_root: str | Path) -> Optional[DedupIndex]:
+    """Return the index configured by the environment for *chroma_root*.
+
+    Returns ``None`` when ``STORM_INGEST_DEDUP`` disables deduplication.
+    """
+
+    if not env_flag("STORM_INGEST_DEDUP"):
+        return None
+    path = os.environ.get("STORM_INGEST_INDEX_PATH") or (
+        Path(chroma_root) / "ingest_index.sqlite3"
+    )
+    return DedupIndex(path)
+
+
+__all__ = [
+    "DedupIndex",
+    "content_hash",
+    "content_id",
+    "dedup_index_for",
+    "normalize_text",
+]
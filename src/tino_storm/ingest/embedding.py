@@ -0,0 +1,510 @@
+"""Pluggable ingest-time embeddings with a content-addressed cache.
+
+Vault documents are embedded in batches when the write buffer flushes, and
+the vectors are written to Chroma together with the documents. Vault search
+embeds queries with the same backend so stored and query vectors match.
+
+The backend is selected with ``STORM_INGEST_EMBEDDER``:
+
+``auto`` (default)
+    ``sentence-transformers`` when the package is installed, otherwise
+    ``chroma``.
+``sentence-transformers[:model]``
+    A local CPU model, ``all-MiniLM-L6-v2`` by default (the model Chroma's
+    default embedding function uses). ``STORM_INGEST_EMBED_MODEL`` also sets
+    the model.
+``encoder``
+    :class:`tino_storm.encoder.Encoder`, configured via ``ENCODER_API_TYPE``.
+``chroma``
+    No ingest-time embeddings; Chroma embeds documents with the collection's
+    embedding function.
+``none``
+    Store a constant placeholder vector (the historical behaviour; only
+    useful for tests and keyword-only setups).
+``package.module:factory``
+    An embedder object, or a class/callable returning one. Embedders provide
+    ``name`` and ``embed(texts) -> vectors``.
+
+Vectors are cached by model name and content hash in
+``<chroma path>/embedding_cache.sqlite3`` (override with
+``STORM_EMBEDDING_CACHE_PATH``, disable with ``STORM_EMBEDDING_CACHE=0``).
+
+The first write to a collection records the embedder name, the spec it was
+built from and the vector size in the collection's metadata. Later writes with
+another embedder fail with :class:`EmbeddingMismatchError`, and vault search
+embeds queries with the recorded embedder instead of the one currently
+configured. Embedders passed as objects have no spec; queries find them only
+in a process that registered them with :func:`register_query_embedder`.
+
+Collections that hold placeholder vectors, recorded as ``none`` or written
+before embedders were recorded, keep receiving placeholder vectors: Chroma
+cannot mix vector sizes within a collection.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from ..env import env_flag
+from ..sqlite_cache import open_sqlite
+from .dedup import content_hash
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+PLACEHOLDER_EMBEDDING = [0.0]
+# Name recorded for collections whose vectors Chroma computes itself
+CHROMA_EMBEDDER = "chroma"
+EMBEDDER_METADATA_KEY = "tino_storm:embedder"
+DIMENSION_METADATA_KEY = "tino_storm:dimension"
+SPEC_METADATA_KEY = "tino_storm:embedder_spec"
+
+Vector = List[float]
+
+
+class Embedder(Protocol):
+    """Maps texts to vectors; ``name`` identifies the model for caching."""
+
+    name: str
+
+    def embed(self, texts: List[str]) -> List[Vector]: ...
+
+
+class SentenceTransformerEmbedder:
+    """Embed texts with a local ``sentence-transformers`` model."""
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        *,
+        batch_size: int = 64,
+        device: Optional[str] = None,
+    ) -> None:
+        self.model_name = model
+        self.name = self.spec = f"sentence-transformers:{model}"
+        self.batch_size = batch_size
+        self.device = device
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        with self._lock:
+            if self._model is None:
+                from .._extras import require_extra
+
+                module = require_extra(
+                    "sentence_transformers",
+                    "retrieval",
+                    package="sentence-transformers",
+                )
+                self._model = module.SentenceTransformer(
+                    self.model_name, device=self.device
+                )
+            return self._model
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        vectors = self._load().encode(
+            list(texts), batch_size=self.batch_size, convert_to_numpy=True
+        )
+        return [list(map(float, v)) for v in vectors]
+
+
+class EncoderEmbedder:
+    """Embed texts through :class:`tino_storm.encoder.Encoder`."""
+
+    def __init__(self, encoder: Any = None, *, max_workers: int = 5) -> None:
+        # Only an encoder configured from the environment can be rebuilt
+        self.spec: Optional[str] = "encoder" if encoder is None else None
+        if encoder is None:
+            from ..encoder import Encoder
+
+            encoder = Encoder()
+        self.encoder = encoder
+        self.max_workers = max_workers
+        self.name = f"encoder:{getattr(encoder, 'embedding_model_name', 'default')}"
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        vectors = self.encoder.encode(list(texts), max_workers=self.max_workers)
+        return [list(map(float, v)) for v in vectors]
+
+
+class PlaceholderEmbedder:
+    """Return a constant vector; keeps the vector store from embedding."""
+
+    name = spec = "none"
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        return [list(PLACEHOLDER_EMBEDDING) for _ in texts]
+
+
+class FunctionEmbedder:
+    """Adapt a plain ``texts -> vectors`` callable to :class:`Embedder`."""
+
+    def __init__(
+        self, func: Callable[[List[str]], Sequence[Sequence[float]]], name: str
+    ):
+        self.func = func
+        self.name = name
+        self.spec: Optional[str] = None
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        return [list(map(float, v)) for v in self.func(list(texts))]
+
+
+class EmbeddingCache:
+    """SQLite cache of vectors keyed by model name and content hash."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Vector] = {}
+        self.hits = 0
+        self.misses = 0
+        self._conn = open_sqlite(
+            self.path,
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created REAL NOT NULL)",
+            what="Embedding cache",
+        )
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content_hash(text).encode("ascii"))
+        return digest.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Vector]:
+        found: Dict[str, Vector] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+            if missing and self._conn is not None:
+                for start in range(0, len(missing), 500):
+                    part = missing[start : start + 500]
+                    rows = self._conn.execute(
+                        "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                        % ",".join("?" * len(part)),
+                        part,
+                    )
+                    for key, blob in rows:
+                        found[key] = array("d", blob).tolist()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, Vector]) -> None:
+        if not items:
+            return
+        with self._lock:
+            if self._conn is None:
+                self._memory.update(items)
+                return
+            now = time.time()
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, created) "
+                    "VALUES (?, ?, ?)",
+                    [(k, array("d", v).tobytes(), now) for k, v in items.items()],
+                )
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk errors
+                logging.warning("Failed to update embedding cache: %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedEmbedder:
+    """Wrap an :class:`Embedder`, embedding only texts missing from *cache*.
+
+    Misses are embedded in sub-batches of ``batch_size`` texts; identical
+    texts within a call are embedded once.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        cache: Optional[EmbeddingCache] = None,
+        *,
+        batch_size: int = 256,
+    ) -> None:
+        self.embedder = embedder
+        self.name = embedder.name
+        self.spec = getattr(embedder, "spec", None)
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+
+    def embed(self, texts: List[str]) -> List[Vector]:
+        keys = [EmbeddingCache.key(self.name, t) for t in texts]
+        known = self.cache.get_many(keys) if self.cache is not None else {}
+        todo: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in known:
+                todo.setdefault(key, text)
+        if todo:
+            pending = list(todo.items())
+            computed: Dict[str, Vector] = {}
+            for start in range(0, len(pending), self.batch_size):
+                part = pending[start : start + self.batch_size]
+                vectors = self.embedder.embed([text for _, text in part])
+                computed.update(zip((key for key, _ in part), vectors))
+            if self.cache is not None:
+                self.cache.set_many(computed)
+            known.update(computed)
+        return [known[key] for key in keys]
+
+
+def _sentence_transformers_available() -> bool:
+    if "sentence_transformers" in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec("sentence_transformers") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _from_spec(spec: str) -> Embedder:
+    module_name, _, attr = spec.partition(":")
+    target = getattr(importlib.import_module(module_name), attr)
+    embedder = (
+        target
+        if hasattr(target, "embed") and not isinstance(target, type)
+        else target()
+    )
+    if not hasattr(embedder, "embed"):
+        raise TypeError(f"{spec} did not produce an embedder with an 'embed' method")
+    if not getattr(embedder, "name", None):
+        embedder.name = spec
+    if not getattr(embedder, "spec", None):
+        try:
+            embedder.spec = spec
+        except AttributeError:  # slotted or read-only embedders
+            pass
+    return embedder
+
+
+def create_embedder(spec: Optional[str] = None) -> Optional[Embedder]:
+    """Return the embedder described by *spec* or ``STORM_INGEST_EMBEDDER``.
+
+    Returns ``None`` for ``chroma``, meaning Chroma should embed documents
+    itself.
+    """
+
+    spec = (spec or os.environ.get("STORM_INGEST_EMBEDDER") or "auto").strip()
+    name, _, arg = spec.partition(":")
+    kind = name.lower()
+    if kind == "auto":
+        kind = (
+            "sentence-transformers" if _sentence_transformers_available() else "chroma"
+        )
+    if kind == "chroma":
+        return None
+    if kind == "none":
+        return PlaceholderEmbedder()
+    if kind in {"sentence-transformers", "sentence_transformers"}:
+        model = arg or os.environ.get("STORM_INGEST_EMBED_MODEL") or DEFAULT_MODEL
+        return SentenceTransformerEmbedder(model)
+    if kind == "encoder":
+        return EncoderEmbedder()
+    if arg:
+        return _from_spec(spec)
+    raise ValueError(f"Unknown embedder {spec!r}")
+
+
+def embedding_cache_for(chroma_root: str | Path) -> Optional[EmbeddingCache]:
+    """Return the embedding cache configured by the environment."""
+
+    if not env_flag("STORM_EMBEDDING_CACHE"):
+        return None
+    path = os.environ.get("STORM_EMBEDDING_CACHE_PATH") or (
+        Path(chroma_root) / "embedding_cache.sqlite3"
+    )
+    return EmbeddingCache(path)
+
+
+class EmbeddingMismatchError(ValueError):
+    """Raised when vectors do not match the embedder a collection was built with."""
+
+
+def embedder_name(embedder: Optional[Embedder]) -> str:
+    """Return the name recorded for collections written with *embedder*."""
+
+    return CHROMA_EMBEDDER if embedder is None else embedder.name
+
+
+def embedder_spec(embedder: Optional[Embedder]) -> Optional[str]:
+    """Return the spec that rebuilds *embedder*, if it has one."""
+
+    return CHROMA_EMBEDDER if embedder is None else getattr(embedder, "spec", None)
+
+
+def collection_embedding(collection: Any) -> Tuple[Optional[str], Optional[int]]:
+    """Return the embedder name and vector size recorded for *collection*."""
+
+    metadata = getattr(collection, "metadata", None) or {}
+    dimension = metadata.get(DIMENSION_METADATA_KEY)
+    return (
+        metadata.get(EMBEDDER_METADATA_KEY),
+        int(dimension) if dimension is not None else None,
+    )
+
+
+def collection_embedder_spec(collection: Any) -> Optional[str]:
+    """Return the embedder spec recorded for *collection*, if any."""
+
+    metadata = getattr(collection, "metadata", None) or {}
+    return metadata.get(SPEC_METADATA_KEY)
+
+
+def _stored_dimension(collection: Any) -> Optional[int]:
+    """Return the size of a vector already in *collection*, if any."""
+
+    try:
+        if not collection.count():
+            return None
+        rows = collection.get(limit=1, include=["embeddings"])
+        vectors = rows.get("embeddings")
+        return len(vectors[0]) if vectors is not None and len(vectors) else None
+    except Exception:  # noqa: BLE001 - collections without these methods
+        return None
+
+
+def holds_placeholders(collection: Any) -> bool:
+    """Return whether *collection* stores placeholder vectors.
+
+    That is a collection recorded as ``none``, or an unrecorded one whose
+    stored vectors have the placeholder's size.
+    """
+
+    name, _ = collection_embedding(collection)
+    if name is not None:
+        return name == PlaceholderEmbedder.name
+    return _stored_dimension(collection) == len(PLACEHOLDER_EMBEDDING)
+
+
+def bind_collection_embedding(
+    collection: Any,
+    name: str,
+    dimension: Optional[int],
+    spec: Optional[str] = None,
+) -> None:
+    """Record *name*, *spec* and *dimension* on *collection*, or check them.
+
+    Raises :class:`EmbeddingMismatchError` when the collection was built with
+    another embedder or holds vectors of another size.
+    """
+
+    stored_name, stored_dimension = collection_embedding(collection)
+    if stored_name is None:
+        stored_dimension = _stored_dimension(collection)
+    mismatch = (stored_name is not None and stored_name != name) or (
+        stored_dimension is not None
+        and dimension is not None
+        and stored_dimension != dimension
+    )
+    if mismatch:
+        raise EmbeddingMismatchError(
+            f"Collection {getattr(collection, 'name', '?')!r} was built with "
+            f"{stored_name or 'another embedder'} ({stored_dimension} dimensions), "
+            f"not {name} ({dimension} dimensions); set STORM_INGEST_EMBEDDER to "
+            "match or re-create the vault"
+        )
+    modify = getattr(collection, "modify", None)
+    if stored_name is not None or modify is None:
+        return
+    # Chroma does not allow the hnsw settings to be changed after creation
+    metadata = {
+        k: v
+        for k, v in (getattr(collection, "metadata", None) or {}).items()
+        if not k.startswith("hnsw:")
+    }
+    metadata[EMBEDDER_METADATA_KEY] = name
+    if spec is not None:
+        metadata[SPEC_METADATA_KEY] = spec
+    if dimension is not None:
+        metadata[DIMENSION_METADATA_KEY] = dimension
+    modify(metadata=metadata)
+
+
+_QUERY_EMBEDDERS: Dict[str, Optional[Embedder]] = {}
+_QUERY_LOCK = threading.Lock()
+
+
+def register_query_embedder(embedder: Embedder) -> None:
+    """Make *embedder* available to queries against collections it wrote."""
+
+    with _QUERY_LOCK:
+        _QUERY_EMBEDDERS.setdefault(embedder.name, embedder)
+
+
+def query_embedder(
+    name: Optional[str] = None, spec: Optional[str] = None
+) -> Optional[Embedder]:
+    """Return the shared embedder used for vault queries.
+
+    *name* and *spec* are the embedder recorded for a collection. Embedders
+    registered with :func:`register_query_embedder` are used as is, others
+    are built from *spec*, or from *name* for the built-in backends. Raises
+    :class:`LookupError` when neither builds an embedder. Without a name the
+    configured backend is used and the placeholder embedder is skipped.
+
+    ``None`` means queries should be embedded by Chroma (``query_texts``).
+    """
+
+    key = name or os.environ.get("STORM_INGEST_EMBEDDER") or "auto"
+    with _QUERY_LOCK:
+        if key not in _QUERY_EMBEDDERS:
+            try:
+                _QUERY_EMBEDDERS[key] = create_embedder(spec or key)
+            except (ImportError, AttributeError, TypeError, ValueError) as exc:
+                if name is None:
+                    raise
+                raise LookupError(
+                    f"Cannot rebuild embedder {name!r}"
+                    + (f" from {spec!r}" if spec else "")
+                    + f": {exc}"
+                ) from exc
+        embedder = _QUERY_EMBEDDERS[key]
+    if name is None and isinstance(embedder, PlaceholderEmbedder):
+        return None
+    return embedder
+
+
+__all__ = [
+    "CachedEmbedder",
+    "Embedder",
+    "EmbeddingCache",
+    "EmbeddingMismatchError",
+    "EncoderEmbedder",
+    "FunctionEmbedder",
+    "PlaceholderEmbedder",
+    "SentenceTransformerEmbedder",
+    "bind_collection_embedding",
+    "collection_embedder_spec",
+    "collection_embedding",
+    "create_embedder",
+    "embedder_name",
+    "embedder_spec",
+    "embedding_cache_for",
+    "holds_placeholders",
+    "query_embedder",
+    "register_query_embedder",
+]
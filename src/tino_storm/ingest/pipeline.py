@@ -0,0 +1,357 @@
+"""Queue-based ingestion pipeline.
+
+:class:`IngestPipeline` moves file handling off the watchdog observer thread.
+Dropped files flow through five stages connected by bounded queues:
+
+``intake``
+    Reads the dropped file or manifest and splits it into fetch tasks.
+``fetch``
+    Performs network and disk I/O (URL downloads, crawls, scrapers).
+``extract``
+    Turns fetched HTML into text.
+``chunk``
+    Splits large batches of documents into chunks in a process pool.
+``write``
+    Hands documents to :meth:`VaultIngestHandler._write_documents`, which
+    batches writes through the handler's write buffer.
+
+A file is recorded in the handler's file manifest only once all of its
+tasks have finished and every chunk they produced has been written, so a
+file whose ingest failed is retried by the next reconciliation.
+
+Each stage has its own worker threads. Full queues block the upstream stage,
+so a burst of dropped files applies backpressure instead of growing memory
+without bound. :meth:`IngestPipeline.shutdown` drains every stage before
+stopping the workers; with ``drain=False`` workers stop after their current
+item, queued items are dropped and their files are left for the next
+reconciliation.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional
+
+from ..events import ResearchAdded, event_emitter
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .reconcile import FileState
+    from .watcher import VaultIngestHandler, _FileJob
+
+# How often idle workers and blocked hand-offs check for shutdown
+_POLL_INTERVAL = 0.1
+
+STAGES = ("intake", "fetch", "extract", "chunk", "write")
+
+
+class _Intake(NamedTuple):
+    """A submitted file waiting for the intake stage."""
+
+    path: Path
+    vault: str
+    skip_unchanged: bool = False
+    state: Optional["FileState"] = None
+
+
+class _Work(NamedTuple):
+    """Data handed to a stage after intake, with the job of its file."""
+
+    data: Any
+    job: "_FileJob"
+
+
+def default_worker_count() -> int:
+    """Return the fetch worker count from ``STORM_INGEST_WORKERS`` (default 4)."""
+
+    try:
+        return int(os.environ.get("STORM_INGEST_WORKERS", 4))
+    except ValueError:
+        return 4
+
+
+class IngestPipeline:
+    """Run :class:`VaultIngestHandler` work on staged worker pools.
+
+    Parameters
+    ----------
+    handler:
+        The handler providing ``_plan_file``, ``_extract``,
+        ``_chunk_documents`` and ``_write_documents``.
+    fetch_workers, extract_workers, write_workers:
+        Number of threads per stage. ``intake`` and ``chunk`` always use one
+        thread; the chunker parallelizes large batches with processes.
+    max_queue:
+        Capacity of each inter-stage queue.
+    """
+
+    def __init__(
+        self,
+        handler: "VaultIngestHandler",
+        *,
+        fetch_workers: int = 4,
+        extract_workers: int = 2,
+        write_workers: int = 1,
+        max_queue: int = 256,
+    ) -> None:
+        self.handler = handler
+        self._workers_per_stage = {
+            "intake": 1,
+            "fetch": max(1, fetch_workers),
+            "extract": max(1, extract_workers),
+            "chunk": 1,
+            "write": max(1, write_workers),
+        }
+        self._queues: Dict[str, queue.Queue] = {
+            stage: queue.Queue(maxsize=max_queue) for stage in STAGES
+        }
+        self._handlers: Dict[str, Callable[[Any], None]] = {
+            "intake": self._intake,
+            "fetch": self._fetch,
+            "extract": self._extract,
+            "chunk": self._chunk,
+            "write": self._write,
+        }
+        self._threads: List[threading.Thread] = []
+        self._counts_lock = threading.Lock()
+        self._processed = {stage: 0 for stage in STAGES}
+        self._errors = {stage: 0 for stage in STAGES}
+        self._started = False
+        self._stopping = threading.Event()
+
+    @classmethod
+    def with_workers(
+        cls, handler: "VaultIngestHandler", workers: int, **kwargs: Any
+    ) -> "IngestPipeline":
+        """Build a pipeline sized from a single ``--workers`` value."""
+
+        return cls(
+            handler,
+            fetch_workers=workers,
+            extract_workers=max(1, workers // 2),
+            **kwargs,
+        )
+
+    # -- lifecycle -------------------------------------------------------
+
+    def start(self) -> "IngestPipeline":
+        if self._started:
+            return self
+        self._started = True
+        # Keep the handler in batching mode; the write buffer's latency timer
+        # and drain() take care of flushing.
+        self.handler._enter_batch()
+        for stage in STAGES:
+            for i in range(self._workers_per_stage[stage]):
+                thread = threading.Thread(
+                    target=self._run_stage,
+                    args=(stage,),
+                    name=f"ingest-{stage}-{i}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def submit(
+        self,
+        path: Path,
+        vault: str,
+        timeout: Optional[float] = None,
+        *,
+        skip_unchanged: bool = False,
+        state: Optional["FileState"] = None,
+    ) -> None:
+        """Queue a dropped file, blocking while the intake queue is full.
+
+        With ``skip_unchanged`` the intake worker drops the file when its
+        content matches the manifest. A *state* computed by the caller is
+        reused so the intake worker does not hash the file again.
+        """
+
+        if not self._started:
+            self.start()
+        self._queues["intake"].put(
+            _Intake(Path(path), vault, skip_unchanged, state), timeout=timeout
+        )
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued file has been written.
+
+        Returns ``False`` if *timeout* elapsed before the pipeline was empty.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for stage in STAGES:
+            if not self._join(self._queues[stage], deadline):
+                return False
+        self.handler.flush()
+        return True
+
+    @staticmethod
+    def _join(q: queue.Queue, deadline: Optional[float]) -> bool:
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop all workers, draining queued work first unless ``drain=False``."""
+
+        if not self._started:
+            return
+        if drain:
+            self.drain(timeout)
+        # Workers blocked handing items to a full queue give up once stopping
+        # is set, so no stage waits on another to make room.
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        for stage in STAGES:
+            self._discard_queued(stage)
+        self._threads = []
+        self._started = False
+        self._stopping.clear()
+        self.handler._leave_batch()
+        self.handler.flush()
+
+    def __enter__(self) -> "IngestPipeline":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return queue depth, processed and error counts per stage."""
+
+        with self._counts_lock:
+            return {
+                stage: {
+                    "queued": self._queues[stage].qsize(),
+                    "processed": self._processed[stage],
+                    "errors": self._errors[stage],
+                }
+                for stage in STAGES
+            }
+
+    # -- stages ----------------------------------------------------------
+
+    def _run_stage(self, stage: str) -> None:
+        q = self._queues[stage]
+        handle = self._handlers[stage]
+        while not self._stopping.is_set():
+            try:
+                item = q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            try:
+                if self._stopping.is_set():
+                    self._drop(stage, item)
+                    continue
+                try:
+                    handle(item)
+                except Exception as exc:  # noqa: BLE001
+                    with self._counts_lock:
+                        self._errors[stage] += 1
+                    self._report_error(stage, item, exc)
+                    if stage != "intake":
+                        self.handler._finish_task(item.job, failed=True)
+                else:
+                    with self._counts_lock:
+                        self._processed[stage] += 1
+            finally:
+                q.task_done()
+
+    def _put(self, stage: str, item: Any) -> None:
+        """Queue *item* for *stage*, dropping it if the pipeline is stopping."""
+
+        q = self._queues[stage]
+        while not self._stopping.is_set():
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+        self._drop(stage, item)
+
+    def _drop(self, stage: str, item: Any) -> None:
+        # Intake items have no job yet; the file is simply not recorded.
+        if stage != "intake":
+            self.handler._finish_task(item.job, failed=True)
+
+    def _discard_queued(self, stage: str) -> None:
+        q = self._queues[stage]
+        while True:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                return
+            self._drop(stage, item)
+            q.task_done()
+
+    def _report_error(self, stage: str, item: Any, exc: Exception) -> None:
+        vault = item.vault if isinstance(item, _Intake) else item.job.vault
+        logging.exception("Ingest %s stage failed for %r", stage, item)
+        event_emitter.emit_sync(
+            ResearchAdded(
+                topic=str(vault),
+                information_table={"error": str(exc), "stage": stage},
+            )
+        )
+
+    # Items after intake carry the file's job; a task that produces nothing
+    # for the next stage, or fails, is finished for that job.
+
+    def _intake(self, item: Any) -> None:
+        job = self.handler._begin_file(item.path, item.vault, item.state)
+        if item.skip_unchanged and self.handler._unchanged(job):
+            return
+        try:
+            tasks = self.handler._plan_file(item.path, item.vault)
+        except Exception:
+            self.handler._finish_task(job, failed=True)
+            raise
+        job.tasks += len(tasks)
+        for task in tasks:
+            self._put("fetch", _Work(task, job))
+        self.handler._finish_task(job)
+
+    def _fetch(self, item: Any) -> None:
+        task, job = item
+        fetched = list(task())
+        if fetched:
+            self._put("extract", _Work(fetched, job))
+        else:
+            self.handler._finish_task(job)
+
+    def _extract(self, item: Any) -> None:
+        fetched, job = item
+        docs = []
+        for entry in fetched:
+            text = self.handler._extract(entry)
+            if text:
+                docs.append((text, entry.source))
+        if docs:
+            self._put("chunk", _Work(docs, job))
+        else:
+            self.handler._finish_task(job)
+
+    def _chunk(self, item: Any) -> None:
+        docs, job = item
+        self._put("write", _Work(self.handler._chunk_documents(docs), job))
+
+    def _write(self, item: Any) -> None:
+        prepared, job = item
+        with self.handler._file_scope(job):
+            self.handler._write_documents(prepared, job.vault)
+        self.handler._finish_task(job)
+
+
+__all__ = ["IngestPipeline", "default_worker_count"]
@@ -0,0 +1,268 @@
+"""Startup reconciliation between the vault tree and what was ingested.
+
+The watcher only sees files created while it runs. :func:`reconcile` walks
+the vault root and compares every file against a persisted
+:class:`FileManifest` of ``(path, size, mtime, content hash)``. Files that are
+new or whose content changed are ingested, through an
+:class:`~.pipeline.IngestPipeline` when one is given. Files whose size and
+mtime are unchanged are skipped without being read. Files with a new mtime
+but the same hash are only re-stamped.
+
+The manifest lives in ``<chroma path>/ingest_manifest.sqlite3`` (override with
+``STORM_INGEST_MANIFEST_PATH``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from ..sqlite_cache import open_sqlite
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .pipeline import IngestPipeline
+    from .watcher import VaultIngestHandler
+
+
+class FileState(NamedTuple):
+    """Size, modification time and content hash of an ingested file."""
+
+    size: int
+    mtime: float
+    hash: str
+
+
+def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of the file at *path*."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_state(path: Path) -> FileState:
+    st = path.stat()
+    return FileState(st.st_size, st.st_mtime, file_hash(path))
+
+
+# Partial downloads and editor swap files; they are renamed once complete
+TEMP_SUFFIXES = {".tmp", ".part", ".crdownload", ".download", ".swp", ".swx"}
+
+
+def is_ignored(rel: Path) -> bool:
+    """Return ``True`` for hidden, backup and temporary files under the root."""
+
+    return rel.suffix.lower() in TEMP_SUFFIXES or any(
+        part.startswith(".") or part.endswith("~") for part in rel.parts
+    )
+
+
+def iter_vault_files(root: Path) -> Iterator[Tuple[Path, str]]:
+    """Yield ``(path, vault)`` for every file inside a vault folder of *root*.
+
+    Files matching :func:`is_ignored` are skipped, as are files directly in
+    *root*, which belong to no vault.
+    """
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        base = Path(dirpath)
+        rel_dir = base.relative_to(root)
+        if not rel_dir.parts:
+            continue
+        for name in sorted(filenames):
+            rel = rel_dir / name
+            if not is_ignored(rel):
+                yield base / name, rel.parts[0]
+
+
+class FileManifest:
+    """Persisted record of the files ingested from a vault root.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file, or ``None`` to keep the manifest in memory.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Tuple[str, FileState]] = {}
+        self._conn = open_sqlite(
+            self.path,
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, vault TEXT NOT NULL, size INTEGER NOT NULL, "
+            "mtime REAL NOT NULL, hash TEXT NOT NULL)",
+            what="Ingest manifest",
+        )
+
+    def get(self, path: str) -> Optional[FileState]:
+        with self._lock:
+            if self._conn is None:
+                entry = self._memory.get(path)
+                return entry[1] if entry else None
+            row = self._conn.execute(
+                "SELECT size, mtime, hash FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return FileState(*row) if row else None
+
+    def set(self, path: str, vault: str, state: FileState) -> None:
+        with self._lock:
+            if self._conn is None:
+                self._memory[path] = (vault, state)
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, vault, size, mtime, hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, vault, *state),
+            )
+            self._conn.commit()
+
+    def remove(self, paths: Iterable[str]) -> None:
+        paths = list(paths)
+        with self._lock:
+            if self._conn is None:
+                for path in paths:
+                    self._memory.pop(path, None)
+                return
+            self._conn.executemany(
+                "DELETE FROM files WHERE path = ?", [(p,) for p in paths]
+            )
+            self._conn.commit()
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            if self._conn is None:
+                return list(self._memory)
+            return [row[0] for row in self._conn.execute("SELECT path FROM files")]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def file_manifest_for(chroma_root: str | Path) -> FileManifest:
+    """Return the manifest configured by the environment for *chroma_root*."""
+
+    path = os.environ.get("STORM_INGEST_MANIFEST_PATH") or (
+        Path(chroma_root) / "ingest_manifest.sqlite3"
+    )
+    return FileManifest(path)
+
+
+@dataclass
+class ReconcileReport:
+    """Summary of a :func:`reconcile` pass."""
+
+    scanned: int = 0
+    unchanged: int = 0
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def ingested(self) -> int:
+        return len(self.new) + len(self.changed)
+
+
+def reconcile(
+    handler: "VaultIngestHandler",
+    pipeline: Optional["IngestPipeline"] = None,
+    *,
+    hash_workers: int = 8,
+) -> ReconcileReport:
+    """Ingest files under ``handler.root`` that are new or changed.
+
+    Files are submitted to *pipeline* when given (the caller drains it),
+    otherwise handled inline. Manifest entries for files that no longer exist
+    are dropped; their documents stay in the vault.
+    """
+
+    manifest = handler.manifest
+    report = ReconcileReport()
+    seen = set()
+    candidates: List[Tuple[Path, str, Optional[FileState]]] = []
+    for path, vault in iter_vault_files(handler.root):
+        key = str(path.resolve())
+        seen.add(key)
+        report.scanned += 1
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        known = manifest.get(key)
+        if known is not None and (known.size, known.mtime) == (st.st_size, st.st_mtime):
+            report.unchanged += 1
+            continue
+        candidates.append((path, vault, known))
+
+    def _state(path: Path) -> Optional[FileState]:
+        try:
+            return file_state(path)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, hash_workers)) as pool:
+        states = list(pool.map(_state, (path for path, _, _ in candidates)))
+
+    for (path, vault, known), state in zip(candidates, states):
+        if state is None:
+            continue
+        key = str(path.resolve())
+        if known is not None and known.hash == state.hash:
+            manifest.set(key, vault, state)
+            report.unchanged += 1
+            continue
+        (report.new if known is None else report.changed).append(key)
+        if pipeline is not None:
+            pipeline.submit(path, vault, state=state)
+        else:
+            handler._handle_file(path, vault, state=state)
+
+    root = str(handler.root) + os.sep
+    gone = [p for p in manifest.paths() if p.startswith(root) and p not in seen]
+    if gone:
+        manifest.remove(gone)
+        report.removed = gone
+
+    logging.info(
+        "Reconciled %s: %d new, %d changed, %d unchanged, %d removed",
+        handler.root,
+        len(report.new),
+        len(report.changed),
+        report.unchanged,
+        len(report.removed),
+    )
+    return report
+
+
+__all__ = [
+    "FileManifest",
+    "FileState",
+    "ReconcileReport",
+    "file_manifest_for",
+    "file_state",
+    "is_ignored",
+    "iter_vault_files",
+    "reconcile",
+]
@@ -9,6 +9,12 @@ from typing import Any, Dict, Iterable, List, Optional
 
 from .._extras import MissingExtraError, require_extra
 from .utils import list_vaults  # noqa: F401
+from .embedding import (
+    EmbeddingMismatchError,
+    collection_embedder_spec,
+    collection_embedding,
+    query_embedder,
+)
 from ..events import ResearchAdded, event_emitter
 from ..security import (
     get_passphrase,
@@ -23,6 +29,55 @@ from ..retrieval.bayes import add_posteriors
 from ..events import ResearchAdded, event_emitter
 
 
+_UNRESOLVED = object()
+
+
+def _embedding_args(query: str, embedder: Any) -> Dict[str, Any]:
+    if embedder is None:
+        return {"query_texts": [query]}
+    return {"query_embeddings": embedder.embed([query])}
+
+
+def _query_args(
+    query: str, collection: Any, cache: Dict[Optional[str], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Return ``collection.query`` arguments embedding *query* like ingest did.
+
+    Collections record the embedder that wrote them; the query is embedded
+    with that one and must match the recorded size. Collections without a
+    record, or whose embedder cannot be rebuilt here, use the configured
+    backend and fall back to Chroma's embedder. *cache* holds the arguments
+    already computed per embedder name.
+    """
+
+    name, dimension = collection_embedding(collection)
+    if name not in cache:
+        embedder: Any = _UNRESOLVED
+        if name is not None:
+            try:
+                embedder = query_embedder(name, collection_embedder_spec(collection))
+            except LookupError as exc:
+                logging.warning("%s; using the configured embedder", exc)
+        if embedder is not _UNRESOLVED:
+            cache[name] = _embedding_args(query, embedder)
+        else:
+            try:
+                cache[name] = _embedding_args(query, query_embedder())
+            except Exception as exc:  # noqa: BLE001 - fall back to Chroma's embedder
+                logging.warning(
+                    "Query embedding failed, using Chroma's embedder: %s", exc
+                )
+                cache[name] = {"query_texts": [query]}
+    args = cache[name]
+    vectors = args.get("query_embeddings")
+    if dimension is not None and vectors and len(vectors[0]) != dimension:
+        raise EmbeddingMismatchError(
+            f"{name} query vectors have {len(vectors[0])} dimensions, "
+            f"the collection holds {dimension}"
+        )
+    return args
+
+
 def search_vaults(
     query: str,
     vaults: Iterable[str],
@@ -67,6 +122,7 @@ def search_vaults(
         client = None
         client_map: dict[str | None, Any] = {}
 
+    query_args: Dict[Optional[str], Dict[str, Any]] = {}
     rankings: List[List[Dict[str, Any]]] = []
     for vault_name in vault_list:
         if vault is not None:
@@ -79,18 +135,19 @@ def search_vaults(
                 client_map[pw] = c
             collection = c.get_or_create_collection(vault_name)
         try:
+            args = _query_args(query, collection, query_args)
             if timeout is not None:
 
                 async def _query() -> Dict[str, Any]:
                     return await asyncio.to_thread(
                         collection.query,
-                        query_texts=[query],
                         n_results=k_per_vault,
+                        **args,
                     )
 
                 res = asyncio.run(asyncio.wait_for(_query(), timeout))
             else:
-                res = collection.query(query_texts=[query], n_results=k_per_vault)
+                res = collection.query(n_results=k_per_vault, **args)
         except asyncio.TimeoutError:
             raise
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -4,9 +4,13 @@ import os
 import time
 import atexit
 import json
-import asyncio
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from typing import Any, Optional, List
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, List, Tuple
 
 from .._extras import require_extra
 
@@ -37,7 +41,31 @@ from ..security import (
 )
 from ..security.encrypted_chroma import EncryptedChroma
 
-from ..events import ResearchAdded, event_emitter
+from .buffer import IngestWriteBuffer
+from .chunking import Chunk, Chunker
+from .dedup import content_hash, content_id, dedup_index_for
+from .embedding import (
+    PLACEHOLDER_EMBEDDING,
+    CachedEmbedder,
+    Embedder,
+    PlaceholderEmbedder,
+    bind_collection_embedding,
+    create_embedder,
+    embedder_name,
+    embedder_spec,
+    embedding_cache_for,
+    holds_placeholders,
+    register_query_embedder,
+)
+from .pipeline import IngestPipeline, default_worker_count
+from .reconcile import (
+    FileState,
+    ReconcileReport,
+    file_manifest_for,
+    file_state,
+    is_ignored,
+    reconcile,
+)
 
 
 _DOC_CAPTURE: dict[int, tuple[ReferenceType[Any], List[str]]] = {}
@@ -98,6 +126,25 @@ def _record_documents(collection: Any, documents: List[str]) -> None:
         doc_list.extend(documents)
 
 
+# URLs or arXiv ids fetched concurrently by a single pipeline fetch task
+FETCH_CHUNK_SIZE = 32
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class FetchedItem(NamedTuple):
+    """A fetched document awaiting text extraction."""
+
+    source: str
+    text: Optional[str] = None
+    html: Optional[str] = None
+
+
+FetchTask = Callable[[], Iterable[FetchedItem]]
+
+
 def load_txt_documents(path: str):
     """Return documents loaded from ``path`` using ``llama_index``."""
 
@@ -106,8 +153,187 @@ def load_txt_documents(path: str):
     return SimpleDirectoryReader(input_files=[path]).load_data()
 
 
+def default_debounce() -> float:
+    """Return the event debounce delay from ``STORM_INGEST_DEBOUNCE`` (default 1s)."""
+
+    try:
+        return float(os.environ.get("STORM_INGEST_DEBOUNCE", 1.0))
+    except ValueError:
+        return 1.0
+
+
+def _signature(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class _PendingPath:
+    __slots__ = ("first", "due", "signature")
+
+    def __init__(self, first: float, due: float, signature: Optional[tuple[int, int]]):
+        self.first = first
+        self.due = due
+        self.signature = signature
+
+
+class EventCoalescer:
+    """Debounce filesystem events per path until the file stops changing.
+
+    Every :meth:`touch` of a path pushes its deadline ``delay`` seconds into
+    the future, so a burst of created/modified/moved events becomes a single
+    callback. When the deadline passes, the file's size and mtime are
+    compared with the previous check; a file that is still being written is
+    re-armed for another ``delay`` until it is stable or ``max_wait`` seconds
+    have passed since the first event. Paths that disappear are dropped.
+
+    Callbacks run on a background thread, one path at a time.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Path], None],
+        *,
+        delay: float = 1.0,
+        max_wait: float = 60.0,
+    ) -> None:
+        self.callback = callback
+        self.delay = delay
+        self.max_wait = max_wait
+        self.coalesced = 0
+        self._pending: dict[Path, _PendingPath] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def touch(self, path: Path) -> None:
+        """Record an event for *path*, restarting its debounce timer."""
+
+        path = Path(path)
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return
+            entry = self._pending.get(path)
+            if entry is None:
+                self._pending[path] = _PendingPath(
+                    now, now + self.delay, _signature(path)
+                )
+            else:
+                entry.due = now + self.delay
+                self.coalesced += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ingest-coalescer", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def discard(self, path: Path) -> None:
+        """Forget a pending *path*, e.g. after it was deleted or moved away."""
+
+        with self._cond:
+            self._pending.pop(Path(path), None)
+
+    def _due_locked(self, now: float) -> List[Path]:
+        ready = []
+        for path, entry in list(self._pending.items()):
+            if entry.due > now:
+                continue
+            signature = _signature(path)
+            if signature is None:
+                del self._pending[path]
+                continue
+            if signature != entry.signature and now - entry.first < self.max_wait:
+                entry.signature = signature
+                entry.due = now + self.delay
+                continue
+            del self._pending[path]
+            ready.append(path)
+        return ready
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    ready = self._due_locked(now)
+                    if ready:
+                        break
+                    timeout = (
+                        min(e.due for e in self._pending.values()) - now
+                        if self._pending
+                        else None
+                    )
+                    self._cond.wait(timeout)
+            self._dispatch(ready)
+
+    def _dispatch(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            try:
+                self.callback(path)
+            except Exception:  # noqa: BLE001 - keep the coalescer alive
+                logging.exception("Failed to handle %s", path)
+
+    def flush(self) -> None:
+        """Hand every pending path that still exists to the callback now."""
+
+        with self._cond:
+            paths = [p for p in self._pending if p.exists()]
+            self._pending.clear()
+        self._dispatch(paths)
+
+    def close(self) -> None:
+        """Flush pending paths and stop the background thread."""
+
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class _FileJob:
+    """A dropped file whose manifest entry waits until its chunks are stored.
+
+    ``tasks`` counts the file's outstanding pipeline tasks and ``pending``
+    the chunk ids still waiting in the write buffer.
+    """
+
+    __slots__ = ("path", "vault", "state", "tasks", "pending", "failed")
+
+    def __init__(self, path: Path, vault: str, state: Optional[FileState]) -> None:
+        self.path = path
+        self.vault = vault
+        self.state = state
+        self.tasks = 1
+        self.pending: set[tuple[str, str]] = set()
+        self.failed = False
+
+    def ready(self) -> bool:
+        return self.tasks == 0 and not self.pending and not self.failed
+
+
 class VaultIngestHandler(FileSystemEventHandler):
-    """Watch a vault directory and ingest dropped files, URLs or manifests."""
+    """Watch a vault directory and ingest dropped files, URLs or manifests.
+
+    Documents are split into chunks by a :class:`~.chunking.Chunker`,
+    embedded in batches by the configured :mod:`~.embedding` backend and
+    written through an :class:`~.buffer.IngestWriteBuffer`.
+    Each dropped file is ingested as one batch scope, and the handler can be
+    used as a context manager (or via :meth:`batch`) to batch writes across
+    several calls. Outside a batch scope ``_ingest_text`` writes immediately.
+    """
 
     def _instrument_client(self, client: Any) -> None:
         """Add in-memory doc capture instrumentation for tests."""
@@ -121,6 +347,12 @@ class VaultIngestHandler(FileSystemEventHandler):
                 self._collection = collection
                 self.docs: List[str] = []
 
+            def _capture(self, documents) -> None:
+                if documents is not None:
+                    payload = list(documents)
+                    self.docs.extend(payload)
+                    _record_documents(self, payload)
+
             def add(
                 self,
                 documents=None,
@@ -129,10 +361,7 @@ class VaultIngestHandler(FileSystemEventHandler):
                 embeddings=None,
                 **kwargs,
             ):
-                if documents is not None:
-                    payload = list(documents)
-                    self.docs.extend(payload)
-                    _record_documents(self, payload)
+                self._capture(documents)
                 return self._collection.add(
                     documents=documents,
                     metadatas=metadatas,
@@ -141,6 +370,26 @@ class VaultIngestHandler(FileSystemEventHandler):
                     **kwargs,
                 )
 
+            def upsert(
+                self,
+                documents=None,
+                metadatas=None,
+                ids=None,
+                embeddings=None,
+                **kwargs,
+            ):
+                self._capture(documents)
+                write = (
+                    getattr(self._collection, "upsert", None) or self._collection.add
+                )
+                return write(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids,
+                    embeddings=embeddings,
+                    **kwargs,
+                )
+
             def __getattr__(self, name: str) -> Any:
                 return getattr(self._collection, name)
 
@@ -184,6 +433,11 @@ class VaultIngestHandler(FileSystemEventHandler):
         reddit_client_id: Optional[str] = None,
         reddit_client_secret: Optional[str] = None,
         vault: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        embedder: Optional[str | Embedder] = None,
     ) -> None:
         self.root = Path(root).expanduser().resolve()
         chroma_root = Path(
@@ -205,44 +459,387 @@ class VaultIngestHandler(FileSystemEventHandler):
         self.reddit_client_id = reddit_client_id
         self.reddit_client_secret = reddit_client_secret
 
+        self.chunker = Chunker(chunk_size, chunk_overlap)
+        self._index = dedup_index_for(self._chroma_root)
+        self.manifest = file_manifest_for(self._chroma_root)
+        self._in_flight: set[tuple[str, str]] = set()
+        self._dedup_lock = threading.Lock()
+        # Files waiting for buffered chunk ids, keyed by ``(vault, doc_id)``
+        self._waiting: dict[tuple[str, str], List[_FileJob]] = {}
+        self._scope = threading.local()
+        self._placeholder_warned: set[str] = set()
+        self.skipped = 0
+        if embedder is None or isinstance(embedder, str):
+            embedder = create_embedder(embedder)
+        if embedder is not None and not isinstance(embedder, PlaceholderEmbedder):
+            embedder = CachedEmbedder(embedder, embedding_cache_for(self._chroma_root))
+        self.embedder: Optional[Embedder] = embedder
+        if embedder is not None:
+            register_query_embedder(embedder)
+        self._buffer = IngestWriteBuffer(
+            batch_size=batch_size,
+            max_latency=flush_interval,
+            upsert=True,
+            on_write=self._on_write,
+            on_error=self._on_write_error,
+            embed=embedder.embed if embedder is not None else None,
+            before_write=self._check_embedding,
+        )
+        # Batch scopes are entered from the pipeline, observer and reconcile
+        # threads
+        self._batch_depth = 0
+        self._depth_lock = threading.Lock()
+        # Set by start_watcher to move file handling off the observer thread
+        self.pipeline: Optional[IngestPipeline] = None
+        # Set by start_watcher to debounce bursts of filesystem events
+        self.coalescer: Optional[EventCoalescer] = None
+
         super().__init__()
 
+    @contextmanager
+    def batch(self) -> Iterator["VaultIngestHandler"]:
+        """Buffer writes until the outermost ``batch`` scope exits."""
+
+        self._enter_batch()
+        try:
+            yield self
+        finally:
+            if self._leave_batch():
+                self.flush()
+
+    def _enter_batch(self) -> None:
+        with self._depth_lock:
+            self._batch_depth += 1
+
+    def _leave_batch(self) -> bool:
+        """Leave a batch scope, returning ``True`` if it was the outermost."""
+
+        with self._depth_lock:
+            self._batch_depth -= 1
+            return self._batch_depth == 0
+
+    def _batching(self) -> bool:
+        with self._depth_lock:
+            return self._batch_depth > 0
+
+    def flush(self) -> int:
+        """Write all buffered documents and return how many were written."""
+
+        return self._buffer.flush()
+
+    def __enter__(self) -> "VaultIngestHandler":
+        self._enter_batch()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._leave_batch()
+        self.flush()
+
+    def _check_embedding(
+        self,
+        vault: str,
+        collection: Any,
+        documents: List[str],
+        embeddings: Optional[List[List[float]]],
+    ) -> Optional[List[List[float]]]:
+        """Refuse to mix this handler's vectors with another embedder's.
+
+        Encrypted vaults and collections of placeholder vectors get
+        placeholders, which carry nothing about the plaintext and keep the
+        collection's vector size.
+        """
+
+        encrypted = bool(get_passphrase(vault or self._vault))
+        if encrypted or holds_placeholders(collection):
+            if not encrypted and not isinstance(self.embedder, PlaceholderEmbedder):
+                self._warn_placeholders(collection)
+            bind_collection_embedding(
+                collection,
+                PlaceholderEmbedder.name,
+                len(PLACEHOLDER_EMBEDDING),
+                PlaceholderEmbedder.spec,
+            )
+            return [list(PLACEHOLDER_EMBEDDING) for _ in documents]
+        dimension = len(embeddings[0]) if embeddings else None
+        bind_collection_embedding(
+            collection,
+            embedder_name(self.embedder),
+            dimension,
+            embedder_spec(self.embedder),
+        )
+        return embeddings
+
+    def _warn_placeholders(self, collection: Any) -> None:
+        name = getattr(collection, "name", "?")
+        with self._dedup_lock:
+            if name in self._placeholder_warned:
+                return
+            self._placeholder_warned.add(name)
+        logging.warning(
+            "Collection %r holds placeholder vectors; writing placeholders "
+            "instead of %s embeddings. Re-create the vault to embed it.",
+            name,
+            embedder_name(self.embedder),
+        )
+
     def _ingest_text(self, text: str, source: str, vault: str) -> None:
+        self._ingest_chunks(text, source, vault, self.chunker.split(text))
+
+    def _ingest_chunks(
+        self, text: str, source: str, vault: str, chunks: List[Chunk]
+    ) -> None:
+        """Buffer the *chunks* of a document, skipping ones already stored."""
+
+        passphrase = get_passphrase(vault or self._vault)
         client = self._get_client(vault)
         collection = client.get_or_create_collection(vault)
+        # Vectors and hashes of the plaintext would be stored unencrypted
+        embedding = list(PLACEHOLDER_EMBEDDING) if passphrase else None
 
-        # Use timestamp to provide unique ids
-        doc_id = f"{source}-{int(time.time()*1000)}"
-        collection.add(
-            documents=[text],
-            embeddings=[[0.0]],  # avoid heavy default embedding
-            metadatas=[{"source": source}],
-            ids=[doc_id],
-        )
-        asyncio.run(
-            event_emitter.emit(
-                ResearchAdded(
-                    topic=vault, information_table={"source": source, "doc_id": doc_id}
-                )
+        parent_id = content_id(text, source)
+        job: Optional[_FileJob] = getattr(self._scope, "job", None)
+        for chunk in chunks:
+            doc_id = f"{parent_id}:{chunk.index}"
+            with self._dedup_lock:
+                key = (vault, doc_id)
+                in_flight = key in self._in_flight
+                if in_flight or (
+                    self._index is not None and self._index.contains(vault, doc_id)
+                ):
+                    self.skipped += 1
+                    logging.debug("Skipping unchanged chunk %s from %s", doc_id, source)
+                    if in_flight and job is not None:
+                        # Another file is writing it; wait for that write too
+                        self._wait_locked(job, key)
+                    continue
+                self._in_flight.add(key)
+                if job is not None:
+                    self._wait_locked(job, key)
+            metadata: dict[str, Any] = {
+                "source": source,
+                "parent_id": parent_id,
+                "chunk_index": chunk.index,
+                "chunk_count": len(chunks),
+                "start": chunk.start,
+                "end": chunk.end,
+            }
+            if not passphrase:
+                metadata["content_hash"] = content_hash(chunk.text)
+            self._buffer.add(
+                passphrase or "__none__",
+                collection,
+                vault,
+                chunk.text,
+                metadata,
+                doc_id,
+                embedding,
             )
-        )
+        if not self._batching():
+            self._buffer.flush(vault)
+
+    def _chunk_documents(
+        self, docs: List[Tuple[str, str]]
+    ) -> List[Tuple[str, str, Optional[List[Chunk]]]]:
+        """Pre-split ``(text, source)`` pairs for :meth:`_write_documents`.
+
+        Large batches are split in the chunker's process pool. For small
+        batches the chunks are left as ``None`` and ``_ingest_text`` splits
+        each document inline.
+        """
+
+        texts = [text for text, _ in docs]
+        if not self.chunker.should_parallelize(texts):
+            return [(text, source, None) for text, source in docs]
+        return [
+            (text, source, chunks)
+            for (text, source), chunks in zip(docs, self.chunker.split_many(texts))
+        ]
+
+    def _write_documents(
+        self, prepared: List[Tuple[str, str, Optional[List[Chunk]]]], vault: str
+    ) -> None:
+        # A source shared by several documents (posts of one thread) is not a
+        # single document whose earlier versions can be replaced
+        counts = Counter(source for _, source, _ in prepared)
+        for text, source, chunks in prepared:
+            if counts[source] == 1:
+                self._delete_previous_versions(text, source, vault)
+            if chunks is None:
+                self._ingest_text(text, source, vault)
+            else:
+                self._ingest_chunks(text, source, vault, chunks)
+
+    def _delete_previous_versions(self, text: str, source: str, vault: str) -> None:
+        """Delete stored chunks of *source* that belong to another version.
+
+        Runs before the new version is buffered so an edited document does
+        not leave stale chunks behind.
+        """
+
+        if self._index is None:
+            return
+        parent_id = content_id(text, source)
+        stale = [
+            doc_id
+            for doc_id in self._index.ids_for_source(vault, source)
+            if doc_id.split(":", 1)[0] != parent_id
+        ]
+        if not stale:
+            return
+        collection = self._get_client(vault).get_or_create_collection(vault)
+        collection.delete(ids=stale)
+        self._index.remove(vault, stale)
+        logging.debug("Deleted %d stale chunks of %s", len(stale), source)
+
+    def _on_write(
+        self, vault: str, ids: List[str], metadatas: List[dict[str, Any]]
+    ) -> None:
+        """Record written ids in the dedup index once they are stored."""
+
+        if self._index is not None:
+            self._index.add(
+                vault,
+                (
+                    (doc_id, meta.get("source"), meta.get("content_hash"))
+                    for doc_id, meta in zip(ids, metadatas)
+                ),
+            )
+        with self._dedup_lock:
+            for doc_id in ids:
+                self._in_flight.discard((vault, doc_id))
+            done = self._resolve_locked(vault, ids, failed=False)
+        for job in done:
+            self._commit_file(job)
+
+    def _on_write_error(
+        self, vault: str, ids: List[str], metadatas: List[dict[str, Any]]
+    ) -> None:
+        """Release the ids of a failed write so the chunks are retried."""
+
+        with self._dedup_lock:
+            for doc_id in ids:
+                self._in_flight.discard((vault, doc_id))
+            self._resolve_locked(vault, ids, failed=True)
+
+    def _wait_locked(self, job: _FileJob, key: tuple[str, str]) -> None:
+        if key not in job.pending:
+            job.pending.add(key)
+            self._waiting.setdefault(key, []).append(job)
+
+    def _resolve_locked(
+        self, vault: str, ids: List[str], *, failed: bool
+    ) -> List[_FileJob]:
+        done = []
+        for doc_id in ids:
+            for job in self._waiting.pop((vault, doc_id), ()):
+                job.pending.discard((vault, doc_id))
+                job.failed = job.failed or failed
+                if job.ready():
+                    done.append(job)
+        return done
+
+    def _begin_file(
+        self, path: Path, vault: str, state: Optional[FileState] = None
+    ) -> _FileJob:
+        """Start tracking *path*; its state is taken before it is read.
+
+        A *state* the caller already computed, e.g. during reconciliation, is
+        reused instead of hashing the file again.
+        """
+
+        if state is None:
+            try:
+                state = file_state(path)
+            except OSError:
+                state = None
+        return _FileJob(Path(path), vault, state)
+
+    def _finish_task(self, job: _FileJob, failed: bool = False) -> None:
+        """Mark one of *job*'s tasks as done and record the file if complete."""
+
+        with self._dedup_lock:
+            job.tasks -= 1
+            job.failed = job.failed or failed
+            ready = job.ready()
+        if ready:
+            self._commit_file(job)
+
+    @contextmanager
+    def _file_scope(self, job: _FileJob) -> Iterator[None]:
+        """Attribute chunks buffered by this thread to *job*."""
+
+        previous = getattr(self._scope, "job", None)
+        self._scope.job = job
+        try:
+            yield
+        finally:
+            self._scope.job = previous
+
+    def _commit_file(self, job: _FileJob) -> None:
+        if job.state is not None:
+            self.manifest.set(str(job.path.resolve()), job.vault, job.state)
+
+    def _handle_file(
+        self,
+        path: Path,
+        vault: str,
+        skip_unchanged: bool = False,
+        state: Optional[FileState] = None,
+    ) -> None:
+        job = self._begin_file(path, vault, state)
+        if skip_unchanged and self._unchanged(job):
+            return
+        failed = True
+        try:
+            with self._file_scope(job), self.batch():
+                self._handle_file_unbuffered(path, vault)
+            failed = False
+        finally:
+            # The manifest entry is written once every chunk is stored, so a
+            # failed or interrupted ingest is retried by reconcile
+            self._finish_task(job, failed)
+
+    def _handle_file_unbuffered(self, path: Path, vault: str) -> None:
+        for task in self._plan_file(path, vault):
+            docs = []
+            for item in task():
+                text = self._extract(item)
+                if text:
+                    docs.append((text, item.source))
+            self._write_documents(self._chunk_documents(docs), vault)
+
+    def _extract(self, item: FetchedItem) -> str:
+        """Return the text for *item*, extracting it from HTML if needed."""
+
+        if item.html is not None:
+            return trafilatura.extract(item.html) or ""
+        return item.text or ""
+
+    def _plan_file(self, path: Path, vault: str) -> List[FetchTask]:
+        """Split ``path`` into independent fetch tasks.
+
+        Each task is a callable returning the :class:`FetchedItem` objects it
+        produced. URL, web and arXiv manifests yield one task per chunk of
+        ``FETCH_CHUNK_SIZE`` entries, each fetched concurrently over a pooled
+        connection; :class:`~.pipeline.IngestPipeline` runs chunks in
+        parallel. Scraper manifests yield a single task.
+        """
 
-    def _handle_file(self, path: Path, vault: str) -> None:
         suffix = path.suffix.lower()
         if suffix in {".url", ".urls"}:
             lines = [
                 line.strip() for line in path.read_text().splitlines() if line.strip()
             ]
-            for url in lines:
-                html = trafilatura.fetch_url(url)
-                text = trafilatura.extract(html) or ""
-                if text:
-                    self._ingest_text(text, url, vault)
-        elif suffix == ".web":
+            crawler = WebCrawler()
+            return [
+                partial(self._fetch_html, crawler, chunk)
+                for chunk in _chunks(lines, FETCH_CHUNK_SIZE)
+            ]
+        if suffix == ".web":
             try:
                 data = json.loads(path.read_text())
             except Exception:
-                return
+                return []
             urls = []
             if isinstance(data, list):
                 for item in data:
@@ -251,99 +848,180 @@ class VaultIngestHandler(FileSystemEventHandler):
                     elif isinstance(item, dict) and "url" in item:
                         urls.append(item["url"])
             if not urls:
-                return
+                return []
             crawler = WebCrawler()
-            for url in urls:
-                result = crawler.fetch(url)
-                text = result.get("text", "")
-                if text:
-                    self._ingest_text(text, result.get("url", url), vault)
-        elif suffix == ".twitter":
-            query = path.read_text().strip()
-            scraper = TwitterScraper()
-            for post in scraper.search(query, limit=self.twitter_limit):
-                text = post.get("text", "")
-                if post.get("images_text"):
-                    text += "\n" + "\n".join(post["images_text"])
-                self._ingest_text(text, post.get("url", query), vault)
-        elif suffix == ".reddit":
+            return [
+                partial(self._crawl, crawler, chunk)
+                for chunk in _chunks(urls, FETCH_CHUNK_SIZE)
+            ]
+        if suffix == ".twitter":
+            return [partial(self._fetch_twitter, path.read_text().strip())]
+        if suffix == ".reddit":
             lines = [ln.strip() for ln in path.read_text().splitlines() if ln.strip()]
             if not lines:
-                return
-            subreddit = lines[0]
-            query = lines[1] if len(lines) > 1 else ""
-            scraper = RedditScraper(
-                client_id=self.reddit_client_id,
-                client_secret=self.reddit_client_secret,
-            )
-            for post in scraper.search(subreddit, query, limit=self.reddit_limit):
-                text = (post.get("title", "") + "\n" + post.get("text", "")).strip()
-                if post.get("images_text"):
-                    text += "\n" + "\n".join(post["images_text"])
-                self._ingest_text(text, post.get("url", query), vault)
-        elif suffix == ".arxiv":
+                return []
+            return [partial(self._fetch_reddit, lines)]
+        if suffix == ".arxiv":
             ids = [ln.strip() for ln in path.read_text().splitlines() if ln.strip()]
-            scraper = ArxivScraper()
-            for paper in scraper.fetch_many(ids):
-                text = (
-                    paper.get("title", "")
-                    + "\n"
-                    + paper.get("summary", "")
-                    + "\n"
-                    + paper.get("pdf_text", "")
-                ).strip()
-                self._ingest_text(text, paper.get("url", paper.get("id")), vault)
-        elif suffix == ".4chan":
+            return [
+                partial(self._fetch_arxiv, chunk)
+                for chunk in _chunks(ids, FETCH_CHUNK_SIZE)
+            ]
+        if suffix == ".4chan":
             lines = [ln.strip() for ln in path.read_text().splitlines() if ln.strip()]
             if len(lines) < 2:
-                return
-            board = lines[0]
+                return []
             try:
                 thread_no = int(lines[1])
             except ValueError:
-                return
-            scraper = FourChanScraper()
-            posts = scraper.fetch_thread(board, thread_no)[: self.fourchan_limit]
-            for post in posts:
-                text = post.get("text", "")
-                if post.get("images_text"):
-                    text += "\n" + "\n".join(post["images_text"])
-                self._ingest_text(
-                    text,
-                    f"https://boards.4channel.org/{board}/thread/{thread_no}",
-                    vault,
-                )
-        elif suffix == ".txt":
-            try:
-                docs = load_txt_documents(str(path))
-            except Exception:
-                try:
-                    text = path.read_text(encoding="utf-8")
-                except Exception:
-                    return
-                self._ingest_text(text, str(path), vault)
-            else:
-                for doc in docs:
-                    text = getattr(doc, "text", "")
-                    if text:
-                        self._ingest_text(text, str(path), vault)
-        else:
-            try:
-                text = path.read_text(encoding="utf-8")
-            except Exception:
-                return
-            self._ingest_text(text, str(path), vault)
+                return []
+            return [partial(self._fetch_fourchan, lines[0], thread_no)]
+        if suffix == ".txt":
+            return [partial(self._load_txt, path)]
+        return [partial(self._read_plain, path)]
 
-    def on_created(self, event) -> None:  # pragma: no cover - side effects
-        if event.is_directory:
-            return
-        path = Path(event.src_path)
+    @staticmethod
+    def _fetch_html(crawler: Any, urls: List[str]) -> List[FetchedItem]:
+        return [
+            FetchedItem(page["url"], html=page["html"])
+            for page in crawler.fetch_html_many(urls)
+            if page.get("html")
+        ]
+
+    @staticmethod
+    def _crawl(crawler: Any, urls: List[str]) -> List[FetchedItem]:
+        return [
+            FetchedItem(result.get("url", url), text=result.get("text", ""))
+            for url, result in zip(urls, crawler.fetch_many(urls))
+        ]
+
+    def _fetch_twitter(self, query: str) -> List[FetchedItem]:
+        items = []
+        scraper = TwitterScraper()
+        for post in scraper.search(query, limit=self.twitter_limit):
+            text = post.get("text", "")
+            if post.get("images_text"):
+                text += "\n" + "\n".join(post["images_text"])
+            items.append(FetchedItem(post.get("url", query), text=text))
+        return items
+
+    def _fetch_reddit(self, lines: List[str]) -> List[FetchedItem]:
+        subreddit = lines[0]
+        query = lines[1] if len(lines) > 1 else ""
+        scraper = RedditScraper(
+            client_id=self.reddit_client_id,
+            client_secret=self.reddit_client_secret,
+        )
+        items = []
+        for post in scraper.search(subreddit, query, limit=self.reddit_limit):
+            text = (post.get("title", "") + "\n" + post.get("text", "")).strip()
+            if post.get("images_text"):
+                text += "\n" + "\n".join(post["images_text"])
+            items.append(FetchedItem(post.get("url", query), text=text))
+        return items
+
+    @staticmethod
+    def _fetch_arxiv(ids: List[str]) -> List[FetchedItem]:
+        scraper = ArxivScraper()
+        items = []
+        for paper in scraper.fetch_many(ids):
+            text = (
+                paper.get("title", "")
+                + "\n"
+                + paper.get("summary", "")
+                + "\n"
+                + paper.get("pdf_text", "")
+            ).strip()
+            items.append(FetchedItem(paper.get("url", paper.get("id")), text=text))
+        return items
+
+    def _fetch_fourchan(self, board: str, thread_no: int) -> List[FetchedItem]:
+        scraper = FourChanScraper()
+        posts = scraper.fetch_thread(board, thread_no)[: self.fourchan_limit]
+        source = f"https://boards.4channel.org/{board}/thread/{thread_no}"
+        items = []
+        for post in posts:
+            text = post.get("text", "")
+            if post.get("images_text"):
+                text += "\n" + "\n".join(post["images_text"])
+            items.append(FetchedItem(source, text=text))
+        return items
+
+    @staticmethod
+    def _load_txt(path: Path) -> List[FetchedItem]:
+        try:
+            docs = load_txt_documents(str(path))
+        except Exception:
+            return VaultIngestHandler._read_plain(path)
+        return [FetchedItem(str(path), text=getattr(doc, "text", "")) for doc in docs]
+
+    @staticmethod
+    def _read_plain(path: Path) -> List[FetchedItem]:
         try:
-            rel = path.relative_to(self.root)
+            text = path.read_text(encoding="utf-8")
+        except Exception:
+            return []
+        return [FetchedItem(str(path), text=text)]
+
+    def _vault_for(self, path: Path) -> Optional[str]:
+        try:
+            rel = Path(path).relative_to(self.root)
         except ValueError:
+            return None
+        if len(rel.parts) < 2 or is_ignored(rel):
+            return None
+        return rel.parts[0]
+
+    def _unchanged(self, job: _FileJob) -> bool:
+        """Return whether *job*'s file was already ingested with this content."""
+
+        if job.state is None:
+            return False
+        known = self.manifest.get(str(job.path.resolve()))
+        return known is not None and known.hash == job.state.hash
+
+    def _dispatch(self, path: Path) -> None:
+        """Ingest *path* unless it is outside a vault or its content is known.
+
+        The content is hashed by whoever ingests the file, the pipeline's
+        intake worker or the caller, so events never read whole files on the
+        observer thread when a pipeline is running.
+        """
+
+        vault = self._vault_for(path)
+        if vault is None:
             return
-        vault = rel.parts[0]
-        self._handle_file(path, vault)
+        if self.pipeline is not None:
+            self.pipeline.submit(path, vault, skip_unchanged=True)
+        else:
+            self._handle_file(path, vault, skip_unchanged=True)
+
+    def _on_path_event(self, path: Path) -> None:
+        if self._vault_for(path) is None:
+            return
+        if self.coalescer is not None:
+            self.coalescer.touch(path)
+        else:
+            self._dispatch(path)
+
+    def on_created(self, event) -> None:
+        if not event.is_directory:
+            self._on_path_event(Path(event.src_path))
+
+    def on_modified(self, event) -> None:
+        if not event.is_directory:
+            self._on_path_event(Path(event.src_path))
+
+    def on_moved(self, event) -> None:
+        if event.is_directory:
+            return
+        if self.coalescer is not None:
+            self.coalescer.discard(Path(event.src_path))
+        self._on_path_event(Path(event.dest_path))
+
+    def on_deleted(self, event) -> None:
+        if not event.is_directory and self.coalescer is not None:
+            self.coalescer.discard(Path(event.src_path))
 
 
 def start_watcher(
@@ -355,8 +1033,28 @@ def start_watcher(
     fourchan_limit: Optional[int] = None,
     reddit_client_id: Optional[str] = None,
     reddit_client_secret: Optional[str] = None,
-) -> None:
-    """Start watching ``root`` for dropped files, URLs and manifests."""
+    workers: Optional[int] = None,
+    once: bool = False,
+    scan: bool = True,
+    debounce: Optional[float] = None,
+) -> Optional[ReconcileReport]:
+    """Start watching ``root`` for dropped files, URLs and manifests.
+
+    Dropped files are processed by an :class:`~.pipeline.IngestPipeline` with
+    ``workers`` fetch threads (``STORM_INGEST_WORKERS`` or 4 by default) so
+    slow manifests do not delay detection of other files. ``workers=0``
+    handles files synchronously on the observer thread.
+
+    On startup files that are new or changed since they were last ingested
+    are caught up via :func:`~.reconcile.reconcile` (disable with
+    ``scan=False``). With ``once=True`` only that pass runs: the function
+    drains the pipeline and returns the :class:`~.reconcile.ReconcileReport`
+    instead of watching.
+
+    Filesystem events are coalesced per path by an :class:`EventCoalescer`
+    and ingested once the file has stopped changing for ``debounce`` seconds
+    (``STORM_INGEST_DEBOUNCE`` or 1 by default, ``0`` disables debouncing).
+    """
 
     watch_root = Path(
         root or os.environ.get("STORM_VAULT_ROOT", "research")
@@ -370,12 +1068,34 @@ def start_watcher(
         reddit_client_id=reddit_client_id,
         reddit_client_secret=reddit_client_secret,
     )
+    workers = default_worker_count() if workers is None else workers
+    if workers > 0:
+        handler.pipeline = IngestPipeline.with_workers(handler, workers).start()
+    if once:
+        try:
+            return reconcile(handler, handler.pipeline)
+        finally:
+            if handler.pipeline is not None:
+                handler.pipeline.shutdown()
+            handler.flush()
+    debounce = default_debounce() if debounce is None else debounce
+    if debounce > 0:
+        handler.coalescer = EventCoalescer(handler._dispatch, delay=debounce)
     observer = Observer()
-    observer.schedule(handler, str(watch_root), recursive=True)
+    # Watch the resolved root so event paths match handler.root
+    observer.schedule(handler, str(handler.root), recursive=True)
     observer.start()
+    # Start observing first so files dropped during the scan are not missed
+    if scan:
+        reconcile(handler, handler.pipeline)
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:  # pragma: no cover - manual termination
         observer.stop()
     observer.join()
+    if handler.coalescer is not None:
+        handler.coalescer.close()
+    if handler.pipeline is not None:
+        handler.pipeline.shutdown()
+    return None
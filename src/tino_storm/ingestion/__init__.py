@@ -1,9 +1,31 @@
-from .twitter import TwitterScraper
-from .reddit import RedditScraper
-from .fourchan import FourChanScraper
-from .arxiv import ArxivScraper
-from .crawler import WebCrawler
-from .utils import ocr_image
+"""Scrapers and fetch helpers for external resources.
+
+The scrapers pull in trafilatura, httpx and the OCR service, so they are
+imported on first use. Importing a helper module such as
+:mod:`.extraction` or :mod:`.http_cache` does not load them.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "TwitterScraper": ".twitter",
+    "RedditScraper": ".reddit",
+    "FourChanScraper": ".fourchan",
+    "ArxivScraper": ".arxiv",
+    "WebCrawler": ".crawler",
+    "ocr_image": ".utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "TwitterScraper",
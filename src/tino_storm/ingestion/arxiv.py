@@ -2,52 +2,55 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
+import re
 from io import BytesIO
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
-import requests
-
-from ..security import log_request
+from .fetcher import BatchFetcher, run_sync
+from .pdf import PDFExtractor, get_pdf_extractor, pdf_reader_class
 
 try:  # optional dependency
     import arxiv  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     arxiv = None  # type: ignore
 
-try:
-    from pypdf import PdfReader  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    try:
-        from PyPDF2 import PdfReader  # type: ignore
-    except Exception:  # pragma: no cover - optional dependency
-        PdfReader = None  # type: ignore
+
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+
+
+def _short_id(value: str) -> str:
+    """Return the unversioned arXiv id for an id or ``/abs/`` URL."""
+
+    if "/abs/" in value:
+        value = value.split("/abs/", 1)[1]
+    return _VERSION_SUFFIX.sub("", value.strip())
 
 
 class ArxivScraper:
-    """Fetch paper metadata and PDF text from arXiv."""
+    """Fetch paper metadata and PDF text from arXiv.
 
-    def _pdf_text(self, url: str) -> str:
-        global PdfReader
-        if PdfReader is None:
-            try:
-                from pypdf import PdfReader as _Reader  # type: ignore
-            except Exception:  # pragma: no cover - optional dependency
-                try:
-                    from PyPDF2 import PdfReader as _Reader  # type: ignore
-                except Exception:
-                    return ""
-            PdfReader = _Reader
-        try:
-            log_request("GET", url)
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            reader = PdfReader(BytesIO(resp.content))
-            return "\n".join(page.extract_text() or "" for page in reader.pages).strip()
-        except Exception:
-            return ""
+    :meth:`fetch_many` looks up metadata for all ids with one API query and
+    downloads the PDFs concurrently through a pooled
+    :class:`~.fetcher.BatchFetcher`; keyword arguments given to the
+    constructor configure the fetcher. PDF text is extracted page by page by
+    a shared :class:`~.pdf.PDFExtractor`.
+    """
 
-    def fetch(self, arxiv_id: str) -> Dict[str, str]:
+    def __init__(
+        self, extractor: Optional[PDFExtractor] = None, **fetcher_options: Any
+    ) -> None:
+        self.extractor = extractor or get_pdf_extractor()
+        self.fetcher_options = fetcher_options
+
+    @staticmethod
+    def _reader():
+        return pdf_reader_class()
+
+    @staticmethod
+    def _arxiv():
         global arxiv
         if not callable(getattr(arxiv, "Search", None)):
             try:
@@ -58,25 +61,101 @@ class ArxivScraper:
                 raise RuntimeError(
                     "arxiv package is required for Arxiv scraping"
                 ) from exc
+        return arxiv
 
-        client = arxiv.Client()
-        search = arxiv.Search(id_list=[arxiv_id])
+    def _pdf_bytes_to_text(self, content: bytes) -> str:
+        return self.extractor.text(BytesIO(content))
+
+    def iter_pdf_pages(self, url: str) -> Iterator[str]:
+        """Stream the PDF at *url* and yield the text of each page in order.
+
+        The download is spooled to a temporary file and pages are yielded as
+        they are extracted, so callers can start on the first pages while
+        the rest of a long paper is still being parsed.
+        """
+
+        if self._reader() is None:
+            return iter(())
+        return self.extractor.iter_url(url)
+
+    def _pdf_text(self, url: str) -> str:
+        return "\n".join(self.iter_pdf_pages(url)).strip()
+
+    @staticmethod
+    def _record(arxiv_id: str, result: Any, pdf_text: str) -> Dict[str, str]:
+        return {
+            "id": arxiv_id,
+            "title": getattr(result, "title", ""),
+            "summary": getattr(result, "summary", ""),
+            "url": getattr(result, "entry_id", ""),
+            "pdf_text": pdf_text,
+        }
+
+    def fetch(self, arxiv_id: str) -> Dict[str, str]:
+        arxiv_mod = self._arxiv()
+        client = arxiv_mod.Client()
+        search = arxiv_mod.Search(id_list=[arxiv_id])
         result = next(client.results(search), None)
         if result is None:
             raise ValueError(f"Paper {arxiv_id} not found")
         pdf_text = (
             self._pdf_text(result.pdf_url) if getattr(result, "pdf_url", None) else ""
         )
+        return self._record(arxiv_id, result, pdf_text)
+
+    def _metadata(self, ids: List[str]) -> Dict[str, Any]:
+        """Return search results for *ids* keyed by unversioned id."""
+
+        arxiv_mod = self._arxiv()
+        client = arxiv_mod.Client()
+        search = arxiv_mod.Search(id_list=list(ids), max_results=len(ids))
         return {
-            "id": arxiv_id,
-            "title": getattr(result, "title", ""),
-            "summary": getattr(result, "summary", ""),
-            "url": getattr(result, "entry_id", ""),
-            "pdf_text": pdf_text,
+            _short_id(getattr(result, "entry_id", "")): result
+            for result in client.results(search)
+        }
+
+    async def fetch_many_async(self, ids: List[str]) -> List[Dict[str, str]]:
+        """Fetch metadata and PDF text for *ids* concurrently.
+
+        Papers that cannot be found are skipped with a warning. Results keep
+        the order of *ids*.
+        """
+
+        if not ids:
+            return []
+        found = await asyncio.to_thread(self._metadata, ids)
+        papers = []
+        for arxiv_id in ids:
+            result = found.get(_short_id(arxiv_id))
+            if result is None:
+                logging.warning("arXiv paper %s not found", arxiv_id)
+                continue
+            papers.append((arxiv_id, result))
+
+        pdf_urls = [getattr(r, "pdf_url", None) for _, r in papers]
+        options = {
+            "max_bytes": self.extractor.max_bytes or None,
+            **self.fetcher_options,
         }
+        downloads = await BatchFetcher(**options).fetch_all_async(
+            [u for u in pdf_urls if u]
+        )
+        by_url = {d.url: d for d in downloads}
+
+        async def _text(url: Optional[str]) -> str:
+            download = by_url.get(url) if url else None
+            if download is None or not download.ok:
+                return ""
+            return await asyncio.to_thread(self._pdf_bytes_to_text, download.content)
+
+        texts = await asyncio.gather(*(_text(u) for u in pdf_urls))
+        return [
+            self._record(arxiv_id, result, text)
+            for (arxiv_id, result), text in zip(papers, texts)
+        ]
 
     def fetch_many(self, ids: List[str]) -> List[Dict[str, str]]:
-        return [self.fetch(i) for i in ids]
+        return run_sync(self.fetch_many_async(ids))
 
     def dump_json(self, ids: List[str]) -> str:
         return json.dumps(self.fetch_many(ids))
@@ -1,29 +1,93 @@
+import asyncio
 import json
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
 import trafilatura
 
+from ..ratelimit import throttle
 from ..security import log_request
+from .fetcher import BatchFetcher, run_sync
+from .http_cache import cached_get, http_cache
+
+# Cache key for text extracted with ``trafilatura.extract`` defaults
+EXTRACTOR = "trafilatura"
 
 
 class WebCrawler:
-    """Fetch web pages and extract text with ``trafilatura``."""
+    """Fetch web pages and extract text with ``trafilatura``.
+
+    :meth:`fetch` downloads a single page. :meth:`fetch_many` downloads pages
+    concurrently through a pooled :class:`~.fetcher.BatchFetcher`; keyword
+    arguments given to the constructor (``max_concurrency``, ``per_host``,
+    ``politeness_delay``, ``retries``, ``deadline`` ...) configure it.
+    Both go through the shared :class:`~.http_cache.HTTPCache`, which also
+    keeps the extracted text of unchanged pages.
+    """
+
+    def __init__(self, **fetcher_options: Any) -> None:
+        self.fetcher_options = fetcher_options
+
+    def _fetcher(self) -> BatchFetcher:
+        return BatchFetcher(**self.fetcher_options)
 
     def fetch(self, url: str) -> Dict[str, str]:
         """Return a dictionary containing ``url`` and extracted ``text``."""
-        try:
+
+        def _send(headers: Dict[str, str]):
+            throttle(url)
             log_request("GET", url)
-            resp = requests.get(url, timeout=10)
+            resp = requests.get(url, timeout=10, headers=headers)
             resp.raise_for_status()
-            html = resp.text
+            return resp
+
+        cache = http_cache()
+        try:
+            html = cached_get(url, _send, cache).text
         except Exception:
             html = ""
-        text = trafilatura.extract(html) or ""
-        return {"url": url, "text": text}
+        return {"url": url, "text": self._extract(url, html, cache)}
+
+    @staticmethod
+    def _extract(url: str, html: str, cache=None) -> str:
+        if cache is None or not html:
+            return trafilatura.extract(html) or ""
+        body = html.encode("utf-8")
+        text = cache.get_text(url, EXTRACTOR, body)
+        if text is None:
+            text = trafilatura.extract(html) or ""
+            cache.set_text(url, EXTRACTOR, body, text)
+        return text
+
+    async def fetch_html_many_async(
+        self, urls: List[str]
+    ) -> List[Dict[str, Optional[str]]]:
+        """Download *urls* concurrently and return ``url``/``html`` pairs.
+
+        Pages that could not be fetched have ``html`` set to ``None``.
+        """
+
+        results = await self._fetcher().fetch_all_async(urls)
+        return [{"url": r.url, "html": r.text if r.ok else None} for r in results]
+
+    def fetch_html_many(self, urls: List[str]) -> List[Dict[str, Optional[str]]]:
+        return run_sync(self.fetch_html_many_async(urls))
+
+    async def fetch_many_async(self, urls: List[str]) -> List[Dict[str, str]]:
+        pages = await self.fetch_html_many_async(urls)
+        cache = http_cache()
+        texts = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._extract, page["url"], page["html"] or "", cache)
+                for page in pages
+            )
+        )
+        return [
+            {"url": page["url"], "text": text or ""} for page, text in zip(pages, texts)
+        ]
 
     def fetch_many(self, urls: List[str]) -> List[Dict[str, str]]:
-        return [self.fetch(u) for u in urls]
+        return run_sync(self.fetch_many_async(urls))
 
     def dump_json(self, urls: List[str]) -> str:
         return json.dumps(self.fetch_many(urls))
@@ -0,0 +1,216 @@
+"""Process-pool article extraction for downloaded web pages.
+
+:class:`PageExtractor` runs ``trafilatura.extract`` and snippet splitting in a
+process pool so that CPU-bound extraction scales with cores instead of being
+serialized by the GIL. Pages are submitted in batches to keep inter-process
+overhead low; callers submit a batch as soon as enough downloads have
+finished, when the extractor is idle, or once the oldest page has waited
+:attr:`PageExtractor.linger` seconds, so extraction overlaps with the
+remaining downloads.
+
+Configuration is read from the environment:
+
+``STORM_EXTRACT_PROCESSES``
+    Worker processes (default ``min(4, cpu_count)``, ``1`` extracts inline).
+``STORM_EXTRACT_BATCH``
+    Pages per submitted task (default 4).
+``STORM_EXTRACT_LINGER``
+    Seconds a partial batch waits for more pages while the extractor is busy
+    (default 0.05).
+``STORM_WEBPAGE_MAX_BYTES``
+    Largest page body :class:`~tino_storm.core.utils.WebPageHelper` downloads
+    (default 5 MiB, ``0`` for no limit). Larger downloads are abandoned.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+from ..env import env_float, env_int
+
+DEFAULT_BATCH_SIZE = 4
+DEFAULT_LINGER = 0.05
+DEFAULT_MAX_PAGE_BYTES = 5 * 1024 * 1024
+# Cache key for text extracted with :data:`TRAFILATURA_OPTIONS`
+EXTRACTOR = "webpage_helper"
+TRAFILATURA_OPTIONS = {
+    "include_tables": False,
+    "include_comments": False,
+    "output_format": "txt",
+}
+
+# (url, html or None, already extracted text or None)
+PageItem = Tuple[str, Optional[bytes], Optional[str]]
+# (url, text or None, snippets)
+PageResult = Tuple[str, Optional[str], List[str]]
+
+
+def max_page_bytes() -> int:
+    """Return the configured page download limit (``0`` for none)."""
+
+    return env_int("STORM_WEBPAGE_MAX_BYTES", DEFAULT_MAX_PAGE_BYTES)
+
+
+def extract_article(html: bytes) -> Optional[str]:
+    """Return the main text of *html* as extracted by trafilatura."""
+
+    from trafilatura import extract
+
+    return extract(html, **TRAFILATURA_OPTIONS)
+
+
+def process_pages(
+    items: Sequence[PageItem], min_char_count: int = 0, splitter: Any = None
+) -> List[PageResult]:
+    """Extract and split a batch of pages; executed in worker processes.
+
+    Items that already carry text skip extraction. Texts of at most
+    *min_char_count* characters are returned without snippets, and
+    *splitter* (anything with ``split_text``) is skipped when ``None``.
+    """
+
+    results: List[PageResult] = []
+    for url, html, text in items:
+        if text is None and html is not None:
+            try:
+                text = extract_article(html)
+            except (
+                Exception
+            ) as exc:  # noqa: BLE001 - one bad page should not drop the batch
+                logging.debug("Extraction failed for %s: %s", url, exc)
+                text = None
+        snippets: List[str] = []
+        if splitter is not None and text and len(text) > min_char_count:
+            snippets = splitter.split_text(text)
+        results.append((url, text, snippets))
+    return results
+
+
+class PageExtractor:
+    """Submit page batches to a shared process pool, inline for one process.
+
+    Parameters
+    ----------
+    processes:
+        Size of the process pool.
+    batch_size:
+        Pages per task suggested to callers via :attr:`batch_size`.
+    linger:
+        Seconds callers let a partial batch wait for more pages while earlier
+        batches are still being extracted.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        linger: Optional[float] = None,
+    ) -> None:
+        self.processes = (
+            processes
+            if processes is not None
+            else env_int("STORM_EXTRACT_PROCESSES", min(4, os.cpu_count() or 1))
+        )
+        self.batch_size = max(
+            1,
+            (
+                batch_size
+                if batch_size is not None
+                else env_int("STORM_EXTRACT_BATCH", DEFAULT_BATCH_SIZE)
+            ),
+        )
+        self.linger = max(
+            0.0,
+            (
+                linger
+                if linger is not None
+                else env_float("STORM_EXTRACT_LINGER", DEFAULT_LINGER)
+            ),
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, items: Sequence[PageItem], min_char_count: int = 0, splitter: Any = None
+    ) -> "Future[List[PageResult]]":
+        """Process *items* in the pool; the returned future may already be done."""
+
+        items = list(items)
+        if self.processes > 1:
+            try:
+                return self._pool().submit(
+                    process_pages, items, min_char_count, splitter
+                )
+            except Exception as exc:  # noqa: BLE001 - fall back to inline extraction
+                logging.warning(
+                    "Extraction process pool failed, extracting inline: %s", exc
+                )
+                self.close()
+        future: "Future[List[PageResult]]" = Future()
+        future.set_result(process_pages(items, min_char_count, splitter))
+        return future
+
+    def result(
+        self,
+        future: "Future[List[PageResult]]",
+        items: Sequence[PageItem],
+        min_char_count: int = 0,
+        splitter: Any = None,
+    ) -> List[PageResult]:
+        """Return *future*'s result, redoing *items* inline if the pool failed."""
+
+        try:
+            return future.result()
+        except Exception as exc:  # noqa: BLE001 - e.g. a worker died
+            logging.warning("Extraction task failed, extracting inline: %s", exc)
+            self.close()
+            return process_pages(items, min_char_count, splitter)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(self.close)
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_EXTRACTOR: Optional[PageExtractor] = None
+_EXTRACTOR_LOCK = threading.Lock()
+
+
+def get_page_extractor() -> PageExtractor:
+    """Return the process-wide :class:`PageExtractor`."""
+
+    global _EXTRACTOR
+    with _EXTRACTOR_LOCK:
+        if _EXTRACTOR is None:
+            _EXTRACTOR = PageExtractor()
+        return _EXTRACTOR
+
+
+__all__ = [
+    "EXTRACTOR",
+    "PageExtractor",
+    "extract_article",
+    "get_page_extractor",
+    "max_page_bytes",
+    "process_pages",
+]
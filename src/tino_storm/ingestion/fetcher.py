@@ -0,0 +1,346 @@
+"""Concurrent, connection-pooled HTTP fetching for ingestion scrapers.
+
+:class:`BatchFetcher` downloads many URLs over a single pooled
+``httpx.AsyncClient``. Requests are limited globally and per host, spaced out
+by an optional per-host politeness delay, retried with exponential backoff on
+transient failures and bounded by a deadline shared by the whole batch. Results
+are returned in input order; failures are reported on the individual
+:class:`FetchResult` instead of raising. Responses go through the shared
+:class:`~.http_cache.HTTPCache`, so fresh pages are not downloaded again and
+stale ones are revalidated with a conditional GET. Every request also waits
+for the shared per-host :class:`~.ratelimit.RateLimiter`, which other fetchers
+and concurrent batches draw from too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..ratelimit import RateLimiter, RateLimitTimeout, get_rate_limiter
+from ..security import log_request
+from .http_cache import CachedResponse, HTTPCache, http_cache
+
+T = TypeVar("T")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_HEADERS = {"User-Agent": "tino-storm/ingest"}
+_DEFAULT = object()
+
+
+class ResponseTooLarge(Exception):
+    """Raised while streaming a body that exceeds ``max_bytes``."""
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single URL."""
+
+    url: str
+    status: Optional[int] = None
+    content: bytes = b""
+    text: str = ""
+    error: Optional[str] = None
+    attempts: int = 0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run *coro* to completion from synchronous code.
+
+    When called from a thread that already runs an event loop the coroutine is
+    executed on a helper thread with its own loop.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)  # type: ignore[arg-type]
+
+    result: Dict[str, Any] = {}
+
+    def _target() -> None:
+        try:
+            result["value"] = asyncio.run(coro)  # type: ignore[arg-type]
+        except BaseException as exc:  # pragma: no cover - re-raised below
+            result["error"] = exc
+
+    thread = threading.Thread(target=_target)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+class BatchFetcher:
+    """Fetch URLs concurrently with per-host limits, retries and a deadline.
+
+    Parameters
+    ----------
+    max_concurrency:
+        Maximum number of requests in flight for the whole batch.
+    per_host:
+        Maximum number of concurrent requests to a single host.
+    politeness_delay:
+        Minimum number of seconds between request starts to the same host.
+    retries:
+        Number of retries after a transport error or retryable status code.
+    backoff:
+        Base delay for exponential backoff between retries.
+    timeout:
+        Per-request timeout in seconds.
+    deadline:
+        Seconds the whole batch may take. Requests that have not completed in
+        time are reported with ``error="deadline exceeded"``.
+    max_bytes:
+        Largest response body to accept. Bodies are streamed and abandoned as
+        soon as they exceed the limit (``error="too large"``).
+    cache:
+        :class:`~.http_cache.HTTPCache` for responses, ``None`` to always
+        download. Defaults to the cache configured by the environment.
+    rate_limiter:
+        Shared :class:`~.ratelimit.RateLimiter` requests wait for, ``None``
+        to rely on ``per_host`` and ``politeness_delay`` only. Defaults to
+        the process-wide limiter.
+    transport:
+        Optional ``httpx`` transport, mainly for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 16,
+        per_host: int = 4,
+        politeness_delay: float = 0.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+        deadline: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_bytes: Optional[int] = None,
+        cache: Optional[HTTPCache] | object = _DEFAULT,
+        rate_limiter: Optional[RateLimiter] | object = _DEFAULT,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host = max(1, per_host)
+        self.politeness_delay = politeness_delay
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.deadline = deadline
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.transport = transport
+        self.max_bytes = max_bytes
+        self.cache = http_cache() if cache is _DEFAULT else cache
+        self.rate_limiter = (
+            get_rate_limiter() if rate_limiter is _DEFAULT else rate_limiter
+        )
+
+    async def fetch_all_async(self, urls: Iterable[str]) -> List[FetchResult]:
+        """Fetch *urls* concurrently and return results in input order."""
+
+        urls = list(urls)
+        if not urls:
+            return []
+        deadline = (
+            time.monotonic() + self.deadline if self.deadline is not None else None
+        )
+        limiter = asyncio.Semaphore(self.max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        host_locks: Dict[str, asyncio.Lock] = {}
+        host_last: Dict[str, float] = {}
+
+        async def _polite(host: str) -> None:
+            if self.politeness_delay <= 0:
+                return
+            lock = host_locks.setdefault(host, asyncio.Lock())
+            async with lock:
+                wait = (
+                    host_last.get(host, 0.0) + self.politeness_delay - time.monotonic()
+                )
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                host_last[host] = time.monotonic()
+
+        async def _one(client: httpx.AsyncClient, url: str) -> FetchResult:
+            host = urlsplit(url).netloc.lower()
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+            result = FetchResult(url=url)
+            # The cache reads, compresses and commits; keep that off the loop
+            entry = (
+                await asyncio.to_thread(self.cache.get, url)
+                if self.cache is not None
+                else None
+            )
+            if entry is not None and entry.fresh():
+                return _from_cache(result, entry)
+            validators = entry.validators() if entry is not None else {}
+            for attempt in range(self.retries + 1):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    result.error = "deadline exceeded"
+                    return result
+                if self.rate_limiter is not None:
+                    try:
+                        await asyncio.wait_for(
+                            self.rate_limiter.acquire_async(url), remaining
+                        )
+                    except RateLimitTimeout as exc:
+                        result.error = str(exc)
+                        return result
+                    except asyncio.TimeoutError:
+                        result.error = "deadline exceeded"
+                        return result
+                retry_after: Optional[float] = None
+                # Queue on the host before taking a global slot so requests
+                # for a busy host do not hold capacity other hosts could use
+                async with host_limit:
+                    await _polite(host)
+                    async with limiter:
+                        remaining = (
+                            None if deadline is None else deadline - time.monotonic()
+                        )
+                        if remaining is not None and remaining <= 0:
+                            result.error = "deadline exceeded"
+                            return result
+                        result.attempts = attempt + 1
+                        timeout = (
+                            self.timeout
+                            if remaining is None
+                            else min(self.timeout, remaining)
+                        )
+                        try:
+                            log_request("GET", url)
+                            resp = await asyncio.wait_for(
+                                self._get(client, url, timeout, validators), timeout
+                            )
+                        except asyncio.TimeoutError:
+                            result.error = (
+                                "deadline exceeded"
+                                if deadline is not None and time.monotonic() >= deadline
+                                else "timeout"
+                            )
+                            resp = None
+                        except ResponseTooLarge:
+                            result.error = "too large"
+                            return result
+                        except httpx.HTTPError as exc:
+                            result.error = str(exc) or exc.__class__.__name__
+                            resp = None
+                if resp is not None:
+                    result.status = resp.status_code
+                    if resp.status_code == 304 and entry is not None:
+                        entry = await asyncio.to_thread(
+                            self.cache.revalidate, entry, resp.headers
+                        )
+                        return _from_cache(result, entry)
+                    if resp.status_code in RETRY_STATUSES:
+                        result.error = f"HTTP {resp.status_code}"
+                        retry_after = _retry_after(resp)
+                    elif resp.status_code >= 400:
+                        result.error = f"HTTP {resp.status_code}"
+                        return result
+                    else:
+                        result.error = None
+                        result.content = resp.content
+                        result.text = resp.text
+                        if self.cache is not None:
+                            await asyncio.to_thread(
+                                self.cache.store,
+                                CachedResponse.from_response(url, resp),
+                                resp.headers,
+                            )
+                        return result
+                if attempt < self.retries:
+                    # Back off without holding a host or global slot
+                    delay = self.backoff * (2**attempt)
+                    if retry_after is not None:
+                        delay = max(delay, retry_after)
+                    if deadline is not None:
+                        delay = min(delay, max(0.0, deadline - time.monotonic()))
+                    await asyncio.sleep(delay)
+            logging.warning("Failed to fetch %s: %s", url, result.error)
+            return result
+
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            follow_redirects=True,
+            limits=limits,
+            transport=self.transport,
+        ) as client:
+            return list(await asyncio.gather(*(_one(client, u) for u in urls)))
+
+    async def _get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        if self.max_bytes is None:
+            return await client.get(url, timeout=timeout, headers=headers)
+        async with client.stream("GET", url, timeout=timeout, headers=headers) as resp:
+            length = resp.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > self.max_bytes:
+                raise ResponseTooLarge(url)
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise ResponseTooLarge(url)
+            # The body is already decoded, so drop the encoding headers
+            headers = [
+                (k, v)
+                for k, v in resp.headers.multi_items()
+                if k.lower() not in {"content-encoding", "content-length"}
+            ]
+            return httpx.Response(
+                resp.status_code,
+                headers=headers,
+                content=bytes(body),
+                request=resp.request,
+            )
+
+    def fetch_all(self, urls: Iterable[str]) -> List[FetchResult]:
+        """Synchronous wrapper around :meth:`fetch_all_async`."""
+
+        return run_sync(self.fetch_all_async(urls))
+
+
+def _from_cache(result: FetchResult, entry: CachedResponse) -> FetchResult:
+    result.status = entry.status
+    result.content = entry.body
+    result.text = entry.text
+    result.error = None
+    result.cached = True
+    return result
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(float(value), 60.0)
+    except ValueError:
+        return None
+
+
+__all__ = ["BatchFetcher", "FetchResult", "run_sync"]
@@ -4,9 +4,10 @@ from typing import List
 
 import requests
 
+from ..ratelimit import throttle
 from ..security import log_request
 
-from .utils import ocr_image
+from .utils import attach_image_text
 
 
 class FourChanScraper:
@@ -16,27 +17,28 @@ class FourChanScraper:
 
     def fetch_thread(self, board: str, thread_no: int) -> List[dict]:
         url = self.API_URL.format(board=board, thread=thread_no)
+        throttle(url)
         log_request("GET", url)
         resp = requests.get(url, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         posts = []
+        images = []
         for p in data.get("posts", []):
-            images_text = []
-            if "tim" in p and "ext" in p:
-                img_url = f"https://i.4cdn.org/{board}/{p['tim']}{p['ext']}"
-                text = ocr_image(img_url)
-                if text:
-                    images_text.append(text)
+            images.append(
+                [f"https://i.4cdn.org/{board}/{p['tim']}{p['ext']}"]
+                if "tim" in p and "ext" in p
+                else []
+            )
             posts.append(
                 {
                     "id": p.get("no"),
                     "date": datetime.utcfromtimestamp(p.get("time", 0)).isoformat(),
                     "author": p.get("name"),
                     "text": p.get("com"),
-                    "images_text": images_text,
                 }
             )
+        attach_image_text(posts, images)
         return posts
 
     def dump_json(self, board: str, thread_no: int) -> str:
@@ -0,0 +1,465 @@
+"""On-disk HTTP response cache shared by every page fetcher.
+
+Responses are keyed by their normalized URL (lower-cased scheme and host,
+default port, fragment and tracking parameters dropped, query sorted) and
+stored zlib-compressed in SQLite together with their ``ETag`` and
+``Last-Modified`` validators. Fresh entries are served without touching the
+network; stale entries are revalidated with a conditional GET, and a ``304``
+only refreshes their expiry. Text extracted from a body (by trafilatura, for
+example) is cached next to it and reused while the body is unchanged.
+
+Freshness follows ``Cache-Control: max-age``/``no-cache``/``no-store`` and
+``Expires``; responses without them stay fresh for the default TTL.
+
+Configuration is read from the environment:
+
+``STORM_HTTP_CACHE``
+    Set to ``0``/``off``/``false`` to disable the cache.
+``STORM_HTTP_CACHE_PATH``
+    Location of the SQLite file, ``~/.tino_storm/http_cache.sqlite3`` by
+    default.
+``STORM_HTTP_CACHE_TTL``
+    Seconds a response without caching headers stays fresh (default one
+    day).
+``STORM_HTTP_CACHE_MAX_ENTRIES``
+    Maximum number of responses kept (default 20000).
+``STORM_HTTP_CACHE_MAX_BODY``
+    Largest body stored, in bytes (default 5 MiB).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..env import env_flag, env_float, env_int
+from ..sqlite_cache import connect_sqlite, open_sqlite
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_MAX_BODY = 5 * 1024 * 1024
+# Prune expired/excess rows after this many writes
+_PRUNE_INTERVAL = 64
+# Cache hits update ``accessed`` in memory; write them after this many
+_TOUCH_BATCH = 64
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref_src)$", re.I)
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)", re.I)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, "
+    "body BLOB NOT NULL, body_hash TEXT NOT NULL, etag TEXT, "
+    "last_modified TEXT, content_type TEXT, encoding TEXT, "
+    "fetched REAL NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS extracted ("
+    "key TEXT NOT NULL, extractor TEXT NOT NULL, body_hash TEXT NOT NULL, "
+    "text TEXT NOT NULL, PRIMARY KEY (key, extractor))",
+    "CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)",
+)
+
+
+def normalize_url(url: str) -> str:
+    """Return the cache key for *url*."""
+
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url
+    netloc = host
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    if port and _DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not _TRACKING_PARAMS.match(k)
+        )
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+def _expires(
+    headers: Optional[Mapping[str, str]], now: float, ttl: float
+) -> Optional[float]:
+    """Return when a response expires, or ``None`` if it must not be stored."""
+
+    control = (_header(headers, "Cache-Control") or "").lower()
+    if "no-store" in control:
+        return None
+    if "no-cache" in control:
+        return now
+    match = _MAX_AGE.search(control)
+    if match:
+        return now + int(match.group(1))
+    expires = _header(headers, "Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return now
+    return now + ttl
+
+
+@dataclass
+class CachedResponse:
+    """A response body with the metadata needed to revalidate it."""
+
+    url: str
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    encoding: Optional[str] = None
+    fetched: float = field(default_factory=time.time)
+    expires: Optional[float] = None
+    from_cache: bool = False
+
+    @classmethod
+    def from_response(cls, url: str, resp: Any) -> "CachedResponse":
+        """Build an entry from an ``httpx`` or ``requests`` response."""
+
+        headers = getattr(resp, "headers", None)
+        return cls(
+            url=url,
+            status=resp.status_code,
+            body=resp.content or b"",
+            etag=_header(headers, "ETag"),
+            last_modified=_header(headers, "Last-Modified"),
+            content_type=_header(headers, "Content-Type"),
+            encoding=getattr(resp, "encoding", None),
+        )
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.body.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    @property
+    def body_hash(self) -> str:
+        return hashlib.sha256(self.body).hexdigest()
+
+    def fresh(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.expires is not None and now < self.expires
+
+    def validators(self) -> Dict[str, str]:
+        """Return headers for a conditional GET of this entry."""
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """SQLite store of HTTP responses and text extracted from them.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file, or ``None`` for a memory-only cache.
+    ttl:
+        Freshness lifetime of responses without caching headers.
+    max_entries:
+        Maximum number of responses kept; the least recently used are pruned
+        periodically.
+    max_body:
+        Bodies larger than this are not stored.
+
+    Hits only read the database: the time of each access is kept in memory
+    and written in batches, with the next stored response, or on
+    :meth:`close`, so pruning still sees recently used entries.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_body: int = DEFAULT_MAX_BODY,
+    ) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        # Without a usable file the cache keeps its tables in memory
+        self._conn = open_sqlite(
+            self.path, *_SCHEMA, what="HTTP cache"
+        ) or connect_sqlite(None, *_SCHEMA)
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the stored response for *url*, fresh or stale."""
+
+        key = normalize_url(url)
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT status, body, etag, last_modified, content_type, "
+                    "encoding, fetched, expires FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._touched[key] = time.time()
+                if len(self._touched) >= _TOUCH_BATCH:
+                    self._write_touched_locked()
+                    self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("HTTP cache read failed: %s", exc)
+                return None
+        status, body, etag, last_modified, content_type, encoding, fetched, expires = (
+            row
+        )
+        entry = CachedResponse(
+            url=url,
+            status=status,
+            body=zlib.decompress(body),
+            etag=etag,
+            last_modified=last_modified,
+            content_type=content_type,
+            encoding=encoding,
+            fetched=fetched,
+            expires=expires,
+            from_cache=True,
+        )
+        with self._lock:
+            if entry.fresh():
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+
+    def store(
+        self, response: CachedResponse, headers: Optional[Mapping[str, str]] = None
+    ) -> bool:
+        """Store a successful *response*; *headers* decide its lifetime.
+
+        Returns ``False`` if the response is not cacheable.
+        """
+
+        if response.status != 200 or len(response.body) > self.max_body:
+            return False
+        now = time.time()
+        expires = _expires(headers, now, self.ttl)
+        if expires is None:
+            return False
+        response.fetched, response.expires = now, expires
+        key = normalize_url(response.url)
+        body = zlib.compress(response.body)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, url, status, body, "
+                    "body_hash, etag, last_modified, content_type, encoding, "
+                    "fetched, expires, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        response.url,
+                        response.status,
+                        body,
+                        response.body_hash,
+                        response.etag,
+                        response.last_modified,
+                        response.content_type,
+                        response.encoding,
+                        now,
+                        expires,
+                        now,
+                    ),
+                )
+                self._writes += 1
+                self._touched.pop(key, None)
+                if self._writes % _PRUNE_INTERVAL == 0:
+                    self._write_touched_locked()
+                    self._prune_locked()
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("HTTP cache write failed: %s", exc)
+                return False
+        return True
+
+    def revalidate(
+        self, entry: CachedResponse, headers: Optional[Mapping[str, str]] = None
+    ) -> CachedResponse:
+        """Extend the lifetime of *entry* after a ``304 Not Modified``."""
+
+        now = time.time()
+        entry.expires = _expires(headers, now, self.ttl) or now
+        entry.etag = _header(headers, "ETag") or entry.etag
+        entry.last_modified = _header(headers, "Last-Modified") or entry.last_modified
+        with self._lock:
+            self.revalidations += 1
+            try:
+                self._conn.execute(
+                    "UPDATE responses SET expires = ?, etag = ?, last_modified = ?, "
+                    "accessed = ? WHERE key = ?",
+                    (
+                        entry.expires,
+                        entry.etag,
+                        entry.last_modified,
+                        now,
+                        normalize_url(entry.url),
+                    ),
+                )
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("HTTP cache write failed: %s", exc)
+        return entry
+
+    def get_text(self, url: str, extractor: str, body: bytes) -> Optional[str]:
+        """Return text *extractor* produced from *body* of *url*, if cached."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM extracted WHERE key = ? AND extractor = ? "
+                "AND body_hash = ?",
+                (normalize_url(url), extractor, hashlib.sha256(body).hexdigest()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_text(self, url: str, extractor: str, body: bytes, text: str) -> None:
+        """Remember the *text* *extractor* produced from *body* of *url*."""
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extracted (key, extractor, body_hash, text) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        normalize_url(url),
+                        extractor,
+                        hashlib.sha256(body).hexdigest(),
+                        text,
+                    ),
+                )
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("HTTP cache write failed: %s", exc)
+
+    def _write_touched_locked(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _prune_locked(self) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE key NOT IN ("
+            "SELECT key FROM responses ORDER BY accessed DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self._conn.execute(
+            "DELETE FROM extracted WHERE key NOT IN (SELECT key FROM responses)"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._write_touched_locked()
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("HTTP cache write failed: %s", exc)
+            self._conn.close()
+
+
+def cached_get(
+    url: str,
+    send: Callable[[Dict[str, str]], Any],
+    cache: Optional[HTTPCache] = None,
+) -> CachedResponse:
+    """GET *url* through *cache* using ``send(headers) -> response``.
+
+    Fresh entries are returned without calling *send*. Stale entries are
+    revalidated with their validators as request headers. *send* may raise;
+    the error propagates to the caller.
+    """
+
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None and entry.fresh():
+        return entry
+    resp = send(entry.validators() if entry is not None else {})
+    headers = getattr(resp, "headers", None)
+    if entry is not None and resp.status_code == 304:
+        return cache.revalidate(entry, headers)
+    response = CachedResponse.from_response(url, resp)
+    if cache is not None:
+        cache.store(response, headers)
+    return response
+
+
+_CACHES: Dict[str, HTTPCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def http_cache() -> Optional[HTTPCache]:
+    """Return the shared cache configured by the environment, or ``None``."""
+
+    if not env_flag("STORM_HTTP_CACHE"):
+        return None
+    path = os.environ.get("STORM_HTTP_CACHE_PATH") or str(
+        Path.home() / ".tino_storm" / "http_cache.sqlite3"
+    )
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = _CACHES[path] = HTTPCache(
+                path,
+                ttl=env_float("STORM_HTTP_CACHE_TTL", DEFAULT_TTL),
+                max_entries=env_int(
+                    "STORM_HTTP_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+                ),
+                max_body=env_int("STORM_HTTP_CACHE_MAX_BODY", DEFAULT_MAX_BODY),
+            )
+        return cache
+
+
+__all__ = [
+    "CachedResponse",
+    "HTTPCache",
+    "cached_get",
+    "http_cache",
+    "normalize_url",
+]
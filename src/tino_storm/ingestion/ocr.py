@@ -0,0 +1,326 @@
+"""Batched OCR for images attached to scraped posts.
+
+:class:`OCRService` downloads images concurrently through a pooled
+:class:`~.fetcher.BatchFetcher`, drops files that are too small, too large or
+not a supported image format, and runs tesseract in a process pool. Results
+are cached by the SHA-256 of the image bytes, so the same picture reposted
+under another URL is recognised once.
+
+Configuration is read from the environment:
+
+``STORM_OCR_CONCURRENCY``
+    Concurrent image downloads (default 16).
+``STORM_OCR_PROCESSES``
+    Tesseract worker processes (default ``min(4, cpu_count)``, ``1`` runs
+    OCR in a thread of the calling process).
+``STORM_OCR_MIN_BYTES`` / ``STORM_OCR_MAX_BYTES``
+    Images outside this size range are skipped (defaults 1 KiB and 10 MiB).
+``STORM_OCR_MAX_PIXELS``
+    Images with more pixels are skipped (default 40 million).
+``STORM_OCR_CACHE``
+    Set to ``0``/``off``/``false`` to disable the result cache.
+``STORM_OCR_CACHE_PATH``
+    Location of the cache, ``~/.tino_storm/ocr_cache.sqlite3`` by default.
+
+OCR needs the optional ``Pillow`` and ``pytesseract`` packages; without them
+every image yields an empty string and nothing is downloaded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+import httpx
+
+from ..env import env_flag, env_int
+from ..sqlite_cache import SQLiteCache
+from .fetcher import BatchFetcher, run_sync
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_PIXELS = 40_000_000
+DEFAULT_FORMATS: FrozenSet[str] = frozenset(
+    {"png", "jpeg", "gif", "webp", "bmp", "tiff"}
+)
+
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+)
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """Return the image format of *data* from its magic bytes, if known."""
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    for signature, fmt in _SIGNATURES:
+        if data.startswith(signature):
+            return fmt
+    return None
+
+
+def ocr_available() -> bool:
+    """Return ``True`` if Pillow and pytesseract can be imported."""
+
+    for name in ("PIL", "pytesseract"):
+        if name in sys.modules:
+            continue
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+def _ocr_bytes(data: bytes, max_pixels: int = DEFAULT_MAX_PIXELS) -> str:
+    """Run tesseract on encoded image *data*; executed in worker processes."""
+
+    from io import BytesIO
+
+    import pytesseract
+    from PIL import Image
+
+    with Image.open(BytesIO(data)) as image:
+        width, height = image.size
+        if width * height > max_pixels:
+            return ""
+        return pytesseract.image_to_string(image).strip()
+
+
+def _cache_key(data: bytes) -> str:
+    return "ocr:" + hashlib.sha256(data).hexdigest()
+
+
+_DEFAULT = object()
+
+
+class OCRService:
+    """Download images and extract their text in parallel.
+
+    Parameters
+    ----------
+    concurrency:
+        Maximum simultaneous downloads.
+    processes:
+        Size of the tesseract process pool.
+    min_bytes, max_bytes:
+        Accepted image sizes. Downloads are abandoned once they exceed
+        ``max_bytes``.
+    max_pixels:
+        Largest image (``width * height``) handed to tesseract.
+    formats:
+        Accepted formats as reported by :func:`sniff_format`.
+    cache:
+        A :class:`~tino_storm.sqlite_cache.SQLiteCache` for OCR
+        results, ``None`` to disable caching. Defaults to the cache configured
+        by the environment.
+    fetcher_options:
+        Extra keyword arguments for :class:`~.fetcher.BatchFetcher`.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: Optional[int] = None,
+        processes: Optional[int] = None,
+        min_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_pixels: Optional[int] = None,
+        formats: Sequence[str] = DEFAULT_FORMATS,
+        cache: Optional[SQLiteCache] | object = _DEFAULT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        **fetcher_options,
+    ) -> None:
+        self.concurrency = concurrency or env_int(
+            "STORM_OCR_CONCURRENCY", DEFAULT_CONCURRENCY
+        )
+        self.processes = (
+            processes
+            if processes is not None
+            else env_int("STORM_OCR_PROCESSES", min(4, os.cpu_count() or 1))
+        )
+        self.min_bytes = (
+            min_bytes
+            if min_bytes is not None
+            else env_int("STORM_OCR_MIN_BYTES", DEFAULT_MIN_BYTES)
+        )
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else env_int("STORM_OCR_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self.max_pixels = (
+            max_pixels
+            if max_pixels is not None
+            else env_int("STORM_OCR_MAX_PIXELS", DEFAULT_MAX_PIXELS)
+        )
+        self.formats = frozenset(formats)
+        self.cache = ocr_cache() if cache is _DEFAULT else cache
+        self.transport = transport
+        self.fetcher_options = fetcher_options
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def _fetcher(self) -> BatchFetcher:
+        options = {"retries": 1, "per_host": 8, **self.fetcher_options}
+        return BatchFetcher(
+            max_concurrency=self.concurrency,
+            max_bytes=self.max_bytes,
+            transport=self.transport,
+            **options,
+        )
+
+    def accepts(self, data: bytes) -> bool:
+        """Return ``True`` if *data* passes the size and format filters."""
+
+        return (
+            self.min_bytes <= len(data) <= self.max_bytes
+            and sniff_format(data) in self.formats
+        )
+
+    async def ocr_many_async(self, urls: Sequence[str]) -> List[str]:
+        """Return the text of every image in *urls*, in order.
+
+        Images that fail to download, are filtered out or cannot be read
+        yield ``""``. Duplicate URLs are fetched once.
+        """
+
+        urls = list(urls)
+        if not urls or not ocr_available():
+            return ["" for _ in urls]
+        unique = list(dict.fromkeys(urls))
+        results = await self._fetcher().fetch_all_async(unique)
+
+        texts: Dict[str, str] = {}
+        pending: Dict[str, bytes] = {}
+        waiting: Dict[str, List[str]] = {}
+        for result in results:
+            texts[result.url] = ""
+            if not result.ok:
+                continue
+            data = result.content
+            if not self.accepts(data):
+                self.skipped += 1
+                continue
+            key = _cache_key(data)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                texts[result.url] = cached
+                continue
+            pending.setdefault(key, data)
+            waiting.setdefault(key, []).append(result.url)
+
+        if pending:
+            keys = list(pending)
+            outputs = await asyncio.gather(
+                *(self._recognize(pending[key]) for key in keys)
+            )
+            for key, text in zip(keys, outputs):
+                if text is None:
+                    continue
+                if self.cache is not None:
+                    self.cache.set(key, text)
+                for url in waiting[key]:
+                    texts[url] = text
+        return [texts.get(url, "") for url in urls]
+
+    def ocr_many(self, urls: Sequence[str]) -> List[str]:
+        return run_sync(self.ocr_many_async(urls))
+
+    def ocr(self, url: str) -> str:
+        return self.ocr_many([url])[0]
+
+    async def _recognize(self, data: bytes) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        executor = self._pool()
+        try:
+            if executor is None:
+                return await asyncio.to_thread(_ocr_bytes, data, self.max_pixels)
+            try:
+                return await loop.run_in_executor(
+                    executor, _ocr_bytes, data, self.max_pixels
+                )
+            except BrokenProcessPool as exc:
+                logging.warning("OCR process pool failed, running inline: %s", exc)
+                self.close()
+                self.processes = 1
+                return await asyncio.to_thread(_ocr_bytes, data, self.max_pixels)
+        except Exception as exc:  # noqa: BLE001 - unreadable images
+            logging.debug("OCR failed: %s", exc)
+            return None
+
+    def _pool(self) -> Optional[Executor]:
+        if self.processes <= 1:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(self.close)
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+def ocr_cache() -> Optional[SQLiteCache]:
+    """Return the OCR result cache configured by the environment."""
+
+    if not env_flag("STORM_OCR_CACHE"):
+        return None
+    path = os.environ.get("STORM_OCR_CACHE_PATH") or (
+        Path.home() / ".tino_storm" / "ocr_cache.sqlite3"
+    )
+    # OCR of identical bytes never changes, so entries do not expire
+    return SQLiteCache(path, ttl=None)
+
+
+_SERVICE: Optional[OCRService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_ocr_service() -> OCRService:
+    """Return the process-wide :class:`OCRService`."""
+
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = OCRService()
+        return _SERVICE
+
+
+__all__ = [
+    "OCRService",
+    "get_ocr_service",
+    "ocr_available",
+    "ocr_cache",
+    "sniff_format",
+]
@@ -0,0 +1,264 @@
+"""Streaming, page-parallel PDF text extraction.
+
+:class:`PDFExtractor` streams a PDF into a spooled temporary file (kept in
+memory up to a few MiB, then on disk) and yields the text of each page as soon
+as it is extracted. Documents with many pages are split into page ranges that
+a process pool extracts in parallel; pages are still yielded in order, each
+range as soon as it and the ranges before it are done.
+
+Configuration is read from the environment:
+
+``STORM_PDF_MAX_BYTES``
+    Largest PDF to download (default 50 MiB). Larger downloads are abandoned.
+``STORM_PDF_MAX_PAGES``
+    Pages extracted per document (default 1000, ``0`` for no limit).
+``STORM_PDF_PROCESSES``
+    Extraction worker processes (default ``min(4, cpu_count)``, ``1``
+    extracts inline).
+``STORM_PDF_PARALLEL_PAGES``
+    Pages a document needs before the process pool is used (default 32).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, Iterable, Iterator, List, Optional
+
+import requests
+
+from ..env import env_int
+from ..ratelimit import throttle
+from ..security import log_request
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_PAGES = 1000
+DEFAULT_PARALLEL_PAGES = 32
+# Downloads larger than this roll over from memory to a temporary file
+SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def pdf_reader_class() -> Any:
+    """Return ``pypdf.PdfReader`` (or the ``PyPDF2`` one), or ``None``."""
+
+    try:
+        from pypdf import PdfReader  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        try:
+            from PyPDF2 import PdfReader  # type: ignore
+        except Exception:
+            return None
+    return PdfReader
+
+
+def _page_text(page: Any) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:  # noqa: BLE001 - one bad page should not drop the rest
+        return ""
+
+
+def _extract_range(path: str, start: int, stop: int) -> List[str]:
+    """Return the text of pages ``start:stop``; executed in worker processes."""
+
+    reader = pdf_reader_class()(path)
+    return [_page_text(reader.pages[i]) for i in range(start, stop)]
+
+
+def _iter_body(resp: Any, chunk_size: int = 1 << 16) -> Iterable[bytes]:
+    iter_content = getattr(resp, "iter_content", None)
+    if callable(iter_content):
+        return iter_content(chunk_size=chunk_size)
+    return [resp.content]
+
+
+class PDFExtractor:
+    """Download PDFs and extract their pages with shared limits and workers.
+
+    Parameters
+    ----------
+    max_bytes:
+        Largest download accepted by :meth:`download`.
+    max_pages:
+        Pages yielded per document; ``0`` means no limit.
+    processes:
+        Size of the process pool used for long documents.
+    parallel_pages:
+        Minimum page count for a document to use the pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        processes: Optional[int] = None,
+        parallel_pages: Optional[int] = None,
+    ) -> None:
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else env_int("STORM_PDF_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self.max_pages = (
+            max_pages
+            if max_pages is not None
+            else env_int("STORM_PDF_MAX_PAGES", DEFAULT_MAX_PAGES)
+        )
+        self.processes = (
+            processes
+            if processes is not None
+            else env_int("STORM_PDF_PROCESSES", min(4, os.cpu_count() or 1))
+        )
+        self.parallel_pages = (
+            parallel_pages
+            if parallel_pages is not None
+            else env_int("STORM_PDF_PARALLEL_PAGES", DEFAULT_PARALLEL_PAGES)
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def download(self, url: str, timeout: float = 10) -> Optional[IO[bytes]]:
+        """Stream *url* into a spooled temporary file positioned at the start.
+
+        Returns ``None`` if the request fails or the body exceeds
+        ``max_bytes``. The caller closes the returned file.
+        """
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        resp = None
+        try:
+            throttle(url)
+            log_request("GET", url)
+            resp = requests.get(url, timeout=timeout, stream=True)
+            resp.raise_for_status()
+            size = 0
+            for block in _iter_body(resp):
+                size += len(block)
+                if self.max_bytes and size > self.max_bytes:
+                    logging.warning(
+                        "Skipping PDF %s larger than %d bytes", url, self.max_bytes
+                    )
+                    spool.close()
+                    return None
+                spool.write(block)
+        except Exception as exc:  # noqa: BLE001 - report as missing text
+            logging.debug("PDF download failed for %s: %s", url, exc)
+            spool.close()
+            return None
+        finally:
+            close = getattr(resp, "close", None)
+            if callable(close):
+                close()
+        spool.seek(0)
+        return spool
+
+    def iter_pages(self, fileobj: IO[bytes]) -> Iterator[str]:
+        """Yield the text of each page of the PDF in *fileobj*, in order."""
+
+        reader_cls = pdf_reader_class()
+        if reader_cls is None:
+            return
+        try:
+            pages = reader_cls(fileobj).pages
+            count = len(pages)
+        except Exception as exc:  # noqa: BLE001 - unreadable PDF
+            logging.debug("Could not read PDF: %s", exc)
+            return
+        if self.max_pages > 0 and count > self.max_pages:
+            logging.info(
+                "Extracting the first %d of %d PDF pages", self.max_pages, count
+            )
+            count = self.max_pages
+
+        done = 0
+        if self.processes > 1 and count >= max(2, self.parallel_pages):
+            for text in self._iter_parallel(fileobj, count):
+                yield text
+                done += 1
+        for i in range(done, count):
+            yield _page_text(pages[i])
+
+    def iter_url(self, url: str, timeout: float = 10) -> Iterator[str]:
+        """Download *url* and yield its page texts."""
+
+        spool = self.download(url, timeout=timeout)
+        if spool is None:
+            return
+        with spool:
+            yield from self.iter_pages(spool)
+
+    def text(self, fileobj: IO[bytes]) -> str:
+        return "\n".join(self.iter_pages(fileobj)).strip()
+
+    def _iter_parallel(self, fileobj: IO[bytes], count: int) -> Iterator[str]:
+        """Yield pages extracted by the pool; stops early if the pool fails.
+
+        The caller extracts whatever pages were not yielded inline.
+        """
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            fileobj.seek(0)
+            shutil.copyfileobj(fileobj, tmp)
+            tmp.flush()
+            step = max(1, math.ceil(count / (self.processes * 4)))
+            futures: List[Future] = []
+            try:
+                pool = self._pool()
+                futures = [
+                    pool.submit(
+                        _extract_range, tmp.name, start, min(start + step, count)
+                    )
+                    for start in range(0, count, step)
+                ]
+                for future in futures:
+                    texts = future.result()
+                    yield from texts
+            except Exception as exc:  # noqa: BLE001 - fall back to inline extraction
+                logging.warning("PDF process pool failed, extracting inline: %s", exc)
+                self.close()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                atexit.register(self.close)
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the process pool, if one was started."""
+
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_EXTRACTOR: Optional[PDFExtractor] = None
+_EXTRACTOR_LOCK = threading.Lock()
+
+
+def get_pdf_extractor() -> PDFExtractor:
+    """Return the process-wide :class:`PDFExtractor`."""
+
+    global _EXTRACTOR
+    with _EXTRACTOR_LOCK:
+        if _EXTRACTOR is None:
+            _EXTRACTOR = PDFExtractor()
+        return _EXTRACTOR
+
+
+__all__ = ["PDFExtractor", "get_pdf_extractor", "pdf_reader_class"]
@@ -9,9 +9,12 @@ except Exception:  # pragma: no cover - optional dependency
 
 import requests
 
+from ..ratelimit import throttle
 from ..security import log_request
 
-from .utils import ocr_image
+from .utils import attach_image_text
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif")
 
 
 class RedditScraper:
@@ -46,36 +49,33 @@ class RedditScraper:
         else:
             self.reddit = None
 
-    def _post_to_dict(self, post) -> dict:
-        images_text = []
-        if post.url and post.url.lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
-            text = ocr_image(post.url)
-            if text:
-                images_text.append(text)
-        return {
+    @staticmethod
+    def _image_urls(url: Optional[str]) -> List[str]:
+        return [url] if url and url.lower().endswith(IMAGE_SUFFIXES) else []
+
+    def _post_to_dict(self, post, ocr: bool = True) -> dict:
+        record = {
             "id": post.id,
             "date": datetime.utcfromtimestamp(post.created_utc).isoformat(),
             "author": getattr(post.author, "name", None),
             "title": post.title,
             "text": getattr(post, "selftext", ""),
             "url": post.url,
-            "images_text": images_text,
         }
+        if ocr:
+            attach_image_text([record], [self._image_urls(post.url)])
+        return record
 
     def _pushshift_search(self, subreddit: str, query: str, limit: int) -> List[dict]:
         url = "https://api.pushshift.io/reddit/search/submission"
         params = {"subreddit": subreddit, "q": query, "size": limit}
+        throttle(url)
         log_request("GET", url)
         resp = requests.get(url, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json().get("data", [])
         results = []
         for item in data:
-            images_text = []
-            if item.get("url", "").lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
-                text = ocr_image(item["url"])
-                if text:
-                    images_text.append(text)
             results.append(
                 {
                     "id": item.get("id"),
@@ -86,17 +86,19 @@ class RedditScraper:
                     "title": item.get("title"),
                     "text": item.get("selftext", ""),
                     "url": item.get("url"),
-                    "images_text": images_text,
                 }
             )
+        attach_image_text(results, [self._image_urls(r["url"]) for r in results])
         return results
 
     def search(self, subreddit: str, query: str, limit: int = 20) -> List[dict]:
         if self.reddit is not None:
             try:
                 sub = self.reddit.subreddit(subreddit)
-                posts = sub.search(query, limit=limit)
-                return [self._post_to_dict(p) for p in posts]
+                posts = list(sub.search(query, limit=limit))
+                results = [self._post_to_dict(p, ocr=False) for p in posts]
+                attach_image_text(results, [self._image_urls(p.url) for p in posts])
+                return results
             except Exception:
                 pass
         return self._pushshift_search(subreddit, query, limit)
@@ -6,7 +6,7 @@ try:  # snscrape may not support our Python version
 except Exception:  # pragma: no cover - optional dependency
     sntwitter = None
 
-from .utils import ocr_image
+from .utils import attach_image_text
 
 
 class TwitterScraper:
@@ -24,19 +24,19 @@ class TwitterScraper:
 
         scraper = sntwitter.TwitterSearchScraper(query)
         results = []
+        photos = []
         for i, tweet in enumerate(scraper.get_items()):
             if i >= limit:
                 break
-            images_text = []
-            media = getattr(tweet, "media", None)
-            if media:
-                for m in media:
-                    if getattr(m, "type", None) == "photo" and getattr(
-                        m, "fullUrl", None
-                    ):
-                        text = ocr_image(m.fullUrl)
-                        if text:
-                            images_text.append(text)
+            media = getattr(tweet, "media", None) or []
+            photos.append(
+                [
+                    m.fullUrl
+                    for m in media
+                    if getattr(m, "type", None) == "photo"
+                    and getattr(m, "fullUrl", None)
+                ]
+            )
             results.append(
                 {
                     "id": tweet.id,
@@ -44,9 +44,9 @@ class TwitterScraper:
                     "author": tweet.user.username,
                     "text": tweet.rawContent,
                     "url": tweet.url,
-                    "images_text": images_text,
                 }
             )
+        attach_image_text(results, photos)
         return results
 
     def dump_json(self, query: str, limit: int = 20) -> str:
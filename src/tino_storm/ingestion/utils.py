@@ -1,27 +1,33 @@
-import httpx
-from io import BytesIO
+from typing import Dict, List, Sequence
 
-from ..security import log_request
+from .ocr import get_ocr_service
 
-try:  # optional dependencies for OCR
-    from PIL import Image
-except Exception:  # pragma: no cover - optional dependency
-    Image = None
 
-try:
-    import pytesseract
-except Exception:  # pragma: no cover - optional dependency
-    pytesseract = None
+def ocr_images(urls: Sequence[str]) -> List[str]:
+    """Download the images at ``urls`` and return their text, in order.
+
+    Images are fetched concurrently and recognised in parallel by the shared
+    :class:`~.ocr.OCRService`; images that fail yield ``""``.
+    """
+    return get_ocr_service().ocr_many(urls)
 
 
 def ocr_image(url: str) -> str:
     """Download an image from ``url`` and return extracted text using pytesseract."""
-    try:
-        log_request("GET", url)
-        resp = httpx.get(url, timeout=10)
-        resp.raise_for_status()
-        image = Image.open(BytesIO(resp.content))
-        text = pytesseract.image_to_string(image)
-        return text.strip()
-    except Exception:
-        return ""
+    return ocr_images([url])[0]
+
+
+def attach_image_text(
+    records: List[Dict], image_urls: Sequence[Sequence[str]]
+) -> List[Dict]:
+    """Set ``images_text`` on each record from its list of ``image_urls``.
+
+    All images are recognised in a single :func:`ocr_images` batch; empty
+    results are dropped.
+    """
+    flat = [url for urls in image_urls for url in urls]
+    texts = iter(ocr_images(flat) if flat else [])
+    for record, urls in zip(records, image_urls):
+        found = [next(texts) for _ in urls]
+        record["images_text"] = [text for text in found if text]
+    return records
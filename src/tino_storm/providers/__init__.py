@@ -1,16 +1,47 @@
 from __future__ import annotations
 
+import importlib
 import os
 from dataclasses import dataclass
 from typing import Dict, Optional
 
 from .base import Provider, DefaultProvider, load_provider
-from .parallel import ParallelProvider
 from .registry import ProviderRegistry, provider_registry, register_provider
 from .aggregator import ProviderAggregator
-from .docs_hub import DocsHubProvider
-from .multi_source import MultiSourceProvider
-from .vector_db import VectorDBProvider
+from .concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+    get_provider_limiter,
+    provider_limiter_stats,
+)
+
+# Built-in providers are registered by dotted path so that neither their
+# modules nor their clients are imported until the provider is first used.
+_LAZY_PROVIDERS = {
+    "ParallelProvider": ("parallel", "tino_storm.providers.parallel"),
+    "DocsHubProvider": ("docs_hub", "tino_storm.providers.docs_hub"),
+    "MultiSourceProvider": ("multi_source", "tino_storm.providers.multi_source"),
+    "VectorDBProvider": ("vector_db", "tino_storm.providers.vector_db"),
+}
+
+for _attr, (_name, _module) in _LAZY_PROVIDERS.items():
+    if not provider_registry.is_loaded(_name):
+        provider_registry.register_lazy(_name, f"{_module}:{_attr}")
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        value = getattr(importlib.import_module(_LAZY_PROVIDERS[name][1]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _registered(name: str) -> Optional[Provider]:
+    try:
+        return provider_registry.get(name)
+    except KeyError:
+        return None
 
 
 @dataclass(frozen=True)
@@ -26,17 +57,14 @@ class ProviderCapabilities:
 def provider_capabilities() -> ProviderCapabilities:
     """Return lightweight availability flags for optional providers."""
 
-    docs_hub_provider = provider_registry.available().get("docs_hub")
-    has_docs_hub = docs_hub_provider is not None
+    has_docs_hub = "docs_hub" in provider_registry
+    docs_hub_provider = get_docs_hub_provider()
     docs_hub_remote = bool(
         docs_hub_provider
         and getattr(docs_hub_provider, "is_remote_configured", False)
     )
 
-    vector_provider = provider_registry.available().get("vector_db")
-    has_vector_retriever = bool(
-        vector_provider and getattr(vector_provider, "retriever", None)
-    )
+    has_vector_retriever = get_vector_db_provider() is not None
 
     has_bing = bool(os.getenv("BING_SEARCH_API_KEY"))
 
@@ -62,9 +90,17 @@ def available_providers() -> Dict[str, bool]:
 
 
 def get_docs_hub_provider() -> Optional[Provider]:
-    """Return the Docs Hub provider when a remote endpoint is configured."""
+    """Return the Docs Hub provider when a remote endpoint is configured.
+
+    The provider is not instantiated while it is still lazily registered and
+    ``STORM_DOCS_HUB_URL`` is unset, since it could not be remote-configured.
+    """
 
-    provider = provider_registry.available().get("docs_hub")
+    if not provider_registry.is_loaded("docs_hub") and not os.getenv(
+        "STORM_DOCS_HUB_URL"
+    ):
+        return None
+    provider = _registered("docs_hub")
     if provider and getattr(provider, "is_remote_configured", False):
         return provider
     return None
@@ -73,7 +109,7 @@ def get_docs_hub_provider() -> Optional[Provider]:
 def get_vector_db_provider() -> Optional[Provider]:
     """Return the vector search provider when a retriever is attached."""
 
-    provider = provider_registry.available().get("vector_db")
+    provider = _registered("vector_db")
     if provider and getattr(provider, "retriever", None):
         return provider
     return None
@@ -84,6 +120,10 @@ __all__ = [
     "DefaultProvider",
     "ParallelProvider",
     "ProviderAggregator",
+    "AdaptiveConcurrencyLimiter",
+    "ConcurrencyLimitExceeded",
+    "get_provider_limiter",
+    "provider_limiter_stats",
     "DocsHubProvider",
     "MultiSourceProvider",
     "VectorDBProvider",
@@ -17,6 +17,7 @@ from urllib.parse import urlsplit, urlunsplit
 
 
 from .base import Provider, load_provider, _run_coroutine_in_new_loop
+from .concurrency import get_provider_limiter
 from .registry import provider_registry
 from ..retrieval.rrf import reciprocal_rank_fusion
 from ..search_result import ResearchResult
@@ -219,18 +220,19 @@ class ProviderAggregator(Provider):
 
         async def run_provider(p: Provider) -> List[ResearchResult]:
             async with semaphore:
-                return await asyncio.wait_for(
-                    p.search_async(
-                        query,
-                        vaults,
-                        k_per_vault=k_per_vault,
-                        rrf_k=rrf_k,
-                        chroma_path=chroma_path,
-                        vault=vault,
+                async with get_provider_limiter(p).limit_async():
+                    return await asyncio.wait_for(
+                        p.search_async(
+                            query,
+                            vaults,
+                            k_per_vault=k_per_vault,
+                            rrf_k=rrf_k,
+                            chroma_path=chroma_path,
+                            vault=vault,
+                            timeout=actual_timeout,
+                        ),
                         timeout=actual_timeout,
-                    ),
-                    timeout=actual_timeout,
-                )
+                    )
 
         results = await asyncio.gather(
             *(run_provider(p) for p in self.providers),
@@ -272,11 +274,16 @@ class ProviderAggregator(Provider):
     ) -> List[ResearchResult]:
         actual_timeout = timeout if timeout is not None else self.timeout
 
+        def run_provider(p: Provider, *args: Any, **kwargs: Any) -> List[ResearchResult]:
+            with get_provider_limiter(p).limit_sync():
+                return p.search_sync(*args, **kwargs)
+
         aggregated: List[List[ResearchResult]] = []
         with ThreadPoolExecutor() as executor:
             futures = [
                 executor.submit(
-                    p.search_sync,
+                    run_provider,
+                    p,
                     query,
                     vaults,
                     k_per_vault=k_per_vault,
@@ -293,20 +300,21 @@ class ProviderAggregator(Provider):
                     r = future.result(timeout=actual_timeout)
                 except NotImplementedError:
                     try:
-                        coroutine = provider.search_async(
-                            query,
-                            vaults,
-                            k_per_vault=k_per_vault,
-                            rrf_k=rrf_k,
-                            chroma_path=chroma_path,
-                            vault=vault,
-                            timeout=actual_timeout,
-                        )
-                        if actual_timeout is not None:
-                            coroutine = asyncio.wait_for(
-                                coroutine, timeout=actual_timeout
+                        with get_provider_limiter(provider).limit_sync():
+                            coroutine = provider.search_async(
+                                query,
+                                vaults,
+                                k_per_vault=k_per_vault,
+                                rrf_k=rrf_k,
+                                chroma_path=chroma_path,
+                                vault=vault,
+                                timeout=actual_timeout,
                             )
-                        r = _run_coroutine_in_new_loop(coroutine)
+                            if actual_timeout is not None:
+                                coroutine = asyncio.wait_for(
+                                    coroutine, timeout=actual_timeout
+                                )
+                            r = _run_coroutine_in_new_loop(coroutine)
                     except Exception as e:
                         logging.exception(
                             "Provider %s failed in search_sync fallback", provider
@@ -2,23 +2,43 @@ from __future__ import annotations
 
 import asyncio
 import importlib
+import json
 import logging
 import os
+import re
 import threading
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from contextlib import suppress
-from typing import Any, Awaitable, Dict, Iterable, List, Optional, TypeVar
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
 from .._extras import MissingExtraError
+from ..env import env_int
 from ..search_result import ResearchResult, as_research_result
 
 from ..ingest import search_vaults
-from ..core.rm import BingSearch
 from ..events import ResearchAdded, event_emitter
+from .summary_cache import get_summary_cache, summary_cache_key
 
 # Maximum number of in-flight or cached summary tasks.
 SUMMARY_CACHE_LIMIT = 100
+# Number of results packed into a single batched summarization prompt
+SUMMARY_BATCH_SIZE = 8
+# Maximum number of summarization requests in flight per search
+SUMMARY_CONCURRENCY = 4
+# Characters of each result included in a batched prompt
+SUMMARY_INPUT_CHARS = 1000
+
+# Prompt prefix for per-result summaries; part of the summary cache key
+SUMMARY_PROMPT = "Summarize the following in one short sentence:\n"
+# Instructions of batched summary prompts; part of the summary cache key
+SUMMARY_BATCH_PROMPT = (
+    "Summarize each numbered passage below in one short sentence.\n"
+    "Respond with a JSON array of exactly {count} strings, "
+    "one summary per passage, in the same order."
+)
+
+_NUMBERED_LINE = re.compile(r"^\s*\[?(\d+)[\]).:]\s*(.+?)\s*$")
 
 T = TypeVar("T")
 
@@ -62,6 +82,60 @@ def _run_coroutine_in_new_loop(coro: Awaitable[T]) -> T:
     return result[0]
 
 
+def _summary_timeout(timeout: Optional[float]) -> Optional[float]:
+    if timeout is not None:
+        return timeout
+    t_str = os.environ.get("STORM_SUMMARY_TIMEOUT")
+    return float(t_str) if t_str else None
+
+
+def _build_batch_prompt(passages: List[str]) -> str:
+    """Return a prompt asking for one summary per numbered passage."""
+
+    lines = [SUMMARY_BATCH_PROMPT.format(count=len(passages)), ""]
+    for i, passage in enumerate(passages, 1):
+        lines.append(f"[{i}] {passage}")
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def _batch_passage(snippets: List[str]) -> str:
+    """Return the text of *snippets* sent in a batched summary prompt."""
+
+    return " ".join(snippets)[:SUMMARY_INPUT_CHARS]
+
+
+def _parse_batch_summaries(text: str, expected: int) -> Optional[List[str]]:
+    """Parse a batched summarization response.
+
+    A JSON array of strings is preferred; numbered lines such as ``1. ...`` or
+    ``[1] ...`` are accepted as a fallback. ``None`` is returned unless exactly
+    ``expected`` non-empty summaries are found.
+    """
+
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start : end + 1])
+        except ValueError:
+            data = None
+        if (
+            isinstance(data, list)
+            and len(data) == expected
+            and all(isinstance(item, str) and item.strip() for item in data)
+        ):
+            return [item.strip() for item in data]
+
+    numbered: Dict[int, str] = {}
+    for line in text.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if match:
+            numbered.setdefault(int(match.group(1)), match.group(2))
+    if sorted(numbered) == list(range(1, expected + 1)):
+        return [numbered[i] for i in range(1, expected + 1)]
+    return None
+
+
 def format_bing_items(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Normalize raw Bing results into the internal search format."""
 
@@ -153,6 +227,9 @@ class DefaultProvider(Provider):
             api_key = os.environ.get("BING_SEARCH_API_KEY")
             if not api_key:
                 return []
+            # ``core.rm`` pulls in the retriever stack
+            from ..core.rm import BingSearch
+
             self._bing = BingSearch(
                 bing_search_api_key=api_key, k=self.bing_k, **self.bing_kwargs
             )
@@ -191,6 +268,38 @@ class DefaultProvider(Provider):
 
         return self._summarizer or None
 
+    def _cached_summary(self, snippets: List[str]) -> Optional[str]:
+        """Return a persisted LLM summary for *snippets*, if any."""
+
+        cache = get_summary_cache()
+        if cache is None:
+            return None
+        for key in self._summary_cache_keys(snippets):
+            summary = cache.get(key)
+            if summary is not None:
+                return summary
+        return None
+
+    def _store_summary(
+        self, snippets: List[str], summary: str, *, batched: bool = False
+    ) -> None:
+        cache = get_summary_cache()
+        if cache is not None:
+            cache.set(self._summary_cache_keys(snippets)[batched], summary)
+
+    @staticmethod
+    def _summary_cache_keys(snippets: List[str]) -> Tuple[str, str]:
+        """Return the keys of per-item and batched summaries of *snippets*.
+
+        Each key covers the prompt template and the input that prompt sends.
+        """
+
+        model = os.environ.get("STORM_SUMMARY_MODEL", "")
+        return (
+            summary_cache_key(model, SUMMARY_PROMPT, snippets[0]),
+            summary_cache_key(model, SUMMARY_BATCH_PROMPT, _batch_passage(snippets)),
+        )
+
     async def _summarize_async(
         self,
         snippets: List[str],
@@ -212,19 +321,16 @@ class DefaultProvider(Provider):
             summarizer = self._get_summarizer()
             summary: Optional[str] = None
             if summarizer:
+                summary = self._cached_summary(snippets)
+            if summarizer and summary is None:
                 try:  # pragma: no cover - exercised when env var is set
-                    prompt = (
-                        "Summarize the following in one short sentence:\n" + snippets[0]
-                    )
-                    if timeout is None:
-                        t_str = os.environ.get("STORM_SUMMARY_TIMEOUT")
-                        timeout_val = float(t_str) if t_str else None
-                    else:
-                        timeout_val = timeout
+                    prompt = SUMMARY_PROMPT + snippets[0]
                     result = await asyncio.wait_for(
-                        asyncio.to_thread(summarizer, prompt), timeout=timeout_val
+                        asyncio.to_thread(summarizer, prompt),
+                        timeout=_summary_timeout(timeout),
                     )
                     summary = result[0].strip()
+                    self._store_summary(snippets, summary)
                 except Exception as e:  # pragma: no cover - network/LLM issues
                     logging.error(f"LLM summarization failed: {e}")
                     event_emitter.emit_sync(
@@ -246,6 +352,126 @@ class DefaultProvider(Provider):
         task.add_done_callback(lambda t, k=key: self._summary_tasks.pop(k, None))
         return await task
 
+    async def _summarize_batch_async(
+        self,
+        summarizer: Any,
+        batch: List[List[str]],
+        *,
+        max_chars: int,
+        timeout: Optional[float],
+    ) -> Optional[List[str]]:
+        """Summarize ``batch`` with a single LLM call.
+
+        Returns ``None`` when the call fails or its response cannot be parsed
+        so the caller can fall back to per-item summarization.
+        """
+
+        passages = [_batch_passage(snippets) for snippets in batch]
+        prompt = _build_batch_prompt(passages)
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(summarizer, prompt, max_tokens=60 * len(batch)),
+                timeout=_summary_timeout(timeout),
+            )
+            text = result[0] if isinstance(result, (list, tuple)) else result
+        except Exception as e:  # pragma: no cover - network/LLM issues
+            logging.warning(f"Batched LLM summarization failed: {e}")
+            return None
+
+        summaries = _parse_batch_summaries(str(text), len(batch))
+        if summaries is None:
+            logging.warning(
+                "Could not parse batched summaries; falling back to per-item calls"
+            )
+            return None
+        for snippets, summary in zip(batch, summaries):
+            self._store_summary(snippets, summary, batched=True)
+        return [summary[:max_chars] for summary in summaries]
+
+    async def _summarize_many_async(
+        self,
+        snippet_lists: List[List[str]],
+        *,
+        max_chars: int = 200,
+        timeout: Optional[float] = None,
+    ) -> List[Optional[str]]:
+        """Summarize several results, packing them into batched LLM prompts.
+
+        Identical snippet lists are summarized once and summaries already in
+        the persistent summary cache are reused. Up to
+        ``STORM_SUMMARY_BATCH_SIZE`` results share one prompt and at most
+        ``STORM_SUMMARY_CONCURRENCY`` LLM requests run at a time. Batches whose
+        response cannot be parsed are retried item by item via
+        :meth:`_summarize_async`. Without a configured summarizer, or with a
+        batch size of one, every result goes through :meth:`_summarize_async`.
+        """
+
+        batch_size = env_int("STORM_SUMMARY_BATCH_SIZE", SUMMARY_BATCH_SIZE)
+        summarizer = self._get_summarizer() if batch_size > 1 else None
+
+        unique: Dict[str, List[str]] = {}
+        for snippets in snippet_lists:
+            if snippets:
+                unique.setdefault("\n".join(snippets), snippets)
+
+        if not summarizer or len(unique) < 2:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._summarize_async(
+                            snippets, max_chars=max_chars, timeout=timeout
+                        )
+                        for snippets in snippet_lists
+                    )
+                )
+            )
+
+        semaphore = asyncio.Semaphore(
+            max(1, env_int("STORM_SUMMARY_CONCURRENCY", SUMMARY_CONCURRENCY))
+        )
+
+        async def _per_item(snippets: List[str]) -> Optional[str]:
+            async with semaphore:
+                return await self._summarize_async(
+                    snippets, max_chars=max_chars, timeout=timeout
+                )
+
+        async def _run_batch(keys: List[str]) -> Dict[str, Optional[str]]:
+            batch = [unique[k] for k in keys]
+            async with semaphore:
+                summaries = await self._summarize_batch_async(
+                    summarizer, batch, max_chars=max_chars, timeout=timeout
+                )
+            if summaries is None:
+                summaries = await asyncio.gather(*(_per_item(s) for s in batch))
+            return dict(zip(keys, summaries))
+
+        by_key: Dict[str, Optional[str]] = {}
+        pending: Dict[str, Any] = {}
+        to_batch: List[str] = []
+        for key, snippets in unique.items():
+            in_flight = self._summary_tasks.get(key)
+            cached = self._cached_summary(snippets)
+            if cached is not None:
+                by_key[key] = cached[:max_chars]
+            elif in_flight is not None:
+                pending[key] = in_flight
+            else:
+                to_batch.append(key)
+
+        batches = [
+            to_batch[i : i + batch_size] for i in range(0, len(to_batch), batch_size)
+        ]
+        for mapping in await asyncio.gather(*(_run_batch(b) for b in batches)):
+            by_key.update(mapping)
+        for key, task in pending.items():
+            by_key[key] = await task
+
+        return [
+            by_key.get("\n".join(snippets)) if snippets else None
+            for snippets in snippet_lists
+        ]
+
     def _summarize(
         self,
         snippets: List[str],
@@ -306,12 +532,9 @@ class DefaultProvider(Provider):
         unsummarized = [res for res in results if not getattr(res, "summary", None)]
         if unsummarized:
 
-            async def _gather():
-                return await asyncio.gather(
-                    *(self._summarize_async(res.snippets) for res in unsummarized)
-                )
-
-            summaries = _run_coroutine_in_new_loop(_gather())
+            summaries = _run_coroutine_in_new_loop(
+                self._summarize_many_async([res.snippets for res in unsummarized])
+            )
             for res, summary in zip(unsummarized, summaries):
                 res.summary = summary
 
@@ -352,8 +575,8 @@ class DefaultProvider(Provider):
 
         unsummarized = [res for res in results if not getattr(res, "summary", None)]
         if unsummarized:
-            summaries = await asyncio.gather(
-                *(self._summarize_async(res.snippets) for res in unsummarized)
+            summaries = await self._summarize_many_async(
+                [res.snippets for res in unsummarized]
             )
             for res, summary in zip(unsummarized, summaries):
                 res.summary = summary
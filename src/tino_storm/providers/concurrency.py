@@ -0,0 +1,385 @@
+"""Process-wide adaptive concurrency limiting for search providers.
+
+Each provider name maps to a single :class:`AdaptiveConcurrencyLimiter` shared
+by every :class:`~tino_storm.providers.aggregator.ProviderAggregator` instance
+and every :func:`tino_storm.search_async`/:func:`tino_storm.search_sync` call in
+the process. Limits follow an AIMD policy: successful calls grow the limit
+additively while timeouts or latency spikes above the recent baseline shrink
+it multiplicatively. Callers that exceed the limit are queued; once the queue
+is full, or a queued caller waits longer than its timeout, the request is shed
+with :class:`ConcurrencyLimitExceeded`.
+
+The limiter is safe to use from threads and from multiple event loops at the
+same time, which matches how providers are invoked via ``asyncio.to_thread``
+and the thread pools used by ``search_sync``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from ..env import env_float, env_int
+
+_TIMEOUT_ERRORS = (asyncio.TimeoutError, FuturesTimeoutError, TimeoutError)
+
+
+class ConcurrencyLimitExceeded(RuntimeError):
+    """Raised when a request is shed because a provider is saturated."""
+
+    def __init__(self, name: str, reason: str) -> None:
+        super().__init__(f"Concurrency limit exceeded for provider {name}: {reason}")
+        self.name = name
+        self.reason = reason
+
+
+class _Waiter:
+    """A queued caller waiting for a slot, either in a thread or a loop."""
+
+    __slots__ = ("granted", "_event", "_future", "_loop")
+
+    def __init__(
+        self,
+        future: Optional[asyncio.Future] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.granted = False
+        self._future = future
+        self._loop = loop
+        self._event = threading.Event() if future is None else None
+
+    def wake(self) -> None:
+        if self._future is None:
+            self._event.set()
+            return
+
+        def _resolve(fut: asyncio.Future = self._future) -> None:
+            if not fut.done():
+                fut.set_result(None)
+
+        try:
+            self._loop.call_soon_threadsafe(_resolve)
+        except RuntimeError:  # pragma: no cover - loop already closed
+            pass
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        return self._event.wait(timeout)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter keyed to a single provider.
+
+    Parameters
+    ----------
+    name:
+        Provider name used in error messages and statistics.
+    initial_limit, min_limit, max_limit:
+        Bounds for the number of concurrent in-flight requests.
+    max_queue:
+        Maximum number of callers allowed to wait for a slot. Further callers
+        are shed immediately.
+    queue_timeout:
+        Default number of seconds a caller may wait for a slot before being
+        shed. ``None`` waits indefinitely.
+    backoff_ratio:
+        Multiplicative decrease applied on timeouts and latency spikes.
+    latency_tolerance:
+        A call is treated as a congestion signal when its latency exceeds the
+        baseline by this factor.
+    latency_window:
+        Number of recent successful calls whose minimum latency forms the
+        baseline, so a one-off fast response stops counting once it ages out.
+    latency_floor:
+        Latencies below this many seconds never count as congestion, which
+        keeps jitter on very fast providers from collapsing the limit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 256,
+        queue_timeout: Optional[float] = None,
+        backoff_ratio: float = 0.7,
+        latency_tolerance: float = 2.0,
+        latency_floor: float = 0.05,
+        latency_window: int = 32,
+    ) -> None:
+        if min_limit < 1:
+            raise ValueError("min_limit must be at least 1")
+        if max_limit < min_limit:
+            raise ValueError("max_limit must be greater than or equal to min_limit")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._latencies: Deque[float] = deque(maxlen=max(1, latency_window))
+        self._avg_latency: Optional[float] = None
+        self._completed = 0
+        self._shed = 0
+        self._congestion_events = 0
+
+    @property
+    def limit(self) -> int:
+        """Return the current integer concurrency limit."""
+
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._waiters)
+
+    def _try_acquire_locked(self) -> bool:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _enqueue_locked(self, waiter: _Waiter) -> None:
+        if len(self._waiters) >= self.max_queue:
+            self._shed += 1
+            raise ConcurrencyLimitExceeded(self.name, "queue is full")
+        self._waiters.append(waiter)
+
+    def _wake_waiters_locked(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
+
+    def _abandon_locked(self, waiter: _Waiter) -> None:
+        """Undo a queued acquisition that timed out or was cancelled."""
+
+        if waiter.granted:
+            self._in_flight -= 1
+            self._wake_waiters_locked()
+        else:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:  # pragma: no cover - defensive
+                pass
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Block the current thread until a slot is available."""
+
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            waiter = _Waiter()
+            self._enqueue_locked(waiter)
+
+        if waiter.wait(timeout):
+            return
+        with self._lock:
+            if waiter.granted:
+                return
+            self._abandon_locked(waiter)
+            self._shed += 1
+        raise ConcurrencyLimitExceeded(self.name, "timed out waiting for a slot")
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> None:
+        """Wait without blocking the event loop until a slot is available."""
+
+        timeout = self.queue_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            waiter = _Waiter(loop.create_future(), loop)
+            self._enqueue_locked(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter._future), timeout)
+        except _TIMEOUT_ERRORS:
+            with self._lock:
+                if waiter.granted:
+                    return
+                self._abandon_locked(waiter)
+                self._shed += 1
+            raise ConcurrencyLimitExceeded(
+                self.name, "timed out waiting for a slot"
+            ) from None
+        except asyncio.CancelledError:
+            with self._lock:
+                self._abandon_locked(waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot to the limiter and wake the next waiter."""
+
+        with self._lock:
+            if self._in_flight > 0:
+                self._in_flight -= 1
+            self._wake_waiters_locked()
+
+    def record(self, latency: float, *, dropped: bool = False) -> None:
+        """Feed the outcome of a completed call into the AIMD controller."""
+
+        with self._lock:
+            self._completed += 1
+            if self._avg_latency is None:
+                self._avg_latency = latency
+            else:
+                self._avg_latency = 0.8 * self._avg_latency + 0.2 * latency
+            if not dropped:
+                self._latencies.append(latency)
+
+            congested = dropped or (
+                latency > self.latency_floor
+                and latency > min(self._latencies) * self.latency_tolerance
+            )
+            if congested:
+                self._congestion_events += 1
+                self._limit = max(
+                    float(self.min_limit), self._limit * self.backoff_ratio
+                )
+            else:
+                self._limit = min(
+                    float(self.max_limit), self._limit + 1.0 / self._limit
+                )
+                self._wake_waiters_locked()
+
+    @contextmanager
+    def limit_sync(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Hold a slot for the duration of the ``with`` block.
+
+        Only successful calls and timeouts feed the controller; other errors
+        (including fast failures) say nothing about the provider's load.
+        """
+
+        self.acquire(timeout)
+        start = time.monotonic()
+        try:
+            yield
+        except _TIMEOUT_ERRORS:
+            self.release()
+            self.record(time.monotonic() - start, dropped=True)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release()
+        self.record(time.monotonic() - start)
+
+    @asynccontextmanager
+    async def limit_async(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Async counterpart of :meth:`limit_sync`."""
+
+        await self.acquire_async(timeout)
+        start = time.monotonic()
+        try:
+            yield
+        except _TIMEOUT_ERRORS:
+            self.release()
+            self.record(time.monotonic() - start, dropped=True)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.release()
+        self.record(time.monotonic() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current limit, queue length and counters."""
+
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "completed": self._completed,
+                "shed": self._shed,
+                "congestion_events": self._congestion_events,
+                "min_latency": min(self._latencies) if self._latencies else None,
+                "avg_latency": self._avg_latency,
+            }
+
+
+_LIMITERS: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def _default_limiter(name: str) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        name,
+        initial_limit=env_int("STORM_PROVIDER_CONCURRENCY", 8),
+        max_limit=env_int("STORM_PROVIDER_MAX_CONCURRENCY", 64),
+        max_queue=env_int("STORM_PROVIDER_QUEUE_LIMIT", 256),
+        queue_timeout=env_float("STORM_PROVIDER_QUEUE_TIMEOUT", None),
+    )
+
+
+def provider_limiter_name(provider: Any) -> str:
+    """Return the key used to look up the limiter for *provider*."""
+
+    if isinstance(provider, str):
+        return provider
+    return getattr(provider, "name", None) or provider.__class__.__name__
+
+
+def get_provider_limiter(provider: Any) -> AdaptiveConcurrencyLimiter:
+    """Return the process-wide limiter for *provider* (an instance or name)."""
+
+    name = provider_limiter_name(provider)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(name)
+        if limiter is None:
+            limiter = _default_limiter(name)
+            _LIMITERS[name] = limiter
+        return limiter
+
+
+def set_provider_limiter(name: str, limiter: AdaptiveConcurrencyLimiter) -> None:
+    """Install a custom *limiter* for the provider registered as *name*."""
+
+    with _LIMITERS_LOCK:
+        _LIMITERS[name] = limiter
+
+
+def provider_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Return current limits and queue lengths for every known provider."""
+
+    with _LIMITERS_LOCK:
+        limiters = dict(_LIMITERS)
+    return {name: limiter.snapshot() for name, limiter in limiters.items()}
+
+
+def reset_provider_limiters() -> None:
+    """Forget all limiters; mainly useful in tests."""
+
+    with _LIMITERS_LOCK:
+        _LIMITERS.clear()
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "ConcurrencyLimitExceeded",
+    "get_provider_limiter",
+    "set_provider_limiter",
+    "provider_limiter_name",
+    "provider_limiter_stats",
+    "reset_provider_limiters",
+]
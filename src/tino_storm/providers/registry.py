@@ -1,33 +1,80 @@
 from __future__ import annotations
 
 import asyncio
+import importlib
 import logging
+import threading
 from importlib.metadata import entry_points
-from typing import Dict, Iterable, Union
+from typing import Callable, Dict, Iterable, List, Union
 
 
 from .base import Provider
 
+ProviderFactory = Callable[[], Provider]
+
+
+def _import_target(target: str) -> object:
+    """Import ``module:attr`` (or ``module.attr``) and return the attribute."""
+
+    if ":" in target:
+        module_name, attr = target.split(":", 1)
+    else:
+        module_name, attr = target.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _instantiate(provider: Union[Provider, type[Provider]]) -> Provider:
+    if isinstance(provider, type):
+        return provider()  # type: ignore[call-arg]
+    return provider
+
 
 class ProviderRegistry:
-    """Registry mapping names to provider instances."""
+    """Registry mapping names to provider instances.
+
+    Providers are stored as lazy factories and only instantiated the first
+    time they are requested with :meth:`get`. Entry points in the
+    ``tino_storm.providers`` group are discovered on demand rather than when
+    the registry is created, so importing :mod:`tino_storm` does not import
+    third-party provider packages.
+    """
 
     def __init__(self) -> None:
         self._providers: Dict[str, Provider] = {}
-        self._load_entrypoint_providers()
+        self._factories: Dict[str, ProviderFactory] = {}
+        self._lock = threading.RLock()
+        self._entrypoints_loaded = False
 
     def _load_entrypoint_providers(self) -> None:
-        """Load providers exposed via Python entry points."""
+        """Register lazy factories for providers exposed via entry points."""
 
-        for ep in entry_points(group="tino_storm.providers"):
+        with self._lock:
+            if self._entrypoints_loaded:
+                return
+            self._entrypoints_loaded = True
+            try:
+                eps = entry_points(group="tino_storm.providers")
+            except Exception as exc:  # pragma: no cover - broken metadata
+                logging.warning("Failed to discover provider entry-points: %s", exc)
+                return
+            for ep in eps:
+                if ep.name in self._providers or ep.name in self._factories:
+                    continue
+                self._factories[ep.name] = self._entrypoint_factory(ep)
+
+    @staticmethod
+    def _entrypoint_factory(ep) -> ProviderFactory:
+        def factory() -> Provider:
             try:
                 provider = ep.load()
-            except Exception as exc:  # pragma: no cover - warning handled
+            except Exception as exc:
                 logging.warning(
                     "Failed to load provider entry-point %s: %s", ep.name, exc
                 )
-                continue
-            self.register(ep.name, provider)
+                raise
+            return _instantiate(provider)
+
+        return factory
 
     def register(
         self, name: str, provider: Union[Provider, type[Provider]]
@@ -35,18 +82,79 @@ class ProviderRegistry:
         """Register *provider* under *name*.
 
         ``provider`` may be a Provider instance or subclass; subclasses are
-        instantiated with no arguments.
+        instantiated with no arguments. Use :meth:`register_lazy` to defer
+        importing and instantiating a provider until it is requested.
         """
 
-        if isinstance(provider, type):
-            provider = provider()  # type: ignore[call-arg]
-        self._providers[name] = provider
+        provider = _instantiate(provider)
+        with self._lock:
+            self._factories.pop(name, None)
+            self._providers[name] = provider
         return provider
 
+    def register_lazy(
+        self, name: str, target: Union[str, Callable[[], object]]
+    ) -> None:
+        """Register a provider that is imported and built on first use.
+
+        ``target`` is either a dotted path such as
+        ``"my_package.providers:MyProvider"`` or a zero-argument callable
+        returning a Provider instance or subclass.
+        """
+
+        def factory() -> Provider:
+            obj = _import_target(target) if isinstance(target, str) else target()
+            # Modules using ``register_provider`` register an instance on import
+            registered = self._providers.get(name)
+            if registered is not None:
+                return registered
+            return _instantiate(obj)  # type: ignore[arg-type]
+
+        with self._lock:
+            self._providers.pop(name, None)
+            self._factories[name] = factory
+
     def get(self, name: str) -> Provider:
-        """Return the provider registered under *name*."""
+        """Return the provider registered under *name*.
 
-        return self._providers[name]
+        Lazy entries are instantiated on first access. A ``KeyError`` is raised
+        when no provider is registered under *name* or its factory fails.
+        """
+
+        with self._lock:
+            provider = self._providers.get(name)
+            if provider is not None:
+                return provider
+            factory = self._factories.get(name)
+            if factory is None and not self._entrypoints_loaded:
+                self._load_entrypoint_providers()
+                factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(name)
+            try:
+                provider = factory()
+            except Exception as exc:
+                self._factories.pop(name, None)
+                logging.warning("Failed to instantiate provider %s: %s", name, exc)
+                raise KeyError(name) from exc
+            self._factories.pop(name, None)
+            self._providers[name] = provider
+            return provider
+
+    def is_loaded(self, name: str) -> bool:
+        """Return ``True`` if *name* has already been instantiated."""
+
+        return name in self._providers
+
+    def names(self) -> List[str]:
+        """Return all registered provider names without instantiating them."""
+
+        self._load_entrypoint_providers()
+        with self._lock:
+            return sorted(set(self._providers) | set(self._factories))
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name in self.names()
 
     def compose(self, *names: str) -> Provider:
         """Compose multiple providers into a single provider.
@@ -85,13 +193,29 @@ class ProviderRegistry:
         return _Composite(providers)
 
     def available(self) -> Dict[str, Provider]:
-        """Return a copy of the registered providers mapping."""
+        """Return a copy of the registered providers mapping.
 
-        return dict(self._providers)
+        This instantiates every lazy entry; use :meth:`names` to list
+        providers without loading them.
+        """
+
+        for name in self.names():
+            try:
+                self.get(name)
+            except KeyError:
+                continue
+        with self._lock:
+            return dict(self._providers)
 
     def clear(self) -> None:
-        """Remove all registered providers."""
-        self._providers.clear()
+        """Remove all registered providers.
+
+        Entry points are discovered again the next time they are needed.
+        """
+        with self._lock:
+            self._providers.clear()
+            self._factories.clear()
+            self._entrypoints_loaded = False
 
 
 provider_registry = ProviderRegistry()
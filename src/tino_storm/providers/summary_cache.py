@@ -0,0 +1,79 @@
+"""Persistent, content-addressed cache for LLM result summaries.
+
+Summaries are keyed by a hash of the summarization model, the prompt template
+and the snippet text, so changing any of them naturally invalidates old
+entries. Storage is the generic :class:`~tino_storm.sqlite_cache.SQLiteCache`,
+so several processes serving the API can share one file.
+
+Configuration is read from the environment:
+
+``STORM_SUMMARY_CACHE``
+    Set to ``0``/``off``/``false`` to disable the cache.
+``STORM_SUMMARY_CACHE_PATH``
+    Location of the SQLite file, ``~/.tino_storm/summary_cache.sqlite3`` by
+    default.
+``STORM_SUMMARY_CACHE_TTL``
+    Seconds before an entry expires (default one week, ``0`` never expires).
+``STORM_SUMMARY_CACHE_SIZE``
+    Maximum number of entries kept on disk (default 10000).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..env import env_flag, env_float, env_int
+from ..sqlite_cache import SQLiteCache
+
+# Summaries use the generic cache as is; the name is kept for callers
+SummaryCache = SQLiteCache
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+def summary_cache_key(model: str, template: str, text: str) -> str:
+    """Return the content address for summarizing *text* with *model*."""
+
+    digest = hashlib.sha256()
+    for part in (model, template, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+_CACHES: Dict[str, SummaryCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Return the process-wide summary cache configured by the environment.
+
+    ``None`` is returned when the cache is disabled via ``STORM_SUMMARY_CACHE``.
+    """
+
+    if not env_flag("STORM_SUMMARY_CACHE"):
+        return None
+    path = str(
+        Path(
+            os.environ.get("STORM_SUMMARY_CACHE_PATH")
+            or Path.home() / ".tino_storm" / "summary_cache.sqlite3"
+        ).expanduser()
+    )
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = SummaryCache(
+                path,
+                ttl=env_float("STORM_SUMMARY_CACHE_TTL", DEFAULT_TTL),
+                max_entries=env_int("STORM_SUMMARY_CACHE_SIZE", DEFAULT_MAX_ENTRIES),
+            )
+            _CACHES[path] = cache
+        return cache
+
+
+__all__ = ["SummaryCache", "get_summary_cache", "summary_cache_key"]
@@ -0,0 +1,507 @@
+"""Process-wide per-host rate limiting for outbound fetches.
+
+Every fetcher calls :func:`throttle` (or :func:`throttle_async`) right before
+it sends a request. The shared :class:`RateLimiter` keeps one token bucket per
+host: tokens refill at the host's ``rate`` per second up to ``burst``, and a
+request that finds the bucket empty waits for the next token. Waiting
+requests are queued per *flow* and served round-robin, so one STORM run
+fetching hundreds of pages from a host cannot starve another run that needs
+a few. The flow is taken from :func:`fetch_flow`; threads started by a run
+inherit it through :func:`bind_flow`.
+
+Configuration is read from the environment:
+
+``STORM_FETCH_RATE``
+    Requests per second allowed per host (default 5, ``0`` disables rate
+    limiting).
+``STORM_FETCH_BURST``
+    Requests a host may receive back to back before the rate applies
+    (default 10).
+``STORM_FETCH_HOST_LIMITS``
+    Per-host overrides as ``host=rate[:burst]`` pairs separated by commas,
+    e.g. ``export.arxiv.org=0.33:1,example.com=1``. A host also matches its
+    subdomains. These add to built-in limits for APIs that publish them.
+``STORM_FETCH_MAX_WAIT``
+    Seconds a request may wait for its turn before :class:`RateLimitTimeout`
+    is raised (default 300, ``0`` waits indefinitely).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, NamedTuple, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from .env import env_float, env_int
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_WAIT = 300.0
+# Drop idle buckets once this many hosts have been seen
+_SWEEP_MIN = 256
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a request waited longer than the limiter allows."""
+
+
+class HostPolicy(NamedTuple):
+    """Requests per second (``0`` for unlimited) and burst size for a host."""
+
+    rate: float
+    burst: int = 1
+
+
+# Limits documented by the services the scrapers use
+KNOWN_HOSTS: Dict[str, HostPolicy] = {
+    "export.arxiv.org": HostPolicy(1 / 3, 1),
+    "a.4cdn.org": HostPolicy(1.0, 1),
+    "api.pushshift.io": HostPolicy(1.0, 2),
+}
+
+_FLOW: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "tino_storm_fetch_flow", default="default"
+)
+
+
+def current_flow() -> str:
+    """Return the flow that requests from this context are queued under."""
+
+    return _FLOW.get()
+
+
+@contextmanager
+def fetch_flow(name: str) -> Iterator[None]:
+    """Queue requests made inside the block under flow *name*."""
+
+    token = _FLOW.set(name)
+    try:
+        yield
+    finally:
+        _FLOW.reset(token)
+
+
+def bind_flow(func: F) -> F:
+    """Wrap *func* so it runs under the caller's flow, e.g. in a thread pool."""
+
+    flow = current_flow()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with fetch_flow(flow):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def parse_host_limits(spec: str) -> Dict[str, HostPolicy]:
+    """Parse ``host=rate[:burst]`` pairs; malformed entries are logged and skipped."""
+
+    policies: Dict[str, HostPolicy] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        try:
+            policies[host.strip().lower()] = HostPolicy(
+                float(rate), max(1, int(burst)) if burst else 1
+            )
+        except ValueError:
+            logging.warning("Ignoring malformed host rate limit %r", item)
+    return policies
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased host of *url*, or *url* itself if it has none."""
+
+    if "://" not in url:
+        return url.lower()
+    try:
+        return (urlsplit(url).hostname or url).lower()
+    except ValueError:
+        return url.lower()
+
+
+class _Waiter:
+    """A queued request waiting for a token, either in a thread or a loop."""
+
+    __slots__ = ("granted", "enqueued", "waited", "_event", "_future", "_loop")
+
+    def __init__(
+        self,
+        future: Optional[asyncio.Future] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.granted = False
+        self.enqueued = time.monotonic()
+        self.waited = 0.0
+        self._future = future
+        self._loop = loop
+        self._event = threading.Event() if future is None else None
+
+    def wake(self) -> None:
+        if self._future is None:
+            self._event.set()
+            return
+
+        def _resolve(fut: asyncio.Future = self._future) -> None:
+            if not fut.done():
+                fut.set_result(None)
+
+        try:
+            self._loop.call_soon_threadsafe(_resolve)
+        except RuntimeError:  # pragma: no cover - loop already closed
+            pass
+
+
+class HostBucket:
+    """Token bucket and fair wait queue for a single host."""
+
+    def __init__(self, host: str, policy: HostPolicy) -> None:
+        self.host = host
+        self.rate = policy.rate
+        self.burst = max(1, policy.burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.flows: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self.flows.values())
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            float(self.burst), self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        """Take a token if nobody is queued and one is available."""
+
+        if self.unlimited:
+            self.requests += 1
+            return True
+        self._refill(now)
+        if self.flows or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        self.requests += 1
+        return True
+
+    def enqueue(self, waiter: _Waiter, flow: str) -> None:
+        self.flows.setdefault(flow, deque()).append(waiter)
+
+    def remove(self, waiter: _Waiter) -> None:
+        for flow, queue in list(self.flows.items()):
+            if waiter in queue:
+                queue.remove(waiter)
+                if not queue:
+                    del self.flows[flow]
+                return
+
+    def grant(self, now: float) -> list:
+        """Hand available tokens to queued waiters, one flow at a time."""
+
+        granted = []
+        if not self.unlimited:
+            self._refill(now)
+        while self.flows and (self.unlimited or self.tokens >= 1):
+            flow, queue = next(iter(self.flows.items()))
+            waiter = queue.popleft()
+            if queue:
+                self.flows.move_to_end(flow)
+            else:
+                del self.flows[flow]
+            if not self.unlimited:
+                self.tokens -= 1
+            waiter.granted = True
+            waiter.waited = now - waiter.enqueued
+            self.requests += 1
+            self.delayed += 1
+            self.total_wait += waiter.waited
+            self.max_wait = max(self.max_wait, waiter.waited)
+            granted.append(waiter)
+        return granted
+
+    def idle(self, now: float) -> bool:
+        """Whether nobody waits and the bucket has refilled to ``burst``."""
+
+        if self.flows:
+            return False
+        if self.unlimited:
+            return True
+        self._refill(now)
+        return self.tokens >= self.burst
+
+    def next_ready(self) -> Optional[float]:
+        """Seconds until the next queued waiter can be served."""
+
+        if not self.flows:
+            return None
+        if self.unlimited or self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "queued": self.queued,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "avg_wait": self.total_wait / self.delayed if self.delayed else 0.0,
+        }
+
+
+class RateLimiter:
+    """Token buckets for every host, served by one dispatcher thread.
+
+    Buckets that are idle and full behave exactly like new ones, so they are
+    dropped (with their stats) once many hosts have been contacted. The
+    dispatcher only looks at buckets with queued waiters.
+
+    Parameters
+    ----------
+    default:
+        Policy for hosts without a specific entry.
+    hosts:
+        Per-host policies; an entry also applies to its subdomains.
+    max_wait:
+        Seconds a request may wait before :class:`RateLimitTimeout` is
+        raised; ``None`` or ``0`` waits indefinitely.
+    """
+
+    def __init__(
+        self,
+        default: HostPolicy = HostPolicy(DEFAULT_RATE, DEFAULT_BURST),
+        hosts: Optional[Dict[str, HostPolicy]] = None,
+        max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+    ) -> None:
+        self.default = default
+        self.max_wait = max_wait
+        self.hosts = {h.lower(): p for h, p in (hosts or {}).items()}
+        self._cond = threading.Condition()
+        self._buckets: Dict[str, HostBucket] = {}
+        # Buckets with queued waiters, the only ones the dispatcher serves
+        self._waiting: Dict[str, HostBucket] = {}
+        self._sweep_at = _SWEEP_MIN
+        self._thread: Optional[threading.Thread] = None
+
+    def policy_for(self, host: str) -> HostPolicy:
+        parts = host.split(".")
+        for i in range(len(parts)):
+            policy = self.hosts.get(".".join(parts[i:]))
+            if policy is not None:
+                return policy
+        return self.default
+
+    def _bucket_locked(self, host: str) -> HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if len(self._buckets) >= self._sweep_at:
+                self._sweep_locked()
+            bucket = self._buckets[host] = HostBucket(host, self.policy_for(host))
+        return bucket
+
+    def _sweep_locked(self) -> None:
+        now = time.monotonic()
+        for host in [h for h, b in self._buckets.items() if b.idle(now)]:
+            del self._buckets[host]
+        # Sweep again only after the live buckets doubled, keeping it amortized
+        self._sweep_at = max(_SWEEP_MIN, 2 * len(self._buckets))
+
+    def _enqueue_locked(
+        self, bucket: HostBucket, waiter: _Waiter, flow: Optional[str]
+    ) -> None:
+        bucket.enqueue(waiter, flow or current_flow())
+        self._waiting[bucket.host] = bucket
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._dispatch, name="fetch-rate-limiter", daemon=True
+            )
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _withdraw(self, bucket: HostBucket, waiter: _Waiter) -> bool:
+        """Take *waiter* off the queue; ``False`` if it was granted meanwhile."""
+
+        with self._cond:
+            if waiter.granted:
+                return False
+            bucket.remove(waiter)
+            if not bucket.flows:
+                self._waiting.pop(bucket.host, None)
+            return True
+
+    def acquire(
+        self,
+        url: str,
+        *,
+        flow: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """Block until a request to *url* may be sent; return seconds waited.
+
+        Raises :class:`RateLimitTimeout` after *timeout* seconds
+        (``max_wait`` by default).
+        """
+
+        timeout = self.max_wait if timeout is None else timeout
+        with self._cond:
+            bucket = self._bucket_locked(host_of(url))
+            if bucket.try_take(time.monotonic()):
+                return 0.0
+            waiter = _Waiter()
+            self._enqueue_locked(bucket, waiter, flow)
+        if not waiter._event.wait(timeout or None) and self._withdraw(bucket, waiter):
+            raise RateLimitTimeout(
+                f"waited more than {timeout}s to request {bucket.host}"
+            )
+        return waiter.waited
+
+    async def acquire_async(
+        self,
+        url: str,
+        *,
+        flow: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """Wait without blocking the event loop; return seconds waited."""
+
+        timeout = self.max_wait if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            bucket = self._bucket_locked(host_of(url))
+            if bucket.try_take(time.monotonic()):
+                return 0.0
+            waiter = _Waiter(loop.create_future(), loop)
+            self._enqueue_locked(bucket, waiter, flow)
+
+        def _expire(fut: asyncio.Future = waiter._future) -> None:
+            if not fut.done() and self._withdraw(bucket, waiter):
+                fut.set_exception(
+                    RateLimitTimeout(
+                        f"waited more than {timeout}s to request {bucket.host}"
+                    )
+                )
+
+        # A timer instead of wait_for keeps the wake-up path as short as the
+        # dispatcher's, so grants complete in the order they were made
+        expiry = loop.call_later(timeout, _expire) if timeout else None
+        try:
+            await asyncio.shield(waiter._future)
+        except asyncio.CancelledError:
+            self._withdraw(bucket, waiter)
+            raise
+        finally:
+            if expiry is not None:
+                expiry.cancel()
+        return waiter.waited
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                delay: Optional[float] = None
+                for bucket in list(self._waiting.values()):
+                    for waiter in bucket.grant(now):
+                        waiter.wake()
+                    ready = bucket.next_ready()
+                    if ready is None:
+                        del self._waiting[bucket.host]
+                    else:
+                        delay = ready if delay is None else min(delay, ready)
+                self._cond.wait(delay)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return request counts, queue lengths and wait times per host."""
+
+        with self._cond:
+            return {host: b.snapshot() for host, b in self._buckets.items()}
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide :class:`RateLimiter` configured by the environment."""
+
+    global _LIMITER
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            hosts = dict(KNOWN_HOSTS)
+            hosts.update(
+                parse_host_limits(os.environ.get("STORM_FETCH_HOST_LIMITS", ""))
+            )
+            _LIMITER = RateLimiter(
+                HostPolicy(
+                    env_float("STORM_FETCH_RATE", DEFAULT_RATE),
+                    env_int("STORM_FETCH_BURST", DEFAULT_BURST),
+                ),
+                hosts,
+                env_float("STORM_FETCH_MAX_WAIT", DEFAULT_MAX_WAIT),
+            )
+        return _LIMITER
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Install *limiter* as the shared limiter; ``None`` resets to the default."""
+
+    global _LIMITER
+    with _LIMITER_LOCK:
+        _LIMITER = limiter
+
+
+def throttle(url: str, timeout: Optional[float] = None) -> float:
+    """Wait for the shared limiter before requesting *url*."""
+
+    return get_rate_limiter().acquire(url, timeout=timeout)
+
+
+async def throttle_async(url: str, timeout: Optional[float] = None) -> float:
+    return await get_rate_limiter().acquire_async(url, timeout=timeout)
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Return wait metrics for every host contacted so far."""
+
+    return get_rate_limiter().stats()
+
+
+__all__ = [
+    "HostPolicy",
+    "RateLimitTimeout",
+    "RateLimiter",
+    "bind_flow",
+    "current_flow",
+    "fetch_flow",
+    "get_rate_limiter",
+    "parse_host_limits",
+    "rate_limit_stats",
+    "set_rate_limiter",
+    "throttle",
+    "throttle_async",
+]
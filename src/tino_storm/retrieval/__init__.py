@@ -5,6 +5,22 @@ from .scoring import compute_score, score_results
 from .bayes import update_posterior, add_posteriors
 from typing import List, Dict, Any
 
+# Similarity scorers need NumPy, so they are imported on first use
+_SIMILARITY = {
+    "SIMILARITY_BACKENDS",
+    "bm25_scores",
+    "rank_by_similarity",
+    "similarity_scorer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SIMILARITY:
+        from . import similarity
+
+        return getattr(similarity, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def combine_ranks(
     recency_ranking: List[Dict[str, Any]],
@@ -25,4 +41,5 @@ __all__ = [
     "score_results",
     "update_posterior",
     "add_posteriors",
+    *sorted(_SIMILARITY),
 ]
@@ -0,0 +1,175 @@
+"""Question/snippet similarity scorers used to rank search results.
+
+Every scorer takes a query and a list of texts and returns one score per text
+as a NumPy array, so a whole result list is scored in one call:
+
+``bm25``
+    Okapi BM25 over word tokens. Term frequencies are counted once per text
+    and the scoring is a handful of array operations; the default.
+``embedding``
+    Cosine similarity of embeddings from :mod:`tino_storm.ingest.embedding`
+    (``STORM_INGEST_EMBEDDER``). Vectors are cached by content hash, so
+    snippets seen on earlier turns are not embedded again.
+``sequence``
+    ``difflib.SequenceMatcher`` ratio, the historical behaviour. Its cost
+    grows quadratically with text length.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from ..env import env_flag
+
+T = TypeVar("T")
+Scorer = Callable[[str, Sequence[str]], np.ndarray]
+
+SIMILARITY_BACKENDS = ("bm25", "embedding", "sequence")
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the lower-cased word tokens of *text*."""
+
+    return _TOKEN.findall(text.lower())
+
+
+def bm25_scores(
+    query: str, documents: Sequence[str], *, k1: float = 1.5, b: float = 0.75
+) -> np.ndarray:
+    """Score *documents* against *query* with Okapi BM25."""
+
+    scores = np.zeros(len(documents))
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms or not documents:
+        return scores
+    tf = np.zeros((len(documents), len(terms)))
+    lengths = np.zeros(len(documents))
+    for row, text in enumerate(documents):
+        tokens = tokenize(text)
+        lengths[row] = len(tokens)
+        counts = Counter(tokens)
+        tf[row] = [counts.get(term, 0) for term in terms]
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+    norm = k1 * (1 - b + b * lengths / (lengths.mean() or 1.0))
+    return (tf * (k1 + 1) / (tf + norm[:, None])) @ idf
+
+
+def sequence_scores(query: str, documents: Sequence[str]) -> np.ndarray:
+    """Score *documents* with ``difflib.SequenceMatcher`` ratios."""
+
+    return np.array([SequenceMatcher(None, query, doc).ratio() for doc in documents])
+
+
+class EmbeddingScorer:
+    """Cosine similarity of cached embeddings.
+
+    Parameters
+    ----------
+    embedder:
+        An :class:`~tino_storm.ingest.embedding.Embedder`; by default the one
+        configured by ``STORM_INGEST_EMBEDDER``.
+    memory_entries:
+        Vectors kept in memory in addition to the on-disk embedding cache.
+    """
+
+    def __init__(self, embedder: Any = None, *, memory_entries: int = 4096) -> None:
+        if embedder is None:
+            from ..ingest.embedding import CachedEmbedder, create_embedder
+
+            embedder = create_embedder()
+            if embedder is None:
+                raise ValueError(
+                    "The embedding similarity backend needs STORM_INGEST_EMBEDDER "
+                    "to name an embedding model"
+                )
+            embedder = CachedEmbedder(embedder, _embedding_cache())
+        self.embedder = embedder
+        self.memory_entries = memory_entries
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        unique = list(dict.fromkeys(texts))
+        with self._lock:
+            found = {t: self._vectors[t] for t in unique if t in self._vectors}
+        missing = [t for t in unique if t not in found]
+        if missing:
+            vectors = np.asarray(self.embedder.embed(missing), dtype=float)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            found.update(zip(missing, vectors / np.where(norms == 0, 1.0, norms)))
+            with self._lock:
+                if len(self._vectors) + len(missing) > self.memory_entries:
+                    self._vectors.clear()
+                self._vectors.update((t, found[t]) for t in missing)
+        return np.stack([found[t] for t in texts])
+
+    def __call__(self, query: str, documents: Sequence[str]) -> np.ndarray:
+        if not documents:
+            return np.zeros(0)
+        vectors = self._embed([query, *documents])
+        return vectors[1:] @ vectors[0]
+
+
+def _embedding_cache() -> Any:
+    from ..ingest.embedding import EmbeddingCache
+
+    if not env_flag("STORM_EMBEDDING_CACHE"):
+        return None
+    path = os.environ.get("STORM_EMBEDDING_CACHE_PATH") or (
+        Path.home() / ".tino_storm" / "embedding_cache.sqlite3"
+    )
+    return EmbeddingCache(path)
+
+
+def similarity_scorer(backend: str = "bm25", **kwargs: Any) -> Scorer:
+    """Return the scorer named *backend*, one of :data:`SIMILARITY_BACKENDS`."""
+
+    if backend == "bm25":
+        return bm25_scores
+    if backend == "sequence":
+        return sequence_scores
+    if backend == "embedding":
+        return EmbeddingScorer(**kwargs)
+    raise ValueError(
+        f"Unknown similarity backend {backend!r}; expected one of {SIMILARITY_BACKENDS}"
+    )
+
+
+def rank_by_similarity(
+    query: str,
+    items: Sequence[T],
+    texts: Sequence[str],
+    scorer: Optional[Scorer] = None,
+) -> List[T]:
+    """Return *items* sorted by the similarity of their *texts* to *query*.
+
+    Ties keep their original order.
+    """
+
+    if not items:
+        return []
+    scores = np.asarray((scorer or bm25_scores)(query, list(texts)))
+    order = np.argsort(-scores, kind="stable")
+    return [items[i] for i in order]
+
+
+__all__ = [
+    "SIMILARITY_BACKENDS",
+    "EmbeddingScorer",
+    "bm25_scores",
+    "rank_by_similarity",
+    "sequence_scores",
+    "similarity_scorer",
+    "tokenize",
+]
@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 import threading
+from contextlib import nullcontext
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from .providers import (
@@ -13,6 +14,7 @@ from .providers import (
     get_docs_hub_provider,
     get_vector_db_provider,
 )
+from .providers.concurrency import AdaptiveConcurrencyLimiter, get_provider_limiter
 from .events import ResearchAdded, event_emitter
 from .search_result import ResearchResult
 from .ingest.utils import list_vaults
@@ -71,6 +73,18 @@ def _error_metadata(
     }
 
 
+def _limiter_for(provider: Provider) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Return the shared limiter for *provider*.
+
+    Aggregators limit each member provider individually, so they are not
+    wrapped a second time.
+    """
+
+    if isinstance(provider, ProviderAggregator):
+        return None
+    return get_provider_limiter(provider)
+
+
 def _resolve_provider(provider: Provider | str | None) -> Provider:
     def _emit_load_error(spec: str, err: Exception) -> None:
         event = ResearchAdded(topic=spec, information_table={"error": str(err)})
@@ -185,15 +199,17 @@ async def search_async(
         )
 
     try:
-        results = await provider.search_async(
-            query,
-            vaults,
-            k_per_vault=k_per_vault,
-            rrf_k=rrf_k,
-            chroma_path=chroma_path,
-            vault=vault,
-            timeout=timeout,
-        )
+        limiter = _limiter_for(provider)
+        async with limiter.limit_async() if limiter else nullcontext():
+            results = await provider.search_async(
+                query,
+                vaults,
+                k_per_vault=k_per_vault,
+                rrf_k=rrf_k,
+                chroma_path=chroma_path,
+                vault=vault,
+                timeout=timeout,
+            )
         if isinstance(results, SearchResults):
             return results
         return SearchResults(results)
@@ -243,16 +259,18 @@ def search_sync(
             errors=[_error_metadata(query, e, provider)],
         )
 
+    limiter = _limiter_for(provider)
     try:
-        results = provider.search_sync(
-            query,
-            vaults,
-            k_per_vault=k_per_vault,
-            rrf_k=rrf_k,
-            chroma_path=chroma_path,
-            vault=vault,
-            timeout=timeout,
-        )
+        with limiter.limit_sync() if limiter else nullcontext():
+            results = provider.search_sync(
+                query,
+                vaults,
+                k_per_vault=k_per_vault,
+                rrf_k=rrf_k,
+                chroma_path=chroma_path,
+                vault=vault,
+                timeout=timeout,
+            )
         if isinstance(results, SearchResults):
             return results
         return SearchResults(results)
@@ -261,17 +279,18 @@ def search_sync(
             asyncio.get_running_loop()
         except RuntimeError:
             try:
-                results = asyncio.run(
-                    provider.search_async(
-                        query,
-                        vaults,
-                        k_per_vault=k_per_vault,
-                        rrf_k=rrf_k,
-                        chroma_path=chroma_path,
-                        vault=vault,
-                        timeout=timeout,
+                with limiter.limit_sync() if limiter else nullcontext():
+                    results = asyncio.run(
+                        provider.search_async(
+                            query,
+                            vaults,
+                            k_per_vault=k_per_vault,
+                            rrf_k=rrf_k,
+                            chroma_path=chroma_path,
+                            vault=vault,
+                            timeout=timeout,
+                        )
                     )
-                )
                 if isinstance(results, SearchResults):
                     return results
                 return SearchResults(results)
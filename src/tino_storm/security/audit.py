@@ -1,14 +1,254 @@
+"""Audit trail of outbound HTTP requests.
+
+:func:`log_request` hands a line to a buffered :class:`AuditLog` and returns
+immediately. A background thread appends queued lines in batches, fsyncs the
+file periodically and rotates it once it grows too large. Queued lines are
+flushed at interpreter exit; call :func:`flush` to force them out earlier.
+
+Configuration is read from the environment:
+
+``STORM_AUDIT_LOG_MAX_BYTES``
+    Size at which ``audit.log`` is rotated (default 10 MiB, ``0`` disables
+    rotation).
+``STORM_AUDIT_LOG_BACKUPS``
+    Rotated files kept as ``audit.log.1`` ... (default 5).
+``STORM_AUDIT_FSYNC_INTERVAL``
+    Seconds between fsyncs of the log (default 1).
+"""
+
 from __future__ import annotations
 
+import atexit
+import logging
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import IO, Dict, List, Optional
+
+from ..env import env_float
 
 AUDIT_LOG_PATH = Path.home() / ".tino_storm" / "audit.log"
 
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_FSYNC_INTERVAL = 1.0
+# Lines are written at least this often, or as soon as a batch fills up
+FLUSH_INTERVAL = 0.2
+BATCH_SIZE = 512
+
+
+class AuditLog:
+    """Append-only log file written by a background thread.
+
+    Parameters
+    ----------
+    path:
+        Log file to append to.
+    max_bytes:
+        Rotate the file once it reaches this size; ``0`` never rotates.
+    backups:
+        Number of rotated files to keep.
+    fsync_interval:
+        Seconds between fsyncs while lines are being written.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_bytes: Optional[int] = None,
+        backups: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = int(
+            max_bytes
+            if max_bytes is not None
+            else env_float("STORM_AUDIT_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self.backups = int(
+            backups
+            if backups is not None
+            else env_float("STORM_AUDIT_LOG_BACKUPS", DEFAULT_BACKUPS)
+        )
+        self.fsync_interval = (
+            fsync_interval
+            if fsync_interval is not None
+            else env_float("STORM_AUDIT_FSYNC_INTERVAL", DEFAULT_FSYNC_INTERVAL)
+        )
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._queued = 0
+        self._synced = 0
+        self._sync_requested = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[IO[str]] = None
+        self.rotations = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, line: str) -> None:
+        """Queue *line* (including its newline) for appending."""
+
+        with self._cond:
+            if not self._closed:
+                self._pending.append(line)
+                self._queued += 1
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="audit-log", daemon=True
+                    )
+                    self._thread.start()
+                elif len(self._pending) >= BATCH_SIZE:
+                    self._cond.notify_all()
+                return
+        # Closed during interpreter shutdown: write synchronously instead
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+        except OSError as exc:
+            logging.warning("Failed to write audit log %s: %s", self.path, exc)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every line queued so far is written and fsynced.
+
+        Returns ``False`` if *timeout* expired first.
+        """
+
+        with self._cond:
+            target = self._queued
+            if self._thread is None or self._synced >= target:
+                return True
+            self._sync_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._synced >= target, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush queued lines and stop the writer thread."""
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        written = 0
+        while True:
+            with self._cond:
+                if not (self._pending or self._closed or self._sync_requested):
+                    self._cond.wait(FLUSH_INTERVAL)
+                batch, self._pending = self._pending, []
+                closing = self._closed
+                sync = self._sync_requested
+                self._sync_requested = False
+            if batch:
+                self._append(batch)
+                written += len(batch)
+            now = time.monotonic()
+            if sync or closing or (batch and now - last_sync >= self.fsync_interval):
+                self._sync()
+                last_sync = now
+                with self._cond:
+                    self._synced = written
+                    self._cond.notify_all()
+            if closing:
+                with self._cond:
+                    if not self._pending:
+                        break
+        self._close_file()
+
+    def _open(self) -> IO[str]:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _append(self, lines: List[str]) -> None:
+        try:
+            fh = self._open()
+            fh.write("".join(lines))
+            fh.flush()
+            if self.max_bytes > 0 and fh.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as exc:
+            logging.warning("Failed to write audit log %s: %s", self.path, exc)
+            self._close_file()
+
+    def _sync(self) -> None:
+        if self._file is not None:
+            try:
+                os.fsync(self._file.fileno())
+            except OSError as exc:  # pragma: no cover - disk errors
+                logging.warning("Failed to sync audit log %s: %s", self.path, exc)
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._close_file()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                src = self.path.with_name(f"{self.path.name}.{index}")
+                if src.exists():
+                    os.replace(
+                        src, self.path.with_name(f"{self.path.name}.{index + 1}")
+                    )
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.rotations += 1
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
+
+
+_LOGS: Dict[Path, AuditLog] = {}
+_LOGS_LOCK = threading.Lock()
+
+
+def audit_log(path: Optional[str | Path] = None) -> AuditLog:
+    """Return the shared :class:`AuditLog` for *path* (``AUDIT_LOG_PATH``)."""
+
+    path = Path(path) if path is not None else AUDIT_LOG_PATH
+    log = _LOGS.get(path)
+    if log is None or log.closed:
+        with _LOGS_LOCK:
+            log = _LOGS.get(path)
+            if log is None or log.closed:
+                log = _LOGS[path] = AuditLog(path)
+    return log
+
 
 def log_request(method: str, url: str) -> None:
     """Append an entry to the audit log for the given request."""
-    AUDIT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.utcnow().isoformat()
-    with open(AUDIT_LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} {method.upper()} {url}\n")
+    audit_log().write(f"{timestamp} {method.upper()} {url}\n")
+
+
+def flush(timeout: Optional[float] = None) -> None:
+    """Write out every queued audit entry."""
+
+    for log in list(_LOGS.values()):
+        log.flush(timeout)
+
+
+@atexit.register
+def shutdown() -> None:
+    """Flush and close every audit log; registered to run at exit."""
+
+    with _LOGS_LOCK:
+        logs = list(_LOGS.values())
+    for log in logs:
+        log.close()
@@ -25,6 +25,14 @@ class EncryptedCollection:
         self._collection = collection
         self._passphrase = passphrase or get_passphrase()
 
+    def _encrypt(self, documents: Optional[List[str]]) -> Optional[List[str]]:
+        if documents and self._passphrase:
+            documents = [
+                base64.b64encode(encrypt_bytes(d.encode(), self._passphrase)).decode()
+                for d in documents
+            ]
+        return documents
+
     def add(
         self,
         ids: List[str],
@@ -33,16 +41,29 @@ class EncryptedCollection:
         documents: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> Any:
-        if documents and self._passphrase:
-            documents = [
-                base64.b64encode(encrypt_bytes(d.encode(), self._passphrase)).decode()
-                for d in documents
-            ]
         return self._collection.add(
             ids=ids,
             embeddings=embeddings,
             metadatas=metadatas,
-            documents=documents,
+            documents=self._encrypt(documents),
+            **kwargs,
+        )
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        metadatas: Optional[List[dict]] = None,
+        documents: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        # Fall back to ``add`` for collections without upsert support
+        write = getattr(self._collection, "upsert", None) or self._collection.add
+        return write(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=metadatas,
+            documents=self._encrypt(documents),
             **kwargs,
         )
 
@@ -0,0 +1,244 @@
+"""Generic persistent string cache shared by several subsystems.
+
+:class:`SQLiteCache` maps string keys to string values. Entries live in a
+SQLite database (WAL mode, so several processes can share one file) fronted
+by a small in-memory LRU. Hits only read the database; access times are
+written in batches so the least recently used rows can be pruned. LLM
+summaries, retrieval results and OCR text are all cached this way, each in
+its own file.
+
+:func:`connect_sqlite` and :func:`open_sqlite` hold the connection setup
+shared with the other SQLite stores (ingest index, file manifest, embedding
+and HTTP caches).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MEMORY_ENTRIES = 1024
+# Prune expired/excess rows after this many writes
+_PRUNE_INTERVAL = 64
+# Hits record access times in memory; write them after this many
+_TOUCH_BATCH = 64
+
+
+def connect_sqlite(path: Optional[Path], *schema: str) -> sqlite3.Connection:
+    """Open *path* in WAL mode and run the *schema* statements.
+
+    ``None`` opens a private in-memory database. The connection may be used
+    from any thread; callers serialize access with their own lock.
+    """
+
+    if path is None:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in schema:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+
+def open_sqlite(
+    path: Optional[Path], *schema: str, what: str
+) -> Optional[sqlite3.Connection]:
+    """Like :func:`connect_sqlite`, but ``None`` when *path* is unusable.
+
+    A missing *path* or a file that cannot be opened gives ``None``, so the
+    caller falls back to memory; failures are logged under *what*.
+    """
+
+    if path is None:
+        return None
+    try:
+        return connect_sqlite(path, *schema)
+    except (OSError, sqlite3.Error) as exc:
+        logging.warning("%s at %s unavailable, using memory only: %s", what, path, exc)
+        return None
+
+
+class SQLiteCache:
+    """SQLite-backed string cache with an in-memory LRU front.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file, or ``None`` for a memory-only cache.
+    ttl:
+        Seconds before entries expire; ``None`` or ``0`` keeps them forever.
+    max_entries:
+        Maximum number of rows kept on disk. The least recently used rows are
+        pruned periodically once the limit is exceeded.
+    memory_entries:
+        Size of the in-memory LRU.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        *,
+        ttl: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        self.path = Path(path).expanduser() if path else None
+        self.ttl = ttl or None
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self._conn = open_sqlite(
+            self.path,
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)",
+            what="Cache",
+        )
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value cached under *key* or ``None``."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self._touch_locked(key, now)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value, created FROM entries WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                    if row is not None and not self._expired(row[1], now):
+                        self._touch_locked(key, now)
+                        self._remember(key, row[0], row[1])
+                        self.hits += 1
+                        return row[0]
+                except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                    logging.warning("Cache at %s: read failed: %s", self.path, exc)
+
+            self.misses += 1
+            return None
+
+    def _touch_locked(self, key: str, now: float) -> None:
+        if self._conn is None:
+            return
+        self._touched[key] = now
+        if len(self._touched) >= _TOUCH_BATCH:
+            self._write_touched_locked()
+            self._conn.commit()
+
+    def _write_touched_locked(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def set(self, key: str, value: str) -> None:
+        """Store *value* under *key*."""
+
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, created, accessed)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._writes += 1
+                self._touched.pop(key, None)
+                if self._writes % _PRUNE_INTERVAL == 0:
+                    self._prune_locked(now)
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("Cache at %s: write failed: %s", self.path, exc)
+
+    def _prune_locked(self, now: float) -> None:
+        self._write_touched_locked()
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created < ?", (now - self.ttl,)
+            )
+        self._conn.execute(
+            "DELETE FROM entries WHERE key NOT IN ("
+            "SELECT key FROM entries ORDER BY accessed DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def prune(self) -> None:
+        """Drop expired entries and enforce ``max_entries`` immediately."""
+
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._prune_locked(time.time())
+                self._conn.commit()
+            except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                logging.warning("Cache at %s: prune failed: %s", self.path, exc)
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return len(self._memory)
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._write_touched_locked()
+                    self._conn.commit()
+                except sqlite3.Error as exc:  # pragma: no cover - disk issues
+                    logging.warning("Cache at %s: write failed: %s", self.path, exc)
+                self._conn.close()
+                self._conn = None
+
+
+__all__ = ["SQLiteCache", "connect_sqlite", "open_sqlite"]
@@ -17,6 +17,7 @@ from .modules.storm_dataclass import StormInformationTable, StormArticle
 from ..core.interface import Engine, LMConfigs, Retriever
 from ..lm import LitellmModel
 from ..core.utils import FileIOHelper, makeStringRed, truncate_filename
+from ..ratelimit import fetch_flow
 from ..events import ResearchAdded, DocGenerated, event_emitter
 
 
@@ -168,6 +169,20 @@ class STORMWikiRunnerArguments:
             "Consider reducing it if keep getting 'Exceed rate limit' error when calling LM API."
         },
     )
+    similarity_backend: str = field(
+        default="bm25",
+        metadata={
+            "help": "How search results are ranked against the question: 'bm25', "
+            "'embedding' (uses STORM_INGEST_EMBEDDER) or 'sequence' (difflib, slow)."
+        },
+    )
+    retrieve_timeout: Optional[float] = field(
+        default=None,
+        metadata={
+            "help": "Seconds a conversation turn waits for its search queries; "
+            "queries still running are skipped. None waits for every query."
+        },
+    )
 
 
 class STORMWikiRunner(Engine):
@@ -186,7 +201,11 @@ class STORMWikiRunner(Engine):
         self.lm_configs = lm_configs
         self.event_emitter = emitter
 
-        self.retriever = Retriever(rm=rm, max_thread=self.args.max_thread_num)
+        self.retriever = Retriever(
+            rm=rm,
+            max_thread=self.args.max_thread_num,
+            timeout=self.args.retrieve_timeout,
+        )
         storm_persona_generator = StormPersonaGenerator(
             self.lm_configs.question_asker_lm
         )
@@ -199,6 +218,7 @@ class STORMWikiRunner(Engine):
             search_top_k=self.args.search_top_k,
             max_conv_turn=self.args.max_conv_turn,
             max_thread_num=self.args.max_thread_num,
+            similarity_backend=self.args.similarity_backend,
         )
         self.storm_outline_generation_module = StormOutlineGenerationModule(
             outline_gen_lm=self.lm_configs.outline_gen_lm
@@ -240,6 +260,10 @@ class STORMWikiRunner(Engine):
         information_table.dump_url_to_info(
             os.path.join(self.article_output_dir, "raw_search_results.json")
         )
+        FileIOHelper.dump_json(
+            self.storm_knowledge_curation_module.query_stats,
+            os.path.join(self.article_output_dir, "query_stats.json"),
+        )
         asyncio.run(
             self.event_emitter.emit(
                 ResearchAdded(topic=self.topic, information_table=information_table)
@@ -403,9 +427,11 @@ class STORMWikiRunner(Engine):
         # research module
         information_table: StormInformationTable = None
         if do_research:
-            information_table = self.run_knowledge_curation_module(
-                ground_truth_url=ground_truth_url, callback_handler=callback_handler
-            )
+            # Queue this run's fetches separately so concurrent runs share hosts fairly
+            with fetch_flow(self.article_dir_name):
+                information_table = self.run_knowledge_curation_module(
+                    ground_truth_url=ground_truth_url, callback_handler=callback_handler
+                )
         # outline generation module
         outline: StormArticle = None
         if do_generate_outline:
@@ -11,9 +11,11 @@ from .persona_generator import StormPersonaGenerator
 from .storm_dataclass import DialogueTurn, StormInformationTable
 from .retriever import is_valid_wikipedia_source
 from ...core.interface import KnowledgeCurationModule, Retriever, Information
+from ...core.query_registry import QueryRegistry
 from ...core.utils import ArticleTextProcessing
+from ...ratelimit import bind_flow
 from ...retrieval import combine_ranks
-from difflib import SequenceMatcher
+from ...retrieval.similarity import rank_by_similarity, similarity_scorer
 
 try:
     from streamlit.runtime.scriptrunner import add_script_run_ctx
@@ -36,6 +38,7 @@ class ConvSimulator(dspy.Module):
         max_search_queries_per_turn: int,
         search_top_k: int,
         max_turn: int,
+        similarity_backend: str = "bm25",
     ):
         super().__init__()
         self.wiki_writer = WikiWriter(engine=question_asker_engine)
@@ -44,6 +47,7 @@ class ConvSimulator(dspy.Module):
             max_search_queries=max_search_queries_per_turn,
             search_top_k=search_top_k,
             retriever=retriever,
+            similarity_backend=similarity_backend,
         )
         self.max_turn = max_turn
 
@@ -195,6 +199,7 @@ class TopicExpert(dspy.Module):
         max_search_queries: int,
         search_top_k: int,
         retriever: Retriever,
+        similarity_backend: str = "bm25",
     ):
         super().__init__()
         self.generate_queries = dspy.Predict(QuestionToQuery)
@@ -203,6 +208,10 @@ class TopicExpert(dspy.Module):
         self.engine = engine
         self.max_search_queries = max_search_queries
         self.search_top_k = search_top_k
+        # Scores the question against every result's first snippet in one call
+        self.similarity = similarity_scorer(similarity_backend)
+        # Shared by all personas of a research run, see StormKnowledgeCurationModule.research
+        self.query_registry: Optional[QueryRegistry] = None
 
     def forward(self, topic: str, question: str, ground_truth_url: str):
         with dspy.settings.context(lm=self.engine, show_guidelines=False):
@@ -214,9 +223,14 @@ class TopicExpert(dspy.Module):
             ]
             queries = queries[: self.max_search_queries]
             # Search
-            searched_results: List[Information] = self.retriever.retrieve(
-                list(set(queries)), exclude_urls=[ground_truth_url]
-            )
+            if self.query_registry is not None:
+                searched_results: List[Information] = self.query_registry.retrieve(
+                    self.retriever, queries, exclude_urls=[ground_truth_url]
+                )
+            else:
+                searched_results = self.retriever.retrieve(
+                    list(set(queries)), exclude_urls=[ground_truth_url]
+                )
             if len(searched_results) > 0:
                 recency_ranking = searched_results
                 authority_ranking = sorted(
@@ -224,11 +238,12 @@ class TopicExpert(dspy.Module):
                     key=lambda r: 0 if is_valid_wikipedia_source(r.url) else 1,
                 )
 
-                def _sim(info):
-                    snippet = info.snippets[0] if info.snippets else ""
-                    return SequenceMatcher(None, question, snippet).ratio()
-
-                similarity_ranking = sorted(searched_results, key=_sim, reverse=True)
+                similarity_ranking = rank_by_similarity(
+                    question,
+                    searched_results,
+                    [r.snippets[0] if r.snippets else "" for r in searched_results],
+                    self.similarity,
+                )
 
                 searched_results = combine_ranks(
                     recency_ranking, authority_ranking, similarity_ranking
@@ -277,6 +292,7 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
         search_top_k: int,
         max_conv_turn: int,
         max_thread_num: int,
+        similarity_backend: str = "bm25",
     ):
         """
         Store args and finish initialization.
@@ -287,6 +303,7 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
         self.search_top_k = search_top_k
         self.max_thread_num = max_thread_num
         self.retriever = retriever
+        self.query_stats: Dict[str, int] = {}
         self.conv_simulator = ConvSimulator(
             topic_expert_engine=conv_simulator_lm,
             question_asker_engine=question_asker_lm,
@@ -294,6 +311,7 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
             max_search_queries_per_turn=max_search_queries_per_turn,
             search_top_k=search_top_k,
             max_turn=max_conv_turn,
+            similarity_backend=similarity_backend,
         )
 
     def _get_considered_personas(self, topic: str, max_num_persona) -> List[str]:
@@ -344,7 +362,7 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_persona = {
-                executor.submit(run_conv, persona): persona
+                executor.submit(bind_flow(run_conv), persona): persona
                 for persona in considered_personas
             }
 
@@ -392,14 +410,28 @@ class StormKnowledgeCurationModule(KnowledgeCurationModule):
             )
         callback_handler.on_identify_perspective_end(perspectives=considered_personas)
 
-        # run conversation
+        # run conversation; personas share one query registry for this run
         callback_handler.on_information_gathering_start()
-        conversations = self._run_conversation(
-            conv_simulator=self.conv_simulator,
-            topic=topic,
-            ground_truth_url=ground_truth_url,
-            considered_personas=considered_personas,
-            callback_handler=callback_handler,
+        registry = QueryRegistry()
+        topic_expert = getattr(self.conv_simulator, "topic_expert", None)
+        if topic_expert is not None:
+            topic_expert.query_registry = registry
+        try:
+            conversations = self._run_conversation(
+                conv_simulator=self.conv_simulator,
+                topic=topic,
+                ground_truth_url=ground_truth_url,
+                considered_personas=considered_personas,
+                callback_handler=callback_handler,
+            )
+        finally:
+            if topic_expert is not None:
+                topic_expert.query_registry = None
+            self.query_stats = registry.stats()
+        logging.info(
+            "Query registry saved %d of %d retrievals",
+            self.query_stats["saved"],
+            self.query_stats["requested"],
         )
 
         information_table = StormInformationTable(conversations)
@@ -6,12 +6,14 @@ import dspy
 import requests
 
 from ...security import log_request
+from ...ratelimit import throttle
 from bs4 import BeautifulSoup
 
 
 def get_wiki_page_title_and_toc(url):
     """Get the main title and table of contents from an url of a Wikipedia page."""
 
+    throttle(url)
     log_request("GET", url)
     response = requests.get(url)
     soup = BeautifulSoup(response.content, "html.parser")
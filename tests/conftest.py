@@ -804,8 +804,14 @@ def mock_requests(monkeypatch):
     def fake_post(*args, **kwargs):
         return DummyResponse({}, "")
 
+    def fake_request(self, method, url, *args, **kwargs):
+        if method.upper() == "POST":
+            return fake_post(url, *args, **kwargs)
+        return fake_get(url, *args, **kwargs)
+
     monkeypatch.setattr("requests.get", fake_get, raising=False)
     monkeypatch.setattr("requests.post", fake_post, raising=False)
+    monkeypatch.setattr("requests.Session.request", fake_request, raising=False)
     return fake_get
 
 
@@ -841,3 +847,25 @@ def mock_file_watcher(monkeypatch):
 @pytest.fixture(autouse=True)
 def set_bing_api_key(monkeypatch):
     monkeypatch.setenv("BING_SEARCH_API_KEY", "dummy")
+
+
+@pytest.fixture(autouse=True)
+def isolate_summary_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("STORM_SUMMARY_CACHE_PATH", str(tmp_path / "summary_cache.sqlite3"))
+    monkeypatch.setenv("STORM_OCR_CACHE_PATH", str(tmp_path / "ocr_cache.sqlite3"))
+    monkeypatch.setenv("STORM_HTTP_CACHE_PATH", str(tmp_path / "http_cache.sqlite3"))
+    monkeypatch.setenv(
+        "STORM_RETRIEVAL_CACHE_PATH", str(tmp_path / "retrieval_cache.sqlite3")
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolate_ingest_state(monkeypatch, tmp_path):
+    monkeypatch.setenv("STORM_INGEST_INDEX_PATH", str(tmp_path / "ingest_index.sqlite3"))
+    monkeypatch.setenv("STORM_INGEST_MANIFEST_PATH", str(tmp_path / "ingest_manifest.sqlite3"))
+
+
+@pytest.fixture(autouse=True)
+def placeholder_embeddings(monkeypatch, tmp_path):
+    monkeypatch.setenv("STORM_INGEST_EMBEDDER", "none")
+    monkeypatch.setenv("STORM_EMBEDDING_CACHE_PATH", str(tmp_path / "embeddings.sqlite3"))
@@ -1,10 +1,46 @@
-from tino_storm.security.audit import log_request
+from tino_storm.security import audit
+from tino_storm.security.audit import AuditLog, log_request
 
 
 def test_log_request(tmp_path, monkeypatch):
     log_path = tmp_path / "audit.log"
     monkeypatch.setattr("tino_storm.security.audit.AUDIT_LOG_PATH", log_path)
     log_request("GET", "http://example.com")
+    audit.flush()
     assert log_path.exists()
     content = log_path.read_text()
     assert "GET http://example.com" in content
+
+
+def test_audit_log_batches_lines_in_order(tmp_path):
+    log = AuditLog(tmp_path / "audit.log")
+    for i in range(1000):
+        log.write(f"line {i}\n")
+    assert log.flush(timeout=5)
+    lines = (tmp_path / "audit.log").read_text().splitlines()
+    assert lines == [f"line {i}" for i in range(1000)]
+    log.close()
+
+
+def test_audit_log_rotates_by_size(tmp_path):
+    path = tmp_path / "audit.log"
+    log = AuditLog(path, max_bytes=100, backups=2)
+    for i in range(5):
+        log.write("x" * 60 + "\n")
+        log.flush(timeout=5)
+    log.close()
+
+    assert log.rotations >= 2
+    assert path.with_name("audit.log.1").exists()
+    assert path.with_name("audit.log.2").exists()
+    assert not path.with_name("audit.log.3").exists()
+
+
+def test_audit_log_close_flushes_and_later_writes_are_kept(tmp_path):
+    path = tmp_path / "audit.log"
+    log = AuditLog(path)
+    log.write("queued\n")
+    log.close()
+    log.write("late\n")
+
+    assert path.read_text().splitlines() == ["queued", "late"]
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from tino_storm.ingestion.crawler import WebCrawler
+from tino_storm.ingestion.fetcher import BatchFetcher
+
+
+def test_fetch_all_preserves_order_and_retries():
+    calls = {}
+
+    def handler(request):
+        url = str(request.url)
+        calls[url] = calls.get(url, 0) + 1
+        if url.endswith("/flaky") and calls[url] == 1:
+            return httpx.Response(503)
+        if url.endswith("/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, text=f"page {url}")
+
+    fetcher = BatchFetcher(backoff=0, transport=httpx.MockTransport(handler))
+    urls = ["http://a.test/flaky", "http://b.test/ok", "http://a.test/missing"]
+    results = fetcher.fetch_all(urls)
+
+    assert [r.url for r in results] == urls
+    assert results[0].ok and results[0].attempts == 2
+    assert results[1].text == "page http://b.test/ok"
+    assert not results[2].ok and results[2].error == "HTTP 404"
+    assert calls["http://a.test/missing"] == 1
+
+
+def test_fetch_all_limits_requests_per_host():
+    active = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    fetcher = BatchFetcher(per_host=2, transport=httpx.MockTransport(handler))
+    urls = [f"http://a.test/{i}" for i in range(6)] + [
+        f"http://b.test/{i}" for i in range(6)
+    ]
+    results = fetcher.fetch_all(urls)
+
+    assert all(r.ok for r in results)
+    assert peak == {"a.test": 2, "b.test": 2}
+
+
+def test_busy_host_does_not_hold_global_slots():
+    finished = {}
+    start = time.monotonic()
+
+    async def handler(request):
+        if request.url.host == "slow.test":
+            await asyncio.sleep(0.3)
+        finished[str(request.url)] = time.monotonic() - start
+        return httpx.Response(200, text="ok")
+
+    fetcher = BatchFetcher(
+        max_concurrency=4,
+        per_host=1,
+        cache=None,
+        rate_limiter=None,
+        transport=httpx.MockTransport(handler),
+    )
+    urls = [f"http://slow.test/{i}" for i in range(4)] + ["http://fast.test/"]
+    assert all(r.ok for r in fetcher.fetch_all(urls))
+
+    assert finished["http://fast.test/"] < 0.2
+
+
+def test_fetch_all_honours_deadline():
+    async def handler(request):
+        await asyncio.sleep(0.5)
+        return httpx.Response(200, text="late")
+
+    fetcher = BatchFetcher(
+        per_host=1, retries=0, deadline=0.1, transport=httpx.MockTransport(handler)
+    )
+    start = time.monotonic()
+    results = fetcher.fetch_all([f"http://slow.test/{i}" for i in range(3)])
+
+    assert time.monotonic() - start < 0.5
+    assert [r.error for r in results] == ["deadline exceeded"] * 3
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"], scope="module")
+async def test_crawler_fetch_many_inside_event_loop(monkeypatch, anyio_backend):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, text=f"<p>{request.url.path}</p>")
+    )
+    monkeypatch.setattr(
+        "tino_storm.ingestion.crawler.trafilatura.extract", lambda html: html
+    )
+    crawler = WebCrawler(transport=transport)
+
+    pages = crawler.fetch_many(["http://a.test/one", "http://a.test/two"])
+
+    assert pages == [
+        {"url": "http://a.test/one", "text": "<p>/one</p>"},
+        {"url": "http://a.test/two", "text": "<p>/two</p>"},
+    ]
+
+
+def test_fetch_all_rejects_bodies_over_max_bytes():
+    def handler(request):
+        size = int(request.url.path.strip("/"))
+        return httpx.Response(200, content=b"x" * size)
+
+    fetcher = BatchFetcher(max_bytes=100, transport=httpx.MockTransport(handler))
+    small, large = fetcher.fetch_all(["http://a.test/50", "http://a.test/500"])
+
+    assert small.ok and small.content == b"x" * 50
+    assert not large.ok and large.error == "too large" and large.attempts == 1
@@ -195,6 +195,19 @@ def test_cli_ingest(monkeypatch, tmp_path):
     }
 
 
+def test_cli_ingest_workers(monkeypatch, tmp_path):
+    captured = {}
+
+    def fake_start_watcher(**kwargs):
+        captured.update(kwargs)
+
+    monkeypatch.setattr("tino_storm.cli.start_watcher", fake_start_watcher)
+
+    main(["ingest", "--root", str(tmp_path), "--workers", "8"])
+
+    assert captured["workers"] == 8
+
+
 def test_cli_ingest_missing_watchdog(monkeypatch):
     """ingest command exits gracefully when watchdog extras are absent."""
 
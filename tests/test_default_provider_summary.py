@@ -1,4 +1,5 @@
 import asyncio
+import json
 import threading
 import pytest
 
@@ -353,3 +354,60 @@ async def test_summarize_async_cache_eviction(monkeypatch, anyio_backend):
     event.set()
     await asyncio.gather(*tasks)
     assert provider._summary_tasks == {}
+
+
+def _many_results(n):
+    return [{"url": f"u{i}", "snippets": [f"s{i}"], "meta": {}} for i in range(n)]
+
+
+def test_search_sync_batches_llm_summaries(monkeypatch):
+    monkeypatch.setenv("STORM_SUMMARY_MODEL", "model")
+    monkeypatch.setenv("STORM_SUMMARY_BATCH_SIZE", "4")
+    monkeypatch.setattr(
+        "tino_storm.providers.base.search_vaults", lambda *a, **k: _many_results(10)
+    )
+
+    provider = DefaultProvider()
+    prompts = []
+
+    def fake_summarizer(prompt, **kwargs):
+        prompts.append(prompt)
+        passages = [line for line in prompt.splitlines() if line.startswith("[")]
+        summaries = [p.split("] ", 1)[1].upper() for p in passages]
+        return [json.dumps(summaries)]
+
+    monkeypatch.setattr(provider, "_get_summarizer", lambda: fake_summarizer)
+    results = provider.search_sync("q", [])
+
+    assert [r.summary for r in results] == [f"S{i}" for i in range(10)]
+    assert len(prompts) == 3
+
+
+def test_batched_summaries_fall_back_per_item_on_parse_failure(monkeypatch):
+    monkeypatch.setenv("STORM_SUMMARY_MODEL", "model")
+    monkeypatch.setattr(
+        "tino_storm.providers.base.search_vaults", lambda *a, **k: _many_results(3)
+    )
+
+    provider = DefaultProvider()
+    calls = []
+
+    def fake_summarizer(prompt, **kwargs):
+        calls.append(kwargs)
+        if kwargs:
+            return ["not a list of summaries"]
+        return ["item " + prompt.rsplit("\n", 1)[-1]]
+
+    monkeypatch.setattr(provider, "_get_summarizer", lambda: fake_summarizer)
+    results = provider.search_sync("q", [])
+
+    assert [r.summary for r in results] == ["item s0", "item s1", "item s2"]
+    assert len(calls) == 4
+
+
+def test_parse_batch_summaries_accepts_numbered_lines():
+    from tino_storm.providers.base import _parse_batch_summaries
+
+    text = "Here you go:\n1. first\n2) second\n[3] third"
+    assert _parse_batch_summaries(text, 3) == ["first", "second", "third"]
+    assert _parse_batch_summaries('["a", "b"]', 3) is None
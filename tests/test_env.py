@@ -0,0 +1,40 @@
+from tino_storm.env import env_flag, env_float, env_int
+from tino_storm.sqlite_cache import connect_sqlite, open_sqlite
+
+
+def test_malformed_numbers_fall_back_to_default(monkeypatch):
+    monkeypatch.setenv("STORM_TEST_NUMBER", "eight")
+    assert env_float("STORM_TEST_NUMBER", 1.5) == 1.5
+    assert env_int("STORM_TEST_NUMBER", 8) == 8
+
+    monkeypatch.setenv("STORM_TEST_NUMBER", "inf")
+    assert env_int("STORM_TEST_NUMBER", 8) == 8
+
+    monkeypatch.setenv("STORM_TEST_NUMBER", " 10.0 ")
+    assert env_int("STORM_TEST_NUMBER", 8) == 10
+
+
+def test_flags_are_on_unless_switched_off(monkeypatch):
+    monkeypatch.delenv("STORM_TEST_FLAG", raising=False)
+    assert env_flag("STORM_TEST_FLAG")
+    assert not env_flag("STORM_TEST_FLAG", default=False)
+
+    for value in ("0", "off", "False", "NO"):
+        monkeypatch.setenv("STORM_TEST_FLAG", value)
+        assert not env_flag("STORM_TEST_FLAG")
+
+    monkeypatch.setenv("STORM_TEST_FLAG", "1")
+    assert env_flag("STORM_TEST_FLAG", default=False)
+
+
+def test_sqlite_helpers_open_wal_databases(tmp_path):
+    schema = "CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY)"
+    conn = connect_sqlite(tmp_path / "nested" / "db.sqlite3", schema)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.execute("INSERT INTO items VALUES ('a')")
+    conn.close()
+
+    assert open_sqlite(None, schema, what="Test store") is None
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    assert open_sqlite(blocked / "db.sqlite3", schema, what="Test store") is None
@@ -0,0 +1,106 @@
+import threading
+import time
+import types
+
+from tino_storm.ingest.watcher import EventCoalescer, VaultIngestHandler
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_burst_of_events_becomes_one_callback(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_text("hello")
+    calls = []
+    coalescer = EventCoalescer(calls.append, delay=0.05)
+
+    for _ in range(10):
+        coalescer.touch(path)
+    assert _wait_for(lambda: calls)
+    time.sleep(0.1)
+    coalescer.close()
+
+    assert calls == [path]
+    assert coalescer.coalesced == 9
+
+
+def test_waits_until_file_size_is_stable(tmp_path):
+    path = tmp_path / "big.md"
+    path.write_text("")
+    sizes = []
+    coalescer = EventCoalescer(lambda p: sizes.append(p.stat().st_size), delay=0.1)
+
+    def writer():
+        for _ in range(8):
+            with open(path, "a") as fh:
+                fh.write("x" * 100)
+            time.sleep(0.02)
+
+    thread = threading.Thread(target=writer)
+    coalescer.touch(path)
+    thread.start()
+    thread.join()
+    assert _wait_for(lambda: sizes)
+    coalescer.close()
+
+    assert sizes == [800]
+
+
+def test_discarded_and_deleted_paths_are_dropped(tmp_path):
+    kept, moved, deleted = (tmp_path / n for n in ("kept.md", "moved.md", "gone.md"))
+    for p in (kept, moved, deleted):
+        p.write_text("x")
+    calls = []
+    coalescer = EventCoalescer(calls.append, delay=0.05)
+
+    coalescer.touch(kept)
+    coalescer.touch(moved)
+    coalescer.touch(deleted)
+    coalescer.discard(moved)
+    deleted.unlink()
+    assert _wait_for(lambda: calls)
+    time.sleep(0.1)
+    coalescer.close()
+
+    assert calls == [kept]
+
+
+def _event(src, dest=None):
+    return types.SimpleNamespace(
+        is_directory=False, src_path=str(src), dest_path=str(dest or src)
+    )
+
+
+def test_handler_coalesces_modify_and_move_events(monkeypatch, tmp_path):
+    vault_dir = tmp_path / "topic"
+    vault_dir.mkdir()
+    handler = VaultIngestHandler(str(tmp_path), chroma_path=str(tmp_path / "chroma"))
+    handled = []
+
+    def fake_handle(path, vault):
+        handled.append((path.name, vault))
+
+    monkeypatch.setattr(handler, "_handle_file_unbuffered", fake_handle)
+    handler.coalescer = EventCoalescer(handler._dispatch, delay=0.05)
+
+    # sync tools write to a temporary name and rename when complete
+    partial = vault_dir / "doc.md.part"
+    partial.write_text("complete")
+    handler.on_created(_event(partial))
+    handler.on_modified(_event(partial))
+    final = vault_dir / "doc.md"
+    partial.rename(final)
+    handler.on_moved(_event(partial, final))
+    handler.on_modified(_event(final))
+    assert _wait_for(lambda: handled)
+
+    # touching the file without changing its content is not re-ingested
+    handler.on_modified(_event(final))
+    time.sleep(0.15)
+    handler.coalescer.close()
+
+    assert handled == [("doc.md", "topic")]
@@ -1,5 +1,7 @@
 import logging
 import asyncio
+import threading
+import time
 from dataclasses import dataclass
 
 import pytest
@@ -195,3 +197,95 @@ def test_emit_sync_multiple_handlers_with_failures_logs_errors_and_continues(cap
     ]
     assert any("failing_handler_one" in msg for msg in error_messages)
     assert any("async_failing_handler" in msg for msg in error_messages)
+
+
+def test_queued_dispatch_does_not_wait_for_handlers():
+    emitter = EventEmitter(dispatch="queued")
+    release = threading.Event()
+    calls = []
+
+    def slow_handler(event):
+        release.wait(1)
+        calls.append(event.value)
+
+    async def async_handler(event):
+        await asyncio.sleep(0)
+        calls.append(("async", event.value))
+
+    emitter.subscribe(DummyEvent, slow_handler)
+    emitter.subscribe(DummyEvent, async_handler)
+
+    emitter.emit_sync(DummyEvent(1))
+    assert calls == []
+
+    release.set()
+    assert emitter.flush(timeout=1)
+    assert calls == [1, ("async", 1)]
+    assert emitter.stats()["dispatched"] == 1
+    emitter.shutdown()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"], scope="module")
+async def test_queued_emit_drops_when_queue_full(anyio_backend):
+    emitter = EventEmitter(dispatch="queued", max_queue=1, overflow="drop")
+    release = threading.Event()
+    started = threading.Event()
+    seen = []
+
+    def handler(event):
+        started.set()
+        release.wait(1)
+        seen.append(event.value)
+
+    emitter.subscribe(DummyEvent, handler)
+    await emitter.emit(DummyEvent(1))
+    assert started.wait(1)
+    await emitter.emit(DummyEvent(2))
+    await emitter.emit(DummyEvent(3))
+
+    release.set()
+    assert emitter.flush(timeout=1)
+    assert seen == [1, 2]
+    assert emitter.stats()["dropped"] == 1
+    emitter.shutdown()
+
+
+def test_queued_emit_blocks_when_configured():
+    emitter = EventEmitter(dispatch="queued", max_queue=1, overflow="block")
+    seen = []
+
+    def handler(event):
+        time.sleep(0.01)
+        seen.append(event.value)
+
+    emitter.subscribe(DummyEvent, handler)
+    for i in range(5):
+        emitter.emit_sync(DummyEvent(i))
+
+    assert emitter.flush(timeout=1)
+    assert seen == list(range(5))
+    assert emitter.stats()["dropped"] == 0
+    emitter.shutdown()
+
+
+def test_queued_dispatch_counts_failed_and_slow_handlers(caplog):
+    emitter = EventEmitter(dispatch="queued", slow_handler_threshold=0.01)
+
+    def failing(event):
+        raise RuntimeError("boom")
+
+    def slow(event):
+        time.sleep(0.02)
+
+    emitter.subscribe(DummyEvent, failing)
+    emitter.subscribe(DummyEvent, slow)
+    with caplog.at_level(logging.WARNING):
+        emitter.emit_sync(DummyEvent(1))
+        assert emitter.flush(timeout=1)
+
+    stats = emitter.stats()
+    assert stats["failed"] == 1
+    assert stats["slow"] == 1
+    assert "Slow handler slow" in caplog.text
+    emitter.shutdown()
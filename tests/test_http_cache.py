@@ -0,0 +1,129 @@
+import threading
+import types
+
+import httpx
+
+from tino_storm.ingestion.fetcher import BatchFetcher
+from tino_storm.ingestion.http_cache import HTTPCache, cached_get, normalize_url
+
+
+def test_normalize_url():
+    assert (
+        normalize_url("HTTPS://Example.com:443/a?b=2&utm_source=x&a=1#frag")
+        == "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def _server(responses):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        status, headers, body = responses[len(requests) - 1]
+        return httpx.Response(status, headers=headers, content=body)
+
+    return httpx.MockTransport(handler), requests
+
+
+def test_fetcher_serves_fresh_entries_from_cache(tmp_path):
+    transport, requests = _server([(200, {"Cache-Control": "max-age=60"}, b"page")])
+    cache = HTTPCache(tmp_path / "http.sqlite3")
+    fetcher = BatchFetcher(cache=cache, transport=transport)
+
+    first = fetcher.fetch_all(["http://a.test/x"])[0]
+    second = fetcher.fetch_all(["http://A.test/x#top"])[0]
+
+    assert len(requests) == 1
+    assert not first.cached and second.cached
+    assert second.content == b"page" and second.text == "page"
+
+
+def test_fetcher_uses_the_cache_off_the_event_loop(tmp_path):
+    transport, _ = _server([(200, {"Cache-Control": "max-age=60"}, b"page")])
+    threads = []
+
+    class RecordingCache(HTTPCache):
+        def get(self, url):
+            threads.append(threading.current_thread())
+            return super().get(url)
+
+        def store(self, response, headers=None):
+            threads.append(threading.current_thread())
+            return super().store(response, headers)
+
+    cache = RecordingCache(tmp_path / "http.sqlite3")
+    BatchFetcher(cache=cache, transport=transport).fetch_all(["http://a.test/x"])
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_hits_update_access_times_in_batches(tmp_path):
+    path = tmp_path / "http.sqlite3"
+    cache = HTTPCache(path)
+    cached_get(
+        "http://a.test/x",
+        lambda headers: types.SimpleNamespace(
+            status_code=200, headers={}, content=b"page", encoding="utf-8"
+        ),
+        cache,
+    )
+    (stored,) = cache._conn.execute("SELECT accessed FROM responses").fetchone()
+    changes = cache._conn.total_changes
+
+    for _ in range(3):
+        assert cache.get("http://a.test/x") is not None
+    assert cache._conn.total_changes == changes
+
+    cache.close()
+    reopened = HTTPCache(path)
+    (accessed,) = reopened._conn.execute("SELECT accessed FROM responses").fetchone()
+    assert accessed > stored
+
+
+def test_fetcher_revalidates_stale_entries(tmp_path):
+    transport, requests = _server(
+        [
+            (200, {"ETag": '"v1"', "Cache-Control": "no-cache"}, b"page"),
+            (304, {"Cache-Control": "max-age=60"}, b""),
+        ]
+    )
+    cache = HTTPCache(tmp_path / "http.sqlite3")
+    fetcher = BatchFetcher(cache=cache, transport=transport)
+
+    fetcher.fetch_all(["http://a.test/x"])
+    result = fetcher.fetch_all(["http://a.test/x"])[0]
+
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert result.ok and result.cached and result.content == b"page"
+    assert cache.revalidations == 1
+    assert cache.get("http://a.test/x").fresh()
+
+
+def test_no_store_and_errors_are_not_cached(tmp_path):
+    cache = HTTPCache(tmp_path / "http.sqlite3")
+    responses = iter(
+        [
+            types.SimpleNamespace(
+                status_code=200, headers={"Cache-Control": "no-store"}, content=b"a"
+            ),
+            types.SimpleNamespace(status_code=404, headers={}, content=b"b"),
+        ]
+    )
+
+    cached_get("http://a.test/private", lambda headers: next(responses), cache)
+    cached_get("http://a.test/missing", lambda headers: next(responses), cache)
+
+    assert cache.get("http://a.test/private") is None
+    assert cache.get("http://a.test/missing") is None
+
+
+def test_extracted_text_is_tied_to_the_body(tmp_path):
+    cache = HTTPCache(tmp_path / "http.sqlite3")
+    cache.set_text("http://a.test/x", "trafilatura", b"<p>v1</p>", "v1")
+
+    assert cache.get_text("http://a.test/x", "trafilatura", b"<p>v1</p>") == "v1"
+    assert cache.get_text("http://a.test/x", "trafilatura", b"<p>v2</p>") is None
+    assert cache.get_text("http://a.test/x", "other", b"<p>v1</p>") is None
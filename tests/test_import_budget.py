@@ -0,0 +1,65 @@
+"""Import-time benchmark for the search entrypoints.
+
+The check runs in a fresh interpreter so that modules imported by other tests
+(and the stubs installed by ``conftest``) do not hide regressions.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET_SECONDS = float(os.environ.get("STORM_IMPORT_BUDGET", "1.5"))
+
+HEAVY_MODULES = [
+    "httpx",
+    "trafilatura",
+    "watchdog",
+    "tino_storm.core.rm",
+    "tino_storm.ingest.watcher",
+    "tino_storm.providers.docs_hub",
+]
+
+_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import tino_storm
+from tino_storm.search import search_sync
+from tino_storm.providers import Provider
+imported = time.perf_counter()
+
+class Dummy(Provider):
+    def search_sync(self, query, vaults, **kwargs):
+        return []
+
+search_sync("benchmark", vaults=[], provider=Dummy())
+searched = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "first_search": searched - start,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def test_import_and_first_search_stay_within_budget(tmp_path):
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k != "BING_SEARCH_API_KEY" and not k.startswith("STORM_")
+    }
+    env["STORM_VAULT_ROOT"] = str(tmp_path)
+    proc = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=tmp_path,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    stats = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert stats["loaded"] == []
+    assert stats["import"] < IMPORT_BUDGET_SECONDS
+    assert stats["first_search"] < IMPORT_BUDGET_SECONDS
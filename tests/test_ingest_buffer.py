@@ -0,0 +1,120 @@
+import time
+
+from tino_storm.events import ResearchAdded, event_emitter
+from tino_storm.ingest.buffer import IngestWriteBuffer
+
+
+class RecordingCollection:
+    def __init__(self):
+        self.calls = []
+
+    def add(self, documents=None, metadatas=None, ids=None, embeddings=None):
+        self.calls.append(list(documents))
+
+
+def _capture_events(monkeypatch):
+    monkeypatch.setattr(event_emitter, "_subscribers", {})
+    events = []
+    event_emitter.subscribe(ResearchAdded, events.append)
+    return events
+
+
+def _add(buffer, collection, vault, i):
+    buffer.add(
+        "key", collection, vault, f"doc{i}", {"source": f"s{i}"}, f"id{i}", [0.0]
+    )
+
+
+def test_buffer_flushes_by_batch_size(monkeypatch):
+    events = _capture_events(monkeypatch)
+    collection = RecordingCollection()
+    buffer = IngestWriteBuffer(batch_size=3, max_latency=0)
+
+    for i in range(7):
+        _add(buffer, collection, "v", i)
+
+    assert collection.calls == [["doc0", "doc1", "doc2"], ["doc3", "doc4", "doc5"]]
+    assert len(buffer) == 1
+    assert buffer.flush() == 1
+    assert collection.calls[-1] == ["doc6"]
+    assert [e.information_table["count"] for e in events] == [3, 3, 1]
+    assert events[0].information_table["doc_ids"] == ["id0", "id1", "id2"]
+
+
+def test_buffer_flushes_after_max_latency(monkeypatch):
+    _capture_events(monkeypatch)
+    collection = RecordingCollection()
+    buffer = IngestWriteBuffer(batch_size=100, max_latency=0.05)
+
+    _add(buffer, collection, "v", 0)
+    _add(buffer, collection, "v", 1)
+    assert collection.calls == []
+
+    deadline = time.monotonic() + 2
+    while not collection.calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert collection.calls == [["doc0", "doc1"]]
+
+
+def test_buffer_context_manager_keeps_vaults_separate(monkeypatch):
+    events = _capture_events(monkeypatch)
+    first, second = RecordingCollection(), RecordingCollection()
+
+    with IngestWriteBuffer(batch_size=10, max_latency=0) as buffer:
+        _add(buffer, first, "a", 0)
+        _add(buffer, second, "b", 1)
+        _add(buffer, first, "a", 2)
+        assert first.calls == [] and second.calls == []
+
+    assert first.calls == [["doc0", "doc2"]]
+    assert second.calls == [["doc1"]]
+    assert sorted(e.topic for e in events) == ["a", "b"]
+
+
+def test_buffer_drops_repeated_ids_within_batch(monkeypatch):
+    _capture_events(monkeypatch)
+    written = []
+
+    class Collection:
+        def add(self, documents=None, metadatas=None, ids=None, embeddings=None):
+            written.append((list(ids), list(documents)))
+
+    collection = Collection()
+    buffer = IngestWriteBuffer(batch_size=10, max_latency=0)
+    buffer.add("key", collection, "v", "d", {"source": "s"}, "same", [0.0])
+    buffer.add("key", collection, "v", "d", {"source": "s"}, "same", [0.0])
+    buffer.add("key", collection, "v", "e", {"source": "s"}, "other", [0.0])
+
+    assert buffer.flush() == 2
+    assert written == [(["same", "other"], ["d", "e"])]
+
+
+def test_failed_timer_flush_is_reported_and_timer_keeps_running(monkeypatch):
+    events = _capture_events(monkeypatch)
+    failed = []
+
+    class FlakyCollection(RecordingCollection):
+        def add(self, documents=None, **kwargs):
+            if not self.calls:
+                self.calls.append(None)
+                raise RuntimeError("disk full")
+            super().add(documents=documents, **kwargs)
+
+    collection = FlakyCollection()
+    buffer = IngestWriteBuffer(
+        batch_size=100,
+        max_latency=0.05,
+        on_error=lambda vault, ids, metadatas: failed.append(ids),
+    )
+
+    _add(buffer, collection, "v", 0)
+    deadline = time.monotonic() + 2
+    while not failed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert failed == [["id0"]]
+    assert events[0].information_table["error"] == "disk full"
+
+    _add(buffer, collection, "v", 1)
+    while len(collection.calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert collection.calls == [None, ["doc1"]]
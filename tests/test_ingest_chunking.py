@@ -0,0 +1,81 @@
+import sys
+import types
+
+from tino_storm.ingest.chunking import Chunker, split_text
+
+TEXT = " ".join(f"Sentence number {i} says something." for i in range(60))
+
+
+def test_split_text_respects_size_offsets_and_sentences():
+    chunks = split_text(TEXT, chunk_size=200, chunk_overlap=50)
+
+    assert len(chunks) > 1
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert len(chunk.text) <= 200
+        assert TEXT[chunk.start : chunk.end] == chunk.text
+        assert chunk.text.endswith(".")
+    # consecutive chunks overlap but always make progress
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.start < nxt.start <= prev.end
+    assert chunks[-1].end == len(TEXT)
+
+
+def test_split_text_prefers_paragraphs_and_hard_cuts_long_words():
+    text = "alpha beta\n\ngamma delta"
+    assert [c.text for c in split_text(text, chunk_size=12, chunk_overlap=0)] == [
+        "alpha beta",
+        "gamma delta",
+    ]
+    assert [c.text for c in split_text("x" * 25, chunk_size=10)] == [
+        "x" * 10,
+        "x" * 10,
+        "x" * 5,
+    ]
+    assert [c.text for c in split_text(TEXT, chunk_size=0)] == [TEXT]
+    assert split_text("   ") == []
+
+
+def test_split_many_uses_process_pool_for_large_batches():
+    chunker = Chunker(200, 20, processes=2, parallel_chars=1)
+    texts = [TEXT, TEXT[:150], TEXT * 2]
+    try:
+        assert chunker.should_parallelize(texts)
+        assert chunker.split_many(texts) == [chunker.split(t) for t in texts]
+    finally:
+        chunker.close()
+    assert not Chunker(200, processes=2, parallel_chars=10**9).should_parallelize(texts)
+
+
+def test_handler_stores_chunks_with_parent_metadata(monkeypatch, tmp_path):
+    stored = {}
+
+    class Collection:
+        def upsert(self, documents=None, metadatas=None, ids=None, embeddings=None):
+            stored.update(zip(ids, zip(documents, metadatas)))
+
+    class Client:
+        def __init__(self, *a, **k):
+            self.collection = Collection()
+
+        def get_or_create_collection(self, name, **kwargs):
+            return self.collection
+
+    monkeypatch.setitem(
+        sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=Client)
+    )
+    from tino_storm.ingest import VaultIngestHandler
+
+    handler = VaultIngestHandler(
+        str(tmp_path), chroma_path=str(tmp_path / "chroma"), chunk_size=200
+    )
+    handler._ingest_text(TEXT, "article.txt", "topic")
+
+    metas = [meta for _, meta in stored.values()]
+    assert len(stored) == metas[0]["chunk_count"] > 1
+    assert {m["parent_id"] for m in metas} == {metas[0]["parent_id"]}
+    assert sorted(m["chunk_index"] for m in metas) == list(range(len(metas)))
+    for doc_id, (document, meta) in stored.items():
+        assert doc_id == f"{meta['parent_id']}:{meta['chunk_index']}"
+        assert TEXT[meta["start"] : meta["end"]] == document
+        assert meta["source"] == "article.txt"
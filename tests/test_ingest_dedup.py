@@ -0,0 +1,148 @@
+import sys
+import types
+
+from tino_storm.ingest.dedup import DedupIndex, content_id, normalize_text
+
+
+class UpsertCollection:
+    def __init__(self):
+        self.rows = {}
+        self.calls = 0
+
+    def upsert(self, documents=None, metadatas=None, ids=None, embeddings=None):
+        self.calls += 1
+        self.rows.update(zip(ids, documents))
+
+    def delete(self, ids=None):
+        for doc_id in ids:
+            self.rows.pop(doc_id, None)
+
+    def add(self, **kwargs):  # pragma: no cover - upsert is preferred
+        raise AssertionError("add should not be used when upsert exists")
+
+
+class UpsertClient:
+    def __init__(self, *a, **k):
+        self.collections = {}
+
+    def get_or_create_collection(self, name, **kwargs):
+        return self.collections.setdefault(name, UpsertCollection())
+
+
+def _handler(monkeypatch, tmp_path, **kwargs):
+    monkeypatch.setitem(
+        sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=UpsertClient)
+    )
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    from tino_storm.ingest import VaultIngestHandler
+
+    return VaultIngestHandler(
+        str(tmp_path / "vault"), chroma_path=str(tmp_path / "chroma"), **kwargs
+    )
+
+
+def test_content_id_is_deterministic_and_normalized():
+    assert normalize_text("  a\r\n b\t c ") == "a b c"
+    assert content_id("a\n b", "src") == content_id("a b", "src")
+    assert content_id("a b", "src") != content_id("a b", "other")
+    assert content_id("a b", "src") != content_id("a c", "src")
+
+
+def test_reingesting_unchanged_file_is_noop(monkeypatch, tmp_path):
+    vault_dir = tmp_path / "vault" / "topic"
+    vault_dir.mkdir(parents=True)
+    note = vault_dir / "note.md"
+    note.write_text("hello world")
+
+    handler = _handler(monkeypatch, tmp_path)
+    handler._handle_file(note, "topic")
+    handler._handle_file(note, "topic")
+    collection = handler.client.get_or_create_collection("topic")._collection
+    assert collection.calls == 1
+    assert list(collection.rows.values()) == ["hello world"]
+    assert handler.skipped == 1
+
+    # A new handler picks up the persisted index
+    again = _handler(monkeypatch, tmp_path)
+    again._handle_file(note, "topic")
+    assert again.skipped == 1
+
+    note.write_text("hello changed world")
+    again._handle_file(note, "topic")
+    assert again.skipped == 1
+    # The edited version replaces the previous one
+    assert again._index.count("topic") == 1
+    rows = again.client.get_or_create_collection("topic")._collection.rows
+    assert list(rows.values()) == ["hello changed world"]
+
+
+def test_duplicates_within_batch_are_written_once(monkeypatch, tmp_path):
+    handler = _handler(monkeypatch, tmp_path)
+    with handler.batch():
+        handler._ingest_text("same", "src", "topic")
+        handler._ingest_text("same ", "src", "topic")
+        handler._ingest_text("same", "src", "other")
+
+    assert handler.skipped == 1
+    assert handler._index.count("topic") == 1
+    assert handler._index.count("other") == 1
+
+
+def test_dedup_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("STORM_INGEST_DEDUP", "off")
+    handler = _handler(monkeypatch, tmp_path)
+    handler._ingest_text("same", "src", "topic")
+    handler._ingest_text("same", "src", "topic")
+
+    collection = handler.client.get_or_create_collection("topic")._collection
+    assert handler._index is None
+    assert collection.calls == 2
+    assert len(collection.rows) == 1
+
+
+def test_index_persists_per_vault(tmp_path):
+    path = tmp_path / "index.sqlite3"
+    index = DedupIndex(path)
+    index.add("a", [("id1", "s", "h")])
+    index.close()
+
+    reopened = DedupIndex(path)
+    assert ("a", "id1") in reopened
+    assert not reopened.contains("b", "id1")
+    reopened.forget("a")
+    assert reopened.count("a") == 0
+
+
+def test_failed_write_is_retried(monkeypatch, tmp_path):
+    vault_dir = tmp_path / "vault" / "topic"
+    vault_dir.mkdir(parents=True)
+    note = vault_dir / "note.md"
+    note.write_text("hello world")
+
+    handler = _handler(monkeypatch, tmp_path)
+    collection = handler.client.get_or_create_collection("topic")._collection
+    write = collection.upsert
+
+    def failing_upsert(**kwargs):
+        raise RuntimeError("disk full")
+
+    collection.upsert = failing_upsert
+    handler._handle_file(note, "topic")
+    assert handler._in_flight == set()
+    collection.upsert = write
+
+    handler._handle_file(note, "topic")
+    assert list(collection.rows.values()) == ["hello world"]
+    assert handler._in_flight == set()
+
+
+def test_documents_sharing_a_source_are_kept(monkeypatch, tmp_path):
+    handler = _handler(monkeypatch, tmp_path)
+    with handler.batch():
+        handler._write_documents([("post one", "thread", None)], "topic")
+        handler._write_documents(
+            [("post one", "thread", None), ("post two", "thread", None)], "topic"
+        )
+
+    collection = handler.client.get_or_create_collection("topic")._collection
+    assert sorted(collection.rows.values()) == ["post one", "post two"]
@@ -0,0 +1,327 @@
+import sys
+import types
+
+from tino_storm.ingest import embedding
+from tino_storm.ingest.embedding import CachedEmbedder, EmbeddingCache, create_embedder
+from tino_storm.ingest.search import search_vaults
+
+
+class CountingEmbedder:
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class UpsertCollection:
+    def __init__(self):
+        self.writes = []
+
+    def upsert(self, documents=None, metadatas=None, ids=None, embeddings=None):
+        self.writes.append((list(documents), embeddings))
+
+
+def test_cached_embedder_embeds_only_misses(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    inner = CountingEmbedder()
+    cached = CachedEmbedder(inner, EmbeddingCache(path), batch_size=2)
+
+    assert cached.embed(["a", "bb", "a", "ccc"]) == [
+        [1.0, 1.0],
+        [2.0, 1.0],
+        [1.0, 1.0],
+        [3.0, 1.0],
+    ]
+    assert inner.calls == [["a", "bb"], ["ccc"]]
+
+    again = CachedEmbedder(inner, EmbeddingCache(path))
+    assert again.embed(["bb", " a ", "dddd"])[1] == [1.0, 1.0]
+    assert inner.calls[-1] == ["dddd"]
+
+
+def test_handler_writes_batched_embeddings(monkeypatch, tmp_path):
+    collection = UpsertCollection()
+    client = types.SimpleNamespace(
+        get_or_create_collection=lambda name, **k: collection
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "chromadb",
+        types.SimpleNamespace(PersistentClient=lambda *a, **k: client),
+    )
+    from tino_storm.ingest import VaultIngestHandler
+
+    inner = CountingEmbedder()
+    handler = VaultIngestHandler(
+        str(tmp_path), chroma_path=str(tmp_path / "chroma"), embedder=inner
+    )
+    with handler.batch():
+        handler._ingest_text("first doc", "s1", "topic")
+        handler._ingest_text("second", "s2", "topic")
+
+    assert inner.calls == [["first doc", "second"]]
+    assert collection.writes == [(["first doc", "second"], [[9.0, 1.0], [6.0, 1.0]])]
+
+    # Same text from another source reuses the cached vector
+    handler._ingest_text("second", "s3", "topic")
+    assert len(inner.calls) == 1
+    assert collection.writes[-1] == (["second"], [[6.0, 1.0]])
+
+
+def test_chroma_backend_leaves_embedding_to_vector_store(monkeypatch, tmp_path):
+    collection = UpsertCollection()
+    client = types.SimpleNamespace(
+        get_or_create_collection=lambda name, **k: collection
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "chromadb",
+        types.SimpleNamespace(PersistentClient=lambda *a, **k: client),
+    )
+    from tino_storm.ingest import VaultIngestHandler
+
+    handler = VaultIngestHandler(
+        str(tmp_path), chroma_path=str(tmp_path / "chroma"), embedder="chroma"
+    )
+    handler._ingest_text("doc", "s", "topic")
+
+    assert handler.embedder is None
+    assert collection.writes == [(["doc"], None)]
+
+
+def test_search_embeds_query_with_ingest_backend(monkeypatch):
+    module = types.ModuleType("fake_embedders")
+    module.Embedder = CountingEmbedder
+    monkeypatch.setitem(sys.modules, "fake_embedders", module)
+    monkeypatch.setenv("STORM_INGEST_EMBEDDER", "fake_embedders:Embedder")
+    monkeypatch.setattr(embedding, "_QUERY_EMBEDDERS", {})
+    assert isinstance(create_embedder(), CountingEmbedder)
+
+    seen = {}
+
+    class Collection:
+        def query(self, n_results=0, **kwargs):
+            seen.update(kwargs)
+            return {"documents": [["doc"]], "metadatas": [[{"source": "s"}]]}
+
+    client = types.SimpleNamespace(get_or_create_collection=lambda name: Collection())
+    monkeypatch.setattr("chromadb.PersistentClient", lambda *a, **k: client)
+    monkeypatch.setattr(
+        "tino_storm.ingest.search.get_passphrase", lambda vault=None: None
+    )
+
+    results = search_vaults("query", ["v"])
+
+    assert seen == {"query_embeddings": [[5.0, 1.0]]}
+    assert results[0]["url"] == "s"
+
+
+class MetadataCollection(UpsertCollection):
+    def __init__(self, metadata=None):
+        super().__init__()
+        self.metadata = metadata
+
+    def modify(self, metadata=None):
+        self.metadata = metadata
+
+
+def _handler_for(monkeypatch, tmp_path, collection, embedder):
+    client = types.SimpleNamespace(
+        get_or_create_collection=lambda name, **k: collection
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "chromadb",
+        types.SimpleNamespace(PersistentClient=lambda *a, **k: client),
+    )
+    from tino_storm.ingest import VaultIngestHandler
+
+    return VaultIngestHandler(
+        str(tmp_path), chroma_path=str(tmp_path / "chroma"), embedder=embedder
+    )
+
+
+class WideEmbedder(CountingEmbedder):
+    name = "wide"
+
+    def embed(self, texts):
+        return [[1.0, 2.0, 3.0] for _ in texts]
+
+
+def test_collection_records_embedder_and_rejects_others(monkeypatch, tmp_path):
+    collection = MetadataCollection({"hnsw:space": "cosine"})
+    handler = _handler_for(monkeypatch, tmp_path, collection, CountingEmbedder())
+    handler._ingest_text("doc", "s", "topic")
+    assert collection.metadata == {
+        "tino_storm:embedder": "counting",
+        "tino_storm:dimension": 2,
+    }
+
+    other = _handler_for(monkeypatch, tmp_path, collection, WideEmbedder())
+    errors = []
+    monkeypatch.setattr(
+        "tino_storm.ingest.buffer.event_emitter.emit_sync",
+        lambda event: errors.append(event.information_table.get("error")),
+    )
+    other._ingest_text("another doc", "s2", "topic")
+    assert len(collection.writes) == 1
+    assert "was built with counting" in errors[0]
+    # The rejected chunk is not marked as stored
+    assert not other._in_flight
+
+
+class StoredCollection(MetadataCollection):
+    """A collection written before embedders were recorded."""
+
+    def __init__(self, vectors):
+        super().__init__()
+        self.vectors = vectors
+
+    def count(self):
+        return len(self.vectors)
+
+    def get(self, limit=None, include=None):
+        return {"embeddings": self.vectors[:limit]}
+
+
+def test_placeholder_collections_keep_placeholder_vectors(monkeypatch, tmp_path):
+    collection = StoredCollection([[0.0]])
+    handler = _handler_for(monkeypatch, tmp_path, collection, CountingEmbedder())
+
+    handler._ingest_text("doc", "s", "topic")
+    handler._ingest_text("more", "s2", "topic")
+
+    assert collection.writes == [(["doc"], [[0.0]]), (["more"], [[0.0]])]
+    assert collection.metadata == {
+        "tino_storm:embedder": "none",
+        "tino_storm:embedder_spec": "none",
+        "tino_storm:dimension": 1,
+    }
+
+
+def test_encrypted_vaults_store_no_plaintext_vectors_or_hashes(monkeypatch, tmp_path):
+    from tino_storm.security.encrypted_chroma import EncryptedCollection
+
+    stored = MetadataCollection()
+    stored.metadatas = []
+    upsert = stored.upsert
+
+    def record(documents=None, metadatas=None, ids=None, embeddings=None):
+        stored.metadatas.extend(metadatas)
+        upsert(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+
+    stored.upsert = record
+    collection = EncryptedCollection(stored, passphrase="secret")
+    inner = CountingEmbedder()
+    monkeypatch.setattr(
+        "tino_storm.ingest.watcher.get_passphrase", lambda vault=None: "secret"
+    )
+    monkeypatch.setattr(
+        "tino_storm.ingest.watcher.EncryptedChroma",
+        lambda *a, **k: types.SimpleNamespace(
+            get_or_create_collection=lambda name, **k: collection
+        ),
+    )
+    handler = _handler_for(monkeypatch, tmp_path, collection, inner)
+
+    handler._ingest_text("secret doc", "s", "topic")
+
+    assert inner.calls == []
+    [(documents, embeddings)] = stored.writes
+    assert documents != ["secret doc"]
+    assert embeddings == [[0.0]]
+    assert "content_hash" not in stored.metadatas[0]
+    assert stored.metadata["tino_storm:embedder"] == "none"
+
+
+def test_search_rebuilds_custom_embedders_from_their_spec(monkeypatch):
+    module = types.ModuleType("fake_embedders")
+    module.Embedder = CountingEmbedder
+    monkeypatch.setitem(sys.modules, "fake_embedders", module)
+    monkeypatch.setenv("STORM_INGEST_EMBEDDER", "none")
+    monkeypatch.setattr(embedding, "_QUERY_EMBEDDERS", {})
+
+    seen = []
+
+    class Collection:
+        def __init__(self, metadata):
+            self.metadata = metadata
+
+        def query(self, n_results=0, **kwargs):
+            seen.append(kwargs)
+            return {"documents": [["doc"]], "metadatas": [[{"source": "s"}]]}
+
+    collections = {
+        "custom": Collection(
+            {
+                "tino_storm:embedder": "counting",
+                "tino_storm:embedder_spec": "fake_embedders:Embedder",
+                "tino_storm:dimension": 2,
+            }
+        ),
+        # Recorded by an embedder object this process never registered
+        "unknown": Collection({"tino_storm:embedder": "someone-elses-model"}),
+    }
+    client = types.SimpleNamespace(get_or_create_collection=collections.__getitem__)
+    monkeypatch.setattr("chromadb.PersistentClient", lambda *a, **k: client)
+    monkeypatch.setattr(
+        "tino_storm.ingest.search.get_passphrase", lambda vault=None: None
+    )
+    errors = []
+    monkeypatch.setattr(
+        "tino_storm.ingest.search.event_emitter.emit_sync",
+        lambda event: errors.append(event.information_table),
+    )
+
+    search_vaults("query", ["custom", "unknown"])
+
+    assert seen == [{"query_embeddings": [[5.0, 1.0]]}, {"query_texts": ["query"]}]
+    assert errors == []
+
+
+def test_search_embeds_query_with_recorded_embedder(monkeypatch):
+    monkeypatch.setenv("STORM_INGEST_EMBEDDER", "none")
+    monkeypatch.setattr(embedding, "_QUERY_EMBEDDERS", {})
+    embedding.register_query_embedder(CountingEmbedder())
+
+    seen = []
+
+    class Collection:
+        def __init__(self, metadata):
+            self.metadata = metadata
+
+        def query(self, n_results=0, **kwargs):
+            seen.append(kwargs)
+            return {"documents": [["doc"]], "metadatas": [[{"source": "s"}]]}
+
+    collections = {
+        "counted": Collection(
+            {"tino_storm:embedder": "counting", "tino_storm:dimension": 2}
+        ),
+        "chroma": Collection({"tino_storm:embedder": "chroma"}),
+        "resized": Collection(
+            {"tino_storm:embedder": "counting", "tino_storm:dimension": 384}
+        ),
+    }
+    client = types.SimpleNamespace(get_or_create_collection=collections.__getitem__)
+    monkeypatch.setattr("chromadb.PersistentClient", lambda *a, **k: client)
+    monkeypatch.setattr(
+        "tino_storm.ingest.search.get_passphrase", lambda vault=None: None
+    )
+    errors = []
+    monkeypatch.setattr(
+        "tino_storm.ingest.search.event_emitter.emit_sync",
+        lambda event: errors.append(event.information_table),
+    )
+
+    search_vaults("query", ["counted", "chroma", "resized"])
+
+    assert seen == [
+        {"query_embeddings": [[5.0, 1.0]]},
+        {"query_texts": ["query"]},
+    ]
+    assert [e["vault"] for e in errors] == ["resized"]
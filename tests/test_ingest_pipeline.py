@@ -0,0 +1,193 @@
+import threading
+import time
+
+from tino_storm.events import ResearchAdded, event_emitter
+from tino_storm.ingest.pipeline import IngestPipeline
+from tino_storm.ingest.watcher import VaultIngestHandler
+
+
+def _handler(tmp_path, monkeypatch, fetch):
+    """Return a handler whose crawler fetches pages with ``fetch(url)``."""
+
+    root = tmp_path / "vault"
+    (root / "topic").mkdir(parents=True)
+    handler = VaultIngestHandler(str(root))
+    captured = []
+    lock = threading.Lock()
+
+    def fake_ingest(text, source, vault):
+        with lock:
+            captured.append((text, source, vault))
+
+    class DummyCrawler:
+        def fetch_html_many(self, urls):
+            return [{"url": url, "html": fetch(url)} for url in urls]
+
+    monkeypatch.setattr(handler, "_ingest_text", fake_ingest)
+    monkeypatch.setattr(
+        "tino_storm.ingest.watcher.WebCrawler", lambda *a, **k: DummyCrawler()
+    )
+    monkeypatch.setattr(
+        "tino_storm.ingest.watcher.trafilatura.extract", lambda html: html
+    )
+    return root / "topic", handler, captured
+
+
+def test_pipeline_fetches_manifests_concurrently(tmp_path, monkeypatch):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def slow_fetch(url):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return f"text for {url}"
+
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, slow_fetch)
+    urls = [f"http://example.com/{i}" for i in range(4)]
+    manifests = []
+    for i, url in enumerate(urls):
+        manifest = vault_dir / f"links{i}.urls"
+        manifest.write_text(url)
+        manifests.append(manifest)
+
+    with IngestPipeline(handler, fetch_workers=4) as pipeline:
+        for manifest in manifests:
+            pipeline.submit(manifest, "topic")
+        assert pipeline.drain(timeout=5)
+
+    assert sorted(source for _, source, _ in captured) == urls
+    assert max_active > 1
+    assert pipeline.stats()["fetch"]["processed"] == 4
+
+
+def test_slow_manifest_does_not_block_other_files(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    def blocking_fetch(url):
+        release.wait(5)
+        return "slow"
+
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, blocking_fetch)
+    manifest = vault_dir / "slow.urls"
+    manifest.write_text("http://slow.example.com")
+    note = vault_dir / "note.md"
+    note.write_text("fast note")
+
+    pipeline = IngestPipeline(handler, fetch_workers=2).start()
+    pipeline.submit(manifest, "topic")
+    pipeline.submit(note, "topic")
+
+    deadline = time.monotonic() + 2
+    while not captured and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert captured == [("fast note", str(note), "topic")]
+
+    release.set()
+    pipeline.shutdown()
+    assert ("slow", "http://slow.example.com", "topic") in captured
+
+
+def test_pipeline_reports_stage_errors(tmp_path, monkeypatch):
+    def failing_fetch(url):
+        raise RuntimeError("offline")
+
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, failing_fetch)
+    monkeypatch.setattr(event_emitter, "_subscribers", {})
+    events = []
+    event_emitter.subscribe(ResearchAdded, events.append)
+
+    manifest = vault_dir / "links.urls"
+    manifest.write_text("http://a")
+
+    with IngestPipeline(handler) as pipeline:
+        pipeline.submit(manifest, "topic")
+
+    assert captured == []
+    assert pipeline.stats()["fetch"]["errors"] == 1
+    assert events[0].topic == "topic"
+    assert events[0].information_table == {"error": "offline", "stage": "fetch"}
+
+
+def test_intake_errors_are_reported_for_the_vault(tmp_path, monkeypatch):
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, lambda url: url)
+    monkeypatch.setattr(event_emitter, "_subscribers", {})
+    events = []
+    event_emitter.subscribe(ResearchAdded, events.append)
+
+    def failing_plan(path, vault):
+        raise RuntimeError("unreadable")
+
+    monkeypatch.setattr(handler, "_plan_file", failing_plan)
+    note = vault_dir / "note.txt"
+    note.write_text("hello")
+
+    with IngestPipeline(handler) as pipeline:
+        pipeline.submit(note, "topic", skip_unchanged=True)
+
+    assert pipeline.stats()["intake"]["errors"] == 1
+    assert events[0].topic == "topic"
+    assert events[0].information_table == {"error": "unreadable", "stage": "intake"}
+
+
+def test_shutdown_without_drain_does_not_wait_for_full_queues(tmp_path, monkeypatch):
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, lambda url: url)
+    extracting = threading.Event()
+
+    def slow_extract(html):
+        extracting.set()
+        time.sleep(0.5)
+        return html
+
+    monkeypatch.setattr("tino_storm.ingest.watcher.trafilatura.extract", slow_extract)
+
+    pipeline = IngestPipeline(
+        handler, fetch_workers=1, extract_workers=1, max_queue=1
+    ).start()
+    for i in range(6):
+        manifest = vault_dir / f"links{i}.urls"
+        manifest.write_text(f"http://example.com/{i}")
+        pipeline.submit(manifest, "topic", timeout=2)
+    assert extracting.wait(2)
+
+    stopper = threading.Thread(target=pipeline.shutdown, kwargs={"drain": False})
+    start = time.monotonic()
+    stopper.start()
+    stopper.join(5)
+
+    assert not stopper.is_alive()
+    assert time.monotonic() - start < 1.5
+    assert len(captured) < 6
+    # Dropped files stay out of the manifest so reconciliation retries them
+    assert len(handler.manifest.paths()) == len(captured)
+
+
+def test_dispatch_hashes_files_on_the_intake_worker(tmp_path, monkeypatch):
+    vault_dir, handler, captured = _handler(tmp_path, monkeypatch, lambda url: url)
+    note = vault_dir / "note.txt"
+    note.write_text("hello")
+    from tino_storm.ingest import watcher
+
+    hashed_on = []
+    real_state = watcher.file_state
+
+    def recording_state(path):
+        hashed_on.append(threading.current_thread().name)
+        return real_state(path)
+
+    monkeypatch.setattr(watcher, "file_state", recording_state)
+
+    with IngestPipeline(handler) as pipeline:
+        handler.pipeline = pipeline
+        handler._dispatch(note)
+        assert pipeline.drain(timeout=5)
+        handler._dispatch(note)
+        assert pipeline.drain(timeout=5)
+
+    assert captured == [("hello", str(note), "topic")]
+    assert hashed_on and all(name.startswith("ingest-intake") for name in hashed_on)
@@ -0,0 +1,179 @@
+import os
+import sys
+import types
+
+from tino_storm.cli import main
+from tino_storm.ingest.reconcile import ReconcileReport, iter_vault_files, reconcile
+
+
+class Collection:
+    def __init__(self):
+        self.docs = []
+        self.deleted = []
+
+    def upsert(self, documents=None, metadatas=None, ids=None, embeddings=None):
+        self.docs.extend(documents)
+
+    def delete(self, ids=None):
+        self.deleted.extend(ids)
+
+
+def _install_chroma(monkeypatch):
+    collections = {}
+    client = types.SimpleNamespace(
+        get_or_create_collection=lambda name, **k: collections.setdefault(
+            name, Collection()
+        )
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "chromadb",
+        types.SimpleNamespace(PersistentClient=lambda *a, **k: client),
+    )
+    return collections
+
+
+def _tree(tmp_path):
+    root = tmp_path / "vaults"
+    (root / "science").mkdir(parents=True)
+    (root / "news" / "nested").mkdir(parents=True)
+    (root / "science" / "a.md").write_text("alpha")
+    (root / "news" / "nested" / "b.md").write_text("beta")
+    (root / "science" / ".hidden.md").write_text("skip")
+    (root / "loose.md").write_text("no vault")
+    return root
+
+
+def test_iter_vault_files_skips_hidden_and_root_files(tmp_path):
+    root = _tree(tmp_path)
+    assert [(p.name, v) for p, v in iter_vault_files(root)] == [
+        ("b.md", "news"),
+        ("a.md", "science"),
+    ]
+
+
+def test_reconcile_ingests_only_new_or_changed_files(monkeypatch, tmp_path):
+    collections = _install_chroma(monkeypatch)
+    from tino_storm.ingest import VaultIngestHandler
+
+    root = _tree(tmp_path)
+    handler = VaultIngestHandler(str(root), chroma_path=str(tmp_path / "chroma"))
+
+    first = reconcile(handler)
+    assert len(first.new) == 2 and first.changed == []
+    assert collections["science"].docs == ["alpha"]
+    assert collections["news"].docs == ["beta"]
+
+    second = reconcile(VaultIngestHandler(str(root), chroma_path=str(tmp_path / "c")))
+    assert second.ingested == 0 and second.unchanged == 2
+
+    note = root / "science" / "a.md"
+    st = note.stat()
+    os.utime(note, (st.st_atime, st.st_mtime + 10))
+    touched = reconcile(handler)
+    assert touched.ingested == 0 and touched.unchanged == 2
+
+    note.write_text("alpha v2")
+    (root / "news" / "nested" / "b.md").unlink()
+    changed = reconcile(handler)
+    assert changed.changed == [str(note.resolve())]
+    assert len(changed.removed) == 1
+    assert collections["science"].docs == ["alpha", "alpha v2"]
+    # The chunk of the previous version was deleted
+    assert len(collections["science"].deleted) == 1
+
+
+def test_watched_files_are_not_reingested_on_startup(monkeypatch, tmp_path):
+    _install_chroma(monkeypatch)
+    from tino_storm.ingest import VaultIngestHandler
+
+    root = _tree(tmp_path)
+    handler = VaultIngestHandler(str(root), chroma_path=str(tmp_path / "chroma"))
+    handler._handle_file(root / "science" / "a.md", "science")
+
+    report = reconcile(handler)
+    assert [os.path.basename(p) for p in report.new] == ["b.md"]
+
+
+def test_start_watcher_once_uses_pipeline(monkeypatch, tmp_path):
+    collections = _install_chroma(monkeypatch)
+    from tino_storm.ingest.watcher import start_watcher
+
+    root = _tree(tmp_path)
+    report = start_watcher(
+        str(root), chroma_path=str(tmp_path / "chroma"), workers=2, once=True
+    )
+
+    assert report.ingested == 2
+    assert collections["science"].docs == ["alpha"]
+    assert collections["news"].docs == ["beta"]
+
+
+def test_reconcile_hashes_each_file_once(monkeypatch, tmp_path):
+    _install_chroma(monkeypatch)
+    from tino_storm.ingest import VaultIngestHandler, reconcile as reconcile_mod
+    from tino_storm.ingest import watcher
+    from tino_storm.ingest.pipeline import IngestPipeline
+
+    hashed = []
+    real_state = reconcile_mod.file_state
+
+    def counting_state(path):
+        hashed.append(path.name)
+        return real_state(path)
+
+    monkeypatch.setattr(reconcile_mod, "file_state", counting_state)
+    monkeypatch.setattr(watcher, "file_state", counting_state)
+
+    root = _tree(tmp_path)
+    handler = VaultIngestHandler(str(root), chroma_path=str(tmp_path / "chroma"))
+    with IngestPipeline(handler) as pipeline:
+        report = reconcile(handler, pipeline)
+        pipeline.drain()
+
+    assert report.ingested == 2
+    assert sorted(hashed) == ["a.md", "b.md"]
+    assert len(handler.manifest.paths()) == 2
+
+
+def test_failed_write_is_retried_by_next_reconcile(monkeypatch, tmp_path):
+    collections = _install_chroma(monkeypatch)
+    from tino_storm.ingest import VaultIngestHandler
+    from tino_storm.ingest.pipeline import IngestPipeline
+
+    root = _tree(tmp_path)
+    handler = VaultIngestHandler(str(root), chroma_path=str(tmp_path / "chroma"))
+    science = handler.client.get_or_create_collection("science")._collection
+    write = science.upsert
+
+    def failing_upsert(**kwargs):
+        raise RuntimeError("disk full")
+
+    science.upsert = failing_upsert
+    with IngestPipeline(handler) as pipeline:
+        first = reconcile(handler, pipeline)
+        pipeline.drain()
+    assert first.ingested == 2
+    assert collections["news"].docs == ["beta"]
+    assert collections["science"].docs == []
+
+    science.upsert = write
+    with IngestPipeline(handler) as pipeline:
+        retry = reconcile(handler, pipeline)
+        pipeline.drain()
+    assert [os.path.basename(p) for p in retry.new] == ["a.md"]
+    assert collections["science"].docs == ["alpha"]
+
+
+def test_cli_ingest_once_prints_summary(monkeypatch, tmp_path, capsys):
+    captured = {}
+
+    def fake_start_watcher(**kwargs):
+        captured.update(kwargs)
+        return ReconcileReport(scanned=3, unchanged=1, new=["a"], changed=["b"])
+
+    monkeypatch.setattr("tino_storm.cli.start_watcher", fake_start_watcher)
+    main(["ingest", "--root", str(tmp_path), "--once"])
+
+    assert captured["once"] is True and captured["scan"] is True
+    assert "Ingested 1 new and 1 changed files (1 unchanged" in capsys.readouterr().out
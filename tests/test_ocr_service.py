@@ -0,0 +1,96 @@
+import httpx
+
+from tino_storm.ingestion import ocr
+from tino_storm.ingestion.ocr import OCRService, sniff_format
+from tino_storm.ingestion.utils import attach_image_text
+from tino_storm.sqlite_cache import SQLiteCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 2000
+JPEG = b"\xff\xd8\xff" + b"\1" * 2000
+
+
+def _images(monkeypatch, bodies):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, content=bodies[request.url.path.strip("/")])
+
+    recognized = []
+
+    def fake_ocr(data, max_pixels):
+        recognized.append(data)
+        return f"text {sniff_format(data)} {len(data)}"
+
+    monkeypatch.setattr(ocr, "ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_bytes", fake_ocr)
+    return httpx.MockTransport(handler), requested, recognized
+
+
+def test_sniff_format():
+    assert sniff_format(PNG) == "png"
+    assert sniff_format(JPEG) == "jpeg"
+    assert sniff_format(b"RIFF\0\0\0\0WEBPVP8 ") == "webp"
+    assert sniff_format(b"<html>") is None
+
+
+def test_ocr_many_filters_and_preserves_order(monkeypatch):
+    bodies = {
+        "a.png": PNG,
+        "b.jpg": JPEG,
+        "tiny.png": PNG[:100],
+        "page.html": b"<html>" + b" " * 2000,
+        "huge.png": PNG + b"\0" * 5000,
+    }
+    transport, requested, recognized = _images(monkeypatch, bodies)
+    service = OCRService(processes=1, max_bytes=4096, cache=None, transport=transport)
+
+    urls = [f"http://img.test/{name}" for name in bodies] + ["http://img.test/a.png"]
+    texts = service.ocr_many(urls)
+
+    assert texts == [
+        f"text png {len(PNG)}",
+        f"text jpeg {len(JPEG)}",
+        "",
+        "",
+        "",
+        f"text png {len(PNG)}",
+    ]
+    assert requested.count("http://img.test/a.png") == 1
+    assert len(recognized) == 2
+    assert service.skipped == 2
+
+
+def test_ocr_results_are_cached_by_content(monkeypatch, tmp_path):
+    transport, requested, recognized = _images(monkeypatch, {"a.png": PNG, "copy.png": PNG})
+    cache = SQLiteCache(tmp_path / "ocr.sqlite3", ttl=None)
+    service = OCRService(processes=1, cache=cache, transport=transport)
+
+    assert service.ocr_many(["http://img.test/a.png"]) == [f"text png {len(PNG)}"]
+    assert service.ocr("http://img.test/copy.png") == f"text png {len(PNG)}"
+    assert len(recognized) == 1
+    assert cache.hits == 1
+
+
+def test_ocr_skips_downloads_without_tesseract(monkeypatch):
+    transport, requested, _ = _images(monkeypatch, {"a.png": PNG})
+    monkeypatch.setattr(ocr, "ocr_available", lambda: False)
+    service = OCRService(processes=1, cache=None, transport=transport)
+
+    assert service.ocr_many(["http://img.test/a.png"]) == [""]
+    assert requested == []
+
+
+def test_attach_image_text_batches_all_records(monkeypatch):
+    batches = []
+
+    def fake_ocr_images(urls):
+        batches.append(list(urls))
+        return ["one", "", "three"]
+
+    monkeypatch.setattr("tino_storm.ingestion.utils.ocr_images", fake_ocr_images)
+    records = [{"id": 1}, {"id": 2}, {"id": 3}]
+    attach_image_text(records, [["u1", "u2"], [], ["u3"]])
+
+    assert batches == [["u1", "u2", "u3"]]
+    assert [r["images_text"] for r in records] == [["one"], [], ["three"]]
@@ -0,0 +1,87 @@
+import io
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from tino_storm.ingestion import pdf
+from tino_storm.ingestion.pdf import PDFExtractor
+
+
+def _fake_reader(monkeypatch, count, extracted):
+    class Page:
+        def __init__(self, number):
+            self.number = number
+
+        def extract_text(self):
+            extracted.append(self.number)
+            return f"page {self.number}"
+
+    class Reader:
+        def __init__(self, source):
+            self.pages = [Page(i) for i in range(count)]
+
+    monkeypatch.setattr(pdf, "pdf_reader_class", lambda: Reader)
+
+
+def test_iter_pages_yields_incrementally_and_caps_pages(monkeypatch):
+    extracted = []
+    _fake_reader(monkeypatch, 10, extracted)
+    extractor = PDFExtractor(max_pages=4, processes=1)
+
+    pages = extractor.iter_pages(io.BytesIO(b"%PDF"))
+    assert next(pages) == "page 0"
+    assert extracted == [0]
+    assert list(pages) == ["page 1", "page 2", "page 3"]
+
+
+def test_iter_pages_uses_pool_for_long_documents(monkeypatch):
+    extracted = []
+    _fake_reader(monkeypatch, 9, extracted)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(PDFExtractor, "_pool", lambda self: pool)
+    ranges = []
+    real_extract = pdf._extract_range
+
+    def extract_range(path, start, stop):
+        ranges.append((start, stop))
+        return real_extract(path, start, stop)
+
+    monkeypatch.setattr(pdf, "_extract_range", extract_range)
+    extractor = PDFExtractor(max_pages=0, processes=2, parallel_pages=4)
+
+    assert list(extractor.iter_pages(io.BytesIO(b"%PDF"))) == [
+        f"page {i}" for i in range(9)
+    ]
+    assert len(ranges) > 1
+    pool.shutdown()
+
+
+def test_iter_pages_falls_back_inline_when_pool_fails(monkeypatch):
+    _fake_reader(monkeypatch, 6, [])
+
+    def broken(*a, **k):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(PDFExtractor, "_pool", broken)
+    extractor = PDFExtractor(processes=2, parallel_pages=2)
+
+    assert list(extractor.iter_pages(io.BytesIO(b"%PDF"))) == [
+        f"page {i}" for i in range(6)
+    ]
+
+
+def test_download_streams_and_enforces_size_cap(monkeypatch):
+    def fake_get(url, **kwargs):
+        assert kwargs.get("stream") is True
+        body = [b"x" * 40] * (5 if url.endswith("big.pdf") else 2)
+        return types.SimpleNamespace(
+            raise_for_status=lambda: None,
+            iter_content=lambda chunk_size: iter(body),
+        )
+
+    monkeypatch.setattr("requests.get", fake_get, raising=False)
+    extractor = PDFExtractor(max_bytes=100)
+
+    spool = extractor.download("http://arxiv.test/small.pdf")
+    assert spool.read() == b"x" * 80
+    spool.close()
+    assert extractor.download("http://arxiv.test/big.pdf") is None
@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tino_storm.providers import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+    Provider,
+    ProviderAggregator,
+    get_provider_limiter,
+    provider_limiter_stats,
+)
+from tino_storm.providers.concurrency import (
+    reset_provider_limiters,
+    set_provider_limiter,
+)
+from tino_storm.search_result import ResearchResult
+
+
+def setup_function(_):
+    reset_provider_limiters()
+
+
+def teardown_function(_):
+    reset_provider_limiters()
+
+
+def test_limiter_grows_on_success_and_backs_off_on_timeout():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=4, max_limit=8)
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release()
+        limiter.record(0.01)
+    assert limiter.limit > 4
+    grown = limiter.limit
+
+    limiter.record(1.0, dropped=True)
+    assert limiter.limit < grown
+    assert limiter.snapshot()["congestion_events"] == 1
+
+
+def test_limiter_treats_latency_spike_as_congestion():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=10, latency_floor=0.0)
+    limiter.record(0.1)
+    limiter.record(0.5)
+
+    assert limiter.limit < 10
+
+
+def test_limiter_baseline_forgets_old_fast_calls():
+    limiter = AdaptiveConcurrencyLimiter(
+        "p", initial_limit=8, latency_floor=0.0, latency_window=10
+    )
+    limiter.record(0.002)
+    for _ in range(200):
+        limiter.record(0.3)
+
+    snapshot = limiter.snapshot()
+    assert snapshot["min_latency"] == 0.3
+    assert snapshot["congestion_events"] == 9
+    assert limiter.limit > limiter.min_limit
+
+
+def test_limiter_ignores_failed_calls():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=4, latency_floor=0.0)
+
+    for _ in range(5):
+        with pytest.raises(NotImplementedError):
+            with limiter.limit_sync():
+                raise NotImplementedError
+    with limiter.limit_sync():
+        pass
+
+    snapshot = limiter.snapshot()
+    assert snapshot["completed"] == 1
+    assert snapshot["in_flight"] == 0
+
+
+def test_limiter_sheds_when_queue_full():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=1, max_queue=0)
+    limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        limiter.acquire()
+    assert limiter.snapshot()["shed"] == 1
+
+
+def test_limiter_sheds_after_queue_timeout():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=1)
+    limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        limiter.acquire(timeout=0.01)
+    assert limiter.queue_length == 0
+
+
+def test_limiter_hands_slot_to_waiting_thread():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def waiter():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.02)
+    assert limiter.snapshot()["queued"] == 1
+    assert not acquired.is_set()
+
+    limiter.release()
+    thread.join(1)
+    assert acquired.is_set()
+    assert limiter.in_flight == 1
+
+
+def test_async_waiters_are_woken_in_order():
+    limiter = AdaptiveConcurrencyLimiter("p", initial_limit=1)
+    order = []
+
+    async def worker(i):
+        async with limiter.limit_async():
+            order.append(i)
+            await asyncio.sleep(0.001)
+
+    async def run():
+        await asyncio.gather(*(worker(i) for i in range(4)))
+
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3]
+    assert limiter.in_flight == 0
+
+
+def test_limiter_is_shared_across_aggregators():
+    current = 0
+    peak = 0
+
+    class SlowProvider(Provider):
+        name = "shared"
+
+        async def search_async(self, query, vaults, **kwargs):
+            nonlocal current, peak
+            current += 1
+            peak = max(peak, current)
+            await asyncio.sleep(0.01)
+            current -= 1
+            return [ResearchResult(url=f"u-{query}", snippets=[], meta={})]
+
+        def search_sync(self, query, vaults, **kwargs):  # pragma: no cover
+            raise NotImplementedError
+
+    set_provider_limiter(
+        "shared", AdaptiveConcurrencyLimiter("shared", initial_limit=2, max_limit=2)
+    )
+    aggregators = [ProviderAggregator([SlowProvider()]) for _ in range(6)]
+
+    async def run():
+        return await asyncio.gather(
+            *(agg.search_async(str(i), []) for i, agg in enumerate(aggregators))
+        )
+
+    results = asyncio.run(run())
+    assert all(len(r) == 1 for r in results)
+    assert peak == 2
+    stats = provider_limiter_stats()["shared"]
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+def test_get_provider_limiter_uses_provider_name():
+    class Named(Provider):
+        name = "named"
+
+        def search_sync(self, query, vaults, **kwargs):  # pragma: no cover
+            return []
+
+    assert get_provider_limiter(Named()) is get_provider_limiter("named")
@@ -1,5 +1,6 @@
-from types import SimpleNamespace
+from types import ModuleType, SimpleNamespace
 import logging
+import sys
 
 from tino_storm.providers import Provider
 from tino_storm.providers.registry import ProviderRegistry
@@ -39,9 +40,97 @@ def test_logs_warning_for_faulty_entry_point(monkeypatch, caplog):
 
     monkeypatch.setattr("tino_storm.providers.registry.entry_points", fake_entry_points)
 
+    registry = ProviderRegistry()
     with caplog.at_level(logging.WARNING):
-        registry = ProviderRegistry()
+        assert "bad" not in registry.available()
 
     assert "bad" in caplog.text
     assert "boom" in caplog.text
-    assert "bad" not in registry.available()
+    assert "bad" not in registry.names()
+
+
+def test_entry_points_are_loaded_on_demand(monkeypatch):
+    loads = []
+
+    def load():
+        loads.append("dummy")
+        return DummyProvider
+
+    dummy_ep = SimpleNamespace(name="dummy", load=load)
+    discovered = []
+
+    def fake_entry_points(*, group):
+        discovered.append(group)
+        return [dummy_ep]
+
+    monkeypatch.setattr("tino_storm.providers.registry.entry_points", fake_entry_points)
+    registry = ProviderRegistry()
+    assert discovered == []
+
+    assert registry.names() == ["dummy"]
+    assert loads == []
+    assert not registry.is_loaded("dummy")
+
+    provider = registry.get("dummy")
+    assert registry.get("dummy") is provider
+    assert loads == ["dummy"]
+    assert discovered == ["tino_storm.providers"]
+
+
+def test_explicit_registration_wins_over_entry_point(monkeypatch):
+    dummy_ep = SimpleNamespace(name="dummy", load=lambda: DummyProvider)
+    monkeypatch.setattr(
+        "tino_storm.providers.registry.entry_points", lambda *, group: [dummy_ep]
+    )
+
+    class Explicit(DummyProvider):
+        pass
+
+    registry = ProviderRegistry()
+    registry.register("dummy", Explicit)
+    assert isinstance(registry.get("dummy"), Explicit)
+
+
+def test_register_returns_the_registered_instance():
+    registry = ProviderRegistry()
+    provider = registry.register("dummy", DummyProvider)
+    assert isinstance(provider, DummyProvider)
+    assert registry.is_loaded("dummy")
+    assert registry.get("dummy") is provider
+
+
+def test_clear_rediscovers_entry_points(monkeypatch):
+    dummy_ep = SimpleNamespace(name="dummy", load=lambda: DummyProvider)
+    monkeypatch.setattr(
+        "tino_storm.providers.registry.entry_points", lambda *, group: [dummy_ep]
+    )
+
+    registry = ProviderRegistry()
+    registry.clear()
+    assert isinstance(registry.get("dummy"), DummyProvider)
+
+
+def test_lazy_module_registering_itself_is_built_once(monkeypatch):
+    registry = ProviderRegistry()
+    built = []
+
+    class SelfRegistering(DummyProvider):
+        def __init__(self):
+            built.append(self)
+
+    module = ModuleType("fake_self_registering")
+    module.SelfRegistering = SelfRegistering
+
+    def import_module(name):
+        # What ``@register_provider`` does when the module is imported
+        registry.register("self", SelfRegistering)
+        return module
+
+    monkeypatch.setitem(sys.modules, "fake_self_registering", module)
+    monkeypatch.setattr(
+        "tino_storm.providers.registry.importlib.import_module", import_module
+    )
+    registry.register_lazy("self", "fake_self_registering:SelfRegistering")
+
+    assert registry.get("self") is built[0]
+    assert len(built) == 1
@@ -23,7 +23,7 @@ def test_bing_error_emits_event(monkeypatch):
         def __call__(self, query):
             raise RuntimeError("boom")
 
-    monkeypatch.setattr("tino_storm.providers.base.BingSearch", DummyBing)
+    monkeypatch.setattr("tino_storm.core.rm.BingSearch", DummyBing)
 
     provider = DefaultProvider()
     result = provider.search_sync("topic", [])
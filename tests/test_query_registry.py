@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tino_storm.core.interface import Information
+from tino_storm.core.query_registry import QueryRegistry
+
+
+class FakeRetriever:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def retrieve(self, queries, exclude_urls=()):
+        with self._lock:
+            self.calls.append(sorted(queries))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [
+            Information(
+                url=f"http://{q}",
+                description="",
+                snippets=[q],
+                title=q,
+                meta={"query": q},
+            )
+            for q in queries
+        ]
+
+
+def test_concurrent_identical_queries_are_retrieved_once():
+    retriever = FakeRetriever(delay=0.2)
+    registry = QueryRegistry()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(
+            pool.map(
+                lambda q: registry.retrieve(retriever, [q], exclude_urls=["gt"]),
+                ["history of storm", "History of STORM?", "history of storm ", "storm"],
+            )
+        )
+
+    # Whichever spelling arrives first is retrieved on behalf of the others
+    assert len(retriever.calls) == 2
+    assert [r[0].meta["query"] for r in results] == [
+        "history of storm",
+        "History of STORM?",
+        "history of storm ",
+        "storm",
+    ]
+    stats = registry.stats()
+    assert stats["requested"] == 4 and stats["retrieved"] == 2
+    assert stats["saved"] == 2
+
+
+def test_repeated_queries_get_independent_copies():
+    retriever = FakeRetriever()
+    registry = QueryRegistry()
+
+    first = registry.retrieve(retriever, ["a", "b"], exclude_urls=[])
+    first[0].snippets.append("merged")
+    second = registry.retrieve(retriever, ["A", "c"], exclude_urls=[])
+
+    assert second[0].snippets == ["a"]
+    assert retriever.calls == [["a", "b"], ["c"]]
+    assert registry.stats()["cache_hits"] == 1
+    # A different exclusion list is a different retrieval
+    registry.retrieve(retriever, ["a"], exclude_urls=["http://a"])
+    assert retriever.calls[-1] == ["a"]
+
+
+def test_failed_retrievals_are_not_remembered():
+    retriever = FakeRetriever(fail=True)
+    registry = QueryRegistry()
+
+    with pytest.raises(RuntimeError):
+        registry.retrieve(retriever, ["a"], exclude_urls=[])
+    retriever.fail = False
+
+    assert registry.retrieve(retriever, ["a"], exclude_urls=[])[0].url == "http://a"
+    assert len(retriever.calls) == 2
+
+
+def test_empty_results_are_not_remembered():
+    retriever = FakeRetriever()
+    registry = QueryRegistry()
+    retriever.retrieve = lambda queries, exclude_urls=(): []
+
+    assert registry.retrieve(retriever, ["a"], exclude_urls=[]) == []
+    del retriever.retrieve
+
+    assert registry.retrieve(retriever, ["a"], exclude_urls=[])[0].url == "http://a"
+    assert registry.stats()["cache_hits"] == 0
@@ -0,0 +1,115 @@
+import asyncio
+import gc
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tino_storm.ratelimit import (
+    HostPolicy,
+    RateLimiter,
+    RateLimitTimeout,
+    bind_flow,
+    current_flow,
+    fetch_flow,
+    parse_host_limits,
+)
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    limiter = RateLimiter(HostPolicy(20, 2))
+    start = time.monotonic()
+    waits = [limiter.acquire("http://a.test/x") for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert time.monotonic() - start >= 0.09
+    stats = limiter.stats()["a.test"]
+    assert stats["requests"] == 4 and stats["delayed"] == 2
+    assert stats["max_wait"] > 0
+
+
+def test_hosts_are_limited_independently():
+    limiter = RateLimiter(HostPolicy(1, 1))
+    start = time.monotonic()
+    for host in ("a.test", "b.test", "c.test"):
+        limiter.acquire(f"https://{host}/")
+    assert time.monotonic() - start < 0.1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"], scope="module")
+async def test_waiting_flows_are_served_round_robin(anyio_backend):
+    limiter = RateLimiter(HostPolicy(100, 1))
+    order = []
+
+    async def fetch(flow, i):
+        await limiter.acquire_async("http://a.test/", flow=flow)
+        order.append((flow, i))
+
+    # A GC pass between the enqueues would let the dispatcher serve a bulk
+    # request before the small flow has queued
+    gc.disable()
+    try:
+        tasks = [asyncio.create_task(fetch("bulk", i)) for i in range(6)]
+        tasks.append(asyncio.create_task(fetch("small", 0)))
+        await asyncio.sleep(0)
+    finally:
+        gc.enable()
+    await asyncio.gather(*tasks)
+
+    assert order.index(("small", 0)) <= 2
+
+
+def test_zero_rate_disables_limiting():
+    limiter = RateLimiter(HostPolicy(0, 1))
+    assert [limiter.acquire("http://a.test/") for _ in range(50)] == [0.0] * 50
+
+
+def test_host_policies_match_subdomains():
+    hosts = parse_host_limits("example.com=0.5:3, bad=, arxiv.org=2")
+    limiter = RateLimiter(HostPolicy(5, 10), hosts)
+
+    assert hosts["arxiv.org"] == HostPolicy(2.0, 1)
+    assert "bad" not in hosts
+    assert limiter.policy_for("api.example.com") == HostPolicy(0.5, 3)
+    assert limiter.policy_for("other.test") == HostPolicy(5, 10)
+
+
+def test_bind_flow_carries_the_flow_into_threads():
+    with fetch_flow("run-1"):
+        task = bind_flow(current_flow)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(task).result() == "run-1"
+        assert pool.submit(current_flow).result() == "default"
+
+
+def test_idle_buckets_are_evicted_and_dispatch_skips_them(monkeypatch):
+    monkeypatch.setattr("tino_storm.ratelimit._SWEEP_MIN", 4)
+    limiter = RateLimiter(HostPolicy(20, 1))
+    for host in ("busy", "idle0", "idle1", "idle2"):
+        limiter.acquire(f"http://{host}.test/")
+    # The second request waits for a token; once served it leaves the dispatcher
+    assert limiter.acquire("http://busy.test/") > 0
+    assert limiter._waiting == {}
+
+    time.sleep(0.1)
+    limiter.acquire("http://busy.test/")
+    limiter.acquire("http://new.test/")
+
+    # Only the buckets that refilled untouched were dropped
+    assert set(limiter.stats()) == {"busy.test", "new.test"}
+
+
+def test_waits_longer_than_max_wait_time_out():
+    limiter = RateLimiter(HostPolicy(0.5, 1), max_wait=0.05)
+    limiter.acquire("http://slow.test/")
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("http://slow.test/")
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(limiter.acquire_async("http://slow.test/"))
+    # Timed-out requests leave the queue
+    assert limiter._waiting == {}
+    assert limiter.stats()["slow.test"]["queued"] == 0
+    # A per-call timeout overrides max_wait
+    assert limiter.acquire("http://slow.test/", timeout=5) > 1
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tino_storm.core.interface import _POOL_HEADROOM, Retriever
+
+
+def _result(q):
+    return [
+        {
+            "url": f"http://{q}",
+            "description": "",
+            "snippets": [f"{q} [1]"],
+            "title": q,
+        }
+    ]
+
+
+class SlowRM:
+    def __init__(self, hang=()):
+        self.hang = set(hang)
+        self.threads = set()
+        self.release = threading.Event()
+
+    def __call__(self, query_or_queries, exclude_urls=()):
+        (q,) = query_or_queries
+        self.threads.add(threading.current_thread().name)
+        if q in self.hang:
+            self.release.wait(5)
+        return _result(q)
+
+
+class AsyncRM(SlowRM):
+    def __init__(self, hang=()):
+        super().__init__(hang)
+        self.async_calls = []
+
+    async def aforward(self, query_or_queries, exclude_urls=()):
+        (q,) = query_or_queries
+        self.async_calls.append(q)
+        if q in self.hang:
+            await asyncio.sleep(5)
+        return _result(q)
+
+
+def test_executor_is_reused_across_calls_until_closed():
+    retriever = Retriever(SlowRM(), max_thread=2)
+
+    first = retriever.retrieve(["a", "b"])
+    pool = retriever._executor
+    second = retriever.retrieve(["c"])
+
+    assert retriever._executor is pool
+    assert [info.meta["query"] for info in first + second] == ["a", "b", "c"]
+    assert first[0].snippets[0].strip() == "a"
+    assert all(name.startswith("storm-retriever") for name in retriever.rm.threads)
+
+    retriever.close()
+    assert retriever._executor is None
+    # A closed retriever starts a fresh pool on demand
+    assert retriever.retrieve("d")[0].url == "http://d"
+    retriever.close()
+
+
+def test_deadline_skips_hung_queries():
+    rm = SlowRM(hang={"slow"})
+    retriever = Retriever(rm, max_thread=3, timeout=0.2)
+
+    start = time.monotonic()
+    results = retriever.retrieve(["fast", "slow", "other"])
+
+    assert time.monotonic() - start < 2
+    assert [info.meta["query"] for info in results] == ["fast", "other"]
+    # A per-call deadline overrides the retriever's default
+    rm.release.set()
+    assert len(retriever.retrieve(["slow"], timeout=5)) == 1
+    retriever.close()
+
+
+def test_concurrent_callers_do_not_eat_each_others_deadline():
+    class SleepyRM:
+        def __call__(self, query_or_queries, exclude_urls=()):
+            time.sleep(0.3)
+            return _result(query_or_queries[0])
+
+    retriever = Retriever(SleepyRM(), max_thread=3, timeout=0.5)
+
+    with ThreadPoolExecutor(max_workers=3) as personas:
+        results = list(
+            personas.map(
+                lambda p: retriever.retrieve([f"{p}-{i}" for i in range(3)]),
+                range(3),
+            )
+        )
+
+    assert [len(r) for r in results] == [3, 3, 3]
+    retriever.close()
+
+
+def test_hung_queries_do_not_take_over_the_pool():
+    rm = SlowRM(hang={"slow"})
+    retriever = Retriever(rm, max_thread=1, timeout=0.1)
+
+    for _ in range(3):
+        assert retriever.retrieve(["slow"]) == []
+    # Every worker handed to a hung backend so far is still blocked
+    assert [info.url for info in retriever.retrieve(["fast"])] == ["http://fast"]
+    rm.release.set()
+    retriever.close()
+
+
+def test_queries_run_once_hung_queries_fill_the_pool():
+    rm = SlowRM(hang={"slow"})
+    retriever = Retriever(rm, max_thread=1, timeout=0.1)
+
+    for _ in range(_POOL_HEADROOM + 1):
+        assert retriever.retrieve(["slow"]) == []
+    assert retriever._busy == _POOL_HEADROOM
+
+    start = time.monotonic()
+    assert [info.url for info in retriever.retrieve(["fast"])] == ["http://fast"]
+    assert asyncio.run(retriever.retrieve_async(["async"]))[0].url == "http://async"
+    assert time.monotonic() - start < 2
+    rm.release.set()
+    retriever.close()
+
+
+def test_retrieve_async_awaits_native_coroutines():
+    rm = AsyncRM(hang={"slow"})
+    retriever = Retriever(rm, max_thread=2)
+
+    results = asyncio.run(retriever.retrieve_async(["a", "slow", "b"], timeout=0.2))
+
+    assert [info.meta["query"] for info in results] == ["a", "b"]
+    assert rm.async_calls == ["a", "slow", "b"]
+    assert rm.threads == set()
+    assert retriever._executor is None
+
+
+def test_retrieve_async_runs_sync_rms_on_the_pool():
+    rm = SlowRM()
+    retriever = Retriever(rm, max_thread=2)
+
+    results = asyncio.run(retriever.retrieve_async(["a", "b"]))
+
+    assert [info.url for info in results] == ["http://a", "http://b"]
+    assert all(name.startswith("storm-retriever") for name in rm.threads)
+    retriever.close()
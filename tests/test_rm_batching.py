@@ -0,0 +1,82 @@
+import threading
+
+import requests
+
+from tino_storm.core.rm import BingSearch, SerperRM, map_queries
+
+
+class _Resp:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_map_queries_runs_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def search(query):
+        barrier.wait()
+        if query == "bad":
+            raise ValueError(query)
+        return query.upper()
+
+    results = map_queries(search, ["a", "bad", "c"])
+
+    assert [(q, r) for q, r, _ in results] == [("a", "A"), ("bad", None), ("c", "C")]
+    assert isinstance(results[1][2], ValueError)
+
+
+def test_bing_dedupes_urls_and_fetches_pages_once(monkeypatch):
+    def fake_get(self, url, params=None, **kwargs):
+        q = params["q"]
+        return _Resp(
+            {
+                "webPages": {
+                    "value": [
+                        {"url": "http://shared", "name": "S", "snippet": q},
+                        {"url": f"http://{q}", "name": q, "snippet": q},
+                    ]
+                }
+            }
+        )
+
+    calls = []
+
+    def urls_to_snippets(self, urls):
+        calls.append(list(urls))
+        return {u: {"snippets": [u]} for u in urls}
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    monkeypatch.setattr(
+        "tino_storm.core.rm.WebPageHelper.urls_to_snippets", urls_to_snippets
+    )
+
+    results = BingSearch(bing_search_api_key="fake").forward(["a", "b"])
+
+    assert calls == [["http://shared", "http://a", "http://b"]]
+    assert [r["url"] for r in results] == ["http://shared", "http://a", "http://b"]
+    # Results name the queries that returned them, for CachedRM
+    assert [r["queries"] for r in results] == [["a", "b"], ["a"], ["b"]]
+
+
+def test_serper_queries_do_not_share_params(monkeypatch):
+    def fake_post(self, url, json=None, **kwargs):
+        q = json["q"]
+        return _Resp({"organic": [{"link": f"http://{q}", "snippet": q}]})
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    monkeypatch.setattr(
+        "tino_storm.core.rm.WebPageHelper.urls_to_snippets",
+        lambda self, urls: {u: {"snippets": ["page " + u]} for u in urls},
+    )
+
+    rm = SerperRM(serper_search_api_key="fake", ENABLE_EXTRA_SNIPPET_EXTRACTION=True)
+    results = rm.forward(["a", "b", "a"], exclude_urls=[])
+
+    assert [r["snippets"] for r in results] == [
+        ["a", "page http://a"],
+        ["b", "page http://b"],
+    ]
+    assert "q" not in rm.query_params
@@ -0,0 +1,103 @@
+import pytest
+
+from tino_storm.core.rm_cache import CachedRM, normalize_query
+from tino_storm.sqlite_cache import SQLiteCache
+
+
+class FakeRM:
+    k = 3
+
+    def __init__(self):
+        self.calls = []
+        self.usage = 0
+
+    def __call__(self, query_or_queries, exclude_urls=()):
+        self.calls.append(list(query_or_queries))
+        self.usage += len(query_or_queries)
+        return [
+            {"url": f"http://{q}", "snippets": [q], "title": q, "description": ""}
+            for q in query_or_queries
+        ]
+
+    def get_usage_and_reset(self):
+        usage, self.usage = self.usage, 0
+        return {"FakeRM": usage}
+
+
+def test_normalize_query():
+    assert normalize_query("  What is   STORM? ") == "what is storm"
+
+
+def test_repeated_queries_are_served_across_runs(tmp_path):
+    path = tmp_path / "retrieval.sqlite3"
+    rm = FakeRM()
+    cached = CachedRM(rm, cache=SQLiteCache(path))
+
+    first = cached(["storm", "Storm?"], exclude_urls=[])
+    assert first == [
+        {"url": "http://storm", "snippets": ["storm"], "title": "storm", "description": ""}
+    ]
+    # A new wrapper over the same file stands in for a later run
+    later = CachedRM(rm, cache=SQLiteCache(path))
+    assert later("STORM ", exclude_urls=[]) == first
+    assert later("storm", exclude_urls=["http://x"])[0]["url"] == "http://storm"
+
+    assert rm.calls == [["storm"], ["storm"]]
+    assert later.get_usage_and_reset() == {"FakeRM": 2, "FakeRM (cache hits)": 1}
+    assert later.get_usage_and_reset() == {"FakeRM": 0, "FakeRM (cache hits)": 0}
+
+
+def test_empty_results_and_errors_are_not_cached(tmp_path):
+    class FlakyRM(FakeRM):
+        def __call__(self, query_or_queries, exclude_urls=()):
+            self.calls.append(list(query_or_queries))
+            if query_or_queries == ["boom"]:
+                raise RuntimeError("boom")
+            return []
+
+    rm = FlakyRM()
+    cached = CachedRM(rm, cache=SQLiteCache(tmp_path / "r.sqlite3"))
+
+    assert cached("empty") == [] and cached("empty") == []
+    with pytest.raises(RuntimeError):
+        cached("boom")
+    assert rm.calls == [["empty"], ["empty"], ["boom"]]
+
+
+def test_misses_are_forwarded_together_and_split_by_query(tmp_path):
+    class MergingRM(FakeRM):
+        def __call__(self, query_or_queries, exclude_urls=()):
+            results = super().__call__(query_or_queries, exclude_urls)
+            for result, query in zip(results, query_or_queries):
+                result["queries"] = [query]
+            # Both queries return the shared page, which is listed once
+            shared = {"url": "http://shared", "snippets": [], "title": "s"}
+            shared.update(description="", queries=list(query_or_queries))
+            return [shared] + results
+
+    rm = MergingRM()
+    cached = CachedRM(rm, cache=SQLiteCache(tmp_path / "r.sqlite3"))
+
+    first = cached(["a", "b"])
+    assert rm.calls == [["a", "b"]]
+    assert [r["url"] for r in first] == ["http://shared", "http://a", "http://b"]
+
+    # Each query was cached on its own; the shared page is still returned once
+    assert [r["url"] for r in cached(["b", "c", "a"])] == [
+        "http://shared",
+        "http://b",
+        "http://c",
+        "http://a",
+    ]
+    assert rm.calls[-1] == ["c"]
+
+
+def test_k_is_read_from_the_wrapped_rm(tmp_path):
+    rm = FakeRM()
+    cached = CachedRM(rm, cache=SQLiteCache(tmp_path / "r.sqlite3"))
+
+    cached("storm")
+    rm.k = 10
+    cached("storm")
+
+    assert rm.calls == [["storm"], ["storm"]]
@@ -41,7 +41,7 @@ def test_bing_timeout_emits_event(monkeypatch):
     def mock_get(*a, **k):
         raise requests.Timeout("boom")
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     rm = BingSearch(bing_search_api_key="fake")
 
@@ -63,7 +63,7 @@ def _mock_bing_success(monkeypatch, timeout_holder):
 
         return _Resp()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     monkeypatch.setattr(
         "tino_storm.core.rm.WebPageHelper.urls_to_snippets",
         lambda self, urls: {},
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from tino_storm.retrieval import rank_by_similarity
+from tino_storm.retrieval.similarity import (
+    EmbeddingScorer,
+    bm25_scores,
+    similarity_scorer,
+)
+
+
+def test_bm25_prefers_documents_sharing_rare_terms():
+    docs = [
+        "The weather today is mild.",
+        "Hurricane formation requires warm ocean water.",
+        "",
+        "Warm water and low wind shear drive hurricane formation over the ocean.",
+    ]
+    scores = bm25_scores("How do hurricanes and hurricane formation work?", docs)
+
+    assert scores.shape == (4,)
+    assert scores[2] == 0 and scores[0] == 0
+    assert scores[1] > 0 and scores[3] > 0
+    assert bm25_scores("", docs).tolist() == [0.0] * 4
+
+
+def test_rank_by_similarity_is_stable_for_ties():
+    items = ["a", "b", "c"]
+    ranked = rank_by_similarity("storm", items, ["x", "storm surge", "y"])
+    assert ranked == ["b", "a", "c"]
+    assert rank_by_similarity("storm", [], []) == []
+
+
+def test_embedding_scorer_reuses_vectors():
+    calls = []
+
+    class Embedder:
+        name = "fake"
+
+        def embed(self, texts):
+            calls.append(list(texts))
+            return [[len(t), 1.0] for t in texts]
+
+    scorer = EmbeddingScorer(Embedder())
+    first = scorer("abc", ["abc", "a"])
+    second = scorer("abc", ["a", "abcd"])
+
+    assert np.isclose(first[0], 1.0) and first[0] > first[1]
+    assert calls == [["abc", "a"], ["abcd"]]
+    assert second.shape == (2,)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        similarity_scorer("tfidf")
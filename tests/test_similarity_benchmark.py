@@ -0,0 +1,75 @@
+"""Micro-benchmark for ranking one conversation turn's search results.
+
+A turn ranks up to ``max_search_queries * search_top_k`` results by the
+similarity of their first snippet (up to ``snippet_chunk_size`` characters) to
+the question. Run this file directly to print the per-turn cost of every
+backend.
+
+Wall-clock limits depend on the machine, so the absolute budget is only
+checked when ``STORM_RANKING_BUDGET`` sets it (in seconds, e.g. ``0.05``).
+"""
+
+import random
+import time
+
+import pytest
+
+from tino_storm.env import env_float
+from tino_storm.retrieval.similarity import bm25_scores, sequence_scores
+
+RANKING_BUDGET_SECONDS = env_float("STORM_RANKING_BUDGET", None)
+
+_WORDS = (
+    "storm hurricane cyclone pressure ocean warm water wind shear eye wall rain "
+    "surge landfall forecast satellite category season atlantic pacific tropical "
+    "depression meteorology climate model track intensity damage coast flooding"
+).split()
+
+
+def _turn(results=30, snippet_chars=1000, seed=0):
+    rng = random.Random(seed)
+
+    def text(chars):
+        words = []
+        while sum(len(w) + 1 for w in words) < chars:
+            words.append(rng.choice(_WORDS))
+        return " ".join(words)[:chars]
+
+    question = text(120) + "?"
+    return question, [text(snippet_chars) for _ in range(results)]
+
+
+def _per_turn(scorer, question, snippets, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scorer(question, snippets)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_bm25_turn_ranking_beats_sequence_matching():
+    question, snippets = _turn()
+    bm25 = _per_turn(bm25_scores, question, snippets)
+    sequence = _per_turn(sequence_scores, question, snippets, repeat=1)
+
+    assert bm25 < sequence
+
+
+@pytest.mark.skipif(
+    RANKING_BUDGET_SECONDS is None, reason="set STORM_RANKING_BUDGET to check"
+)
+def test_bm25_turn_ranking_fits_budget():
+    question, snippets = _turn()
+
+    assert _per_turn(bm25_scores, question, snippets) < RANKING_BUDGET_SECONDS
+
+
+if __name__ == "__main__":  # pragma: no cover - manual benchmark
+    for results, chars in ((9, 1000), (30, 1000), (30, 4000)):
+        question, snippets = _turn(results, chars)
+        print(
+            f"{results:3d} results x {chars:4d} chars: "
+            f"bm25 {_per_turn(bm25_scores, question, snippets) * 1e3:8.2f} ms, "
+            f"sequence {_per_turn(sequence_scores, question, snippets, 1) * 1e3:8.2f} ms"
+        )
@@ -0,0 +1,94 @@
+import time
+
+from tino_storm.providers import DefaultProvider
+from tino_storm.providers.base import SUMMARY_BATCH_PROMPT, SUMMARY_PROMPT
+from tino_storm.providers.summary_cache import (
+    SummaryCache,
+    get_summary_cache,
+    summary_cache_key,
+)
+
+
+def test_summary_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    key = summary_cache_key("model", "template", "snippet")
+
+    first = SummaryCache(path)
+    first.set(key, "summary")
+    first.close()
+
+    second = SummaryCache(path)
+    assert second.get(key) == "summary"
+    assert second.get(summary_cache_key("other-model", "template", "snippet")) is None
+
+
+def test_summary_cache_expires_entries(tmp_path):
+    cache = SummaryCache(tmp_path / "cache.sqlite3", ttl=0.01)
+    cache.set("k", "v")
+    time.sleep(0.02)
+    assert cache.get("k") is None
+
+
+def test_summary_cache_prunes_least_recently_used(tmp_path):
+    cache = SummaryCache(tmp_path / "cache.sqlite3", max_entries=2, memory_entries=0)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        time.sleep(0.001)
+    cache.get("a")
+    cache.prune()
+
+    assert len(cache) == 2
+    assert SummaryCache(tmp_path / "cache.sqlite3").get("b") is None
+
+
+def test_summary_cache_hits_write_access_times_lazily(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SummaryCache(path, memory_entries=0)
+    cache.set("a", "summary")
+    (stored,) = cache._conn.execute("SELECT accessed FROM entries").fetchone()
+    changes = cache._conn.total_changes
+
+    time.sleep(0.001)
+    assert cache.get("a") == "summary"
+    assert cache._conn.total_changes == changes
+
+    cache.close()
+    reopened = SummaryCache(path)
+    (accessed,) = reopened._conn.execute("SELECT accessed FROM entries").fetchone()
+    assert accessed > stored
+
+
+def test_default_provider_reuses_persisted_summaries(monkeypatch):
+    monkeypatch.setenv("STORM_SUMMARY_MODEL", "model")
+    monkeypatch.setattr(
+        "tino_storm.providers.base.search_vaults",
+        lambda *a, **k: [
+            {"url": "u1", "snippets": ["s1"], "meta": {}},
+            {"url": "u2", "snippets": ["s2"], "meta": {}},
+        ],
+    )
+    calls = 0
+
+    def fake_summarizer(prompt, **kwargs):
+        nonlocal calls
+        calls += 1
+        return ['["one", "two"]']
+
+    for _ in range(2):
+        provider = DefaultProvider()
+        monkeypatch.setattr(provider, "_get_summarizer", lambda: fake_summarizer)
+        results = provider.search_sync("q", [])
+        assert [r.summary for r in results] == ["one", "two"]
+
+    assert calls == 1
+    # Batched summaries are keyed on the batch prompt and the passage it sent
+    cache = get_summary_cache()
+    assert cache.get(summary_cache_key("model", SUMMARY_BATCH_PROMPT, "s1")) == "one"
+    assert cache.get(summary_cache_key("model", SUMMARY_PROMPT, "s1")) is None
+
+
+def test_summary_cache_can_be_disabled(monkeypatch):
+    from tino_storm.providers.summary_cache import get_summary_cache
+
+    monkeypatch.setenv("STORM_SUMMARY_CACHE", "off")
+    assert get_summary_cache() is None
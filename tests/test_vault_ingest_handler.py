@@ -103,10 +103,15 @@ def test_handle_urls(monkeypatch, tmp_path):
     monkeypatch.setattr(
         handler, "_ingest_text", lambda text, src, v: captured.append((text, src, v))
     )
+    fetched = []
+
+    class DummyCrawler:
+        def fetch_html_many(self, batch):
+            fetched.append(list(batch))
+            return [{"url": url, "html": url} for url in batch]
+
     monkeypatch.setattr(
-        "tino_storm.ingest.watcher.trafilatura.fetch_url",
-        lambda url: url,
-        raising=False,
+        "tino_storm.ingest.watcher.WebCrawler", lambda *a, **k: DummyCrawler()
     )
     monkeypatch.setattr(
         "tino_storm.ingest.watcher.trafilatura.extract", lambda html: html
@@ -114,6 +119,7 @@ def test_handle_urls(monkeypatch, tmp_path):
     handler._handle_file(file, "topic")
     assert [c[1] for c in captured] == urls
     assert len(captured) == len(urls)
+    assert fetched == [urls]
 
 
 def test_handle_web(monkeypatch, tmp_path):
@@ -126,8 +132,8 @@ def test_handle_web(monkeypatch, tmp_path):
         def __init__(self):
             self._res = pages.copy()
 
-        def fetch(self, url):
-            return self._res.pop(0)
+        def fetch_many(self, urls):
+            return [self._res.pop(0) for _ in urls]
 
     root = tmp_path / "vault"
     vault = root / "topic"
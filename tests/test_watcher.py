@@ -146,7 +146,9 @@ def test_ingest_txt_documents(monkeypatch, tmp_path):
 
     collection = handler.client.get_or_create_collection("topic")
     assert collection.docs == ["d1", "d2"]
-    assert len(events) == 2
+    assert len(events) == 1
+    assert events[0].information_table["count"] == 2
+    assert events[0].information_table["sources"] == [str(file_path)] * 2
 
 
 def test_handler_uses_watchdog(tmp_path):
@@ -0,0 +1,184 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from tino_storm.core.utils import WebPageHelper
+from tino_storm.ingestion import extraction
+from tino_storm.ingestion.extraction import PageExtractor
+
+
+class _Splitter:
+    def split_text(self, text):
+        return [text[i : i + 10] for i in range(0, len(text), 10)]
+
+
+def _helper(monkeypatch, pages, extractor, extract=None):
+    helper = WebPageHelper(min_char_count=5)
+    helper.page_extractor = extractor
+    helper.text_splitter = _Splitter()
+    monkeypatch.setattr(helper, "download_webpage", lambda url: pages(url))
+    calls = []
+
+    def extract_article(html):
+        calls.append(html)
+        if extract is not None:
+            extract(html)
+        return html.decode().upper()
+
+    monkeypatch.setattr(extraction, "extract_article", extract_article)
+    return helper, calls
+
+
+def test_snippets_keep_url_order_and_reuse_cached_text(monkeypatch):
+    bodies = {"http://a.test/1": b"first page text", "http://a.test/2": b"tiny"}
+    helper, calls = _helper(
+        monkeypatch, bodies.get, PageExtractor(processes=1, batch_size=2)
+    )
+    urls = ["http://a.test/2", "http://a.test/1", "http://a.test/missing"]
+
+    articles = helper.urls_to_snippets(urls)
+    assert list(articles) == ["http://a.test/1"]
+    assert articles["http://a.test/1"] == {
+        "text": "FIRST PAGE TEXT",
+        "snippets": ["FIRST PAGE", " TEXT"],
+    }
+
+    assert helper.urls_to_articles(urls) == {
+        "http://a.test/1": {"text": "FIRST PAGE TEXT"}
+    }
+    assert len(calls) == 2
+
+
+def test_extraction_overlaps_with_downloads(monkeypatch):
+    started = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(PageExtractor, "_pool", lambda self: pool)
+
+    def pages(url):
+        if url.endswith("slow"):
+            assert started.wait(5), "extraction waited for every download"
+        return url.encode() + b" body text"
+
+    helper, _ = _helper(
+        monkeypatch,
+        pages,
+        PageExtractor(processes=2, batch_size=1),
+        extract=lambda html: started.set(),
+    )
+    urls = ["http://a.test/fast", "http://a.test/slow"]
+
+    assert list(helper.urls_to_articles(urls)) == urls
+    pool.shutdown()
+
+
+def test_failed_pool_falls_back_inline(monkeypatch):
+    def broken(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(PageExtractor, "_pool", broken)
+    helper, _ = _helper(
+        monkeypatch, lambda url: b"some page text", PageExtractor(processes=2)
+    )
+
+    articles = helper.urls_to_snippets(["http://a.test/x"])
+    assert articles["http://a.test/x"]["snippets"] == ["SOME PAGE ", "TEXT"]
+
+
+def test_iter_articles_yields_before_slow_downloads_finish(monkeypatch):
+    consumed = threading.Event()
+
+    def pages(url):
+        if url.endswith("slow"):
+            assert consumed.wait(5), "first article was not yielded early"
+        return url.encode() + b" body text"
+
+    helper, _ = _helper(monkeypatch, pages, PageExtractor(processes=1, batch_size=1))
+    articles = helper.iter_articles(["http://a.test/slow", "http://a.test/fast"])
+
+    url, article = next(articles)
+    assert url == "http://a.test/fast"
+    assert article == {"text": "HTTP://A.TEST/FAST BODY TEXT"}
+    consumed.set()
+    assert [u for u, _ in articles] == ["http://a.test/slow"]
+
+
+def test_partial_batch_is_flushed_when_extractor_is_idle(monkeypatch):
+    consumed = threading.Event()
+
+    def pages(url):
+        if url.endswith("slow"):
+            assert consumed.wait(5), "partial batch waited for every download"
+        return url.encode() + b" body text"
+
+    helper, _ = _helper(monkeypatch, pages, PageExtractor(processes=1, batch_size=4))
+    articles = helper.iter_articles(["http://a.test/slow", "http://a.test/fast"])
+
+    assert next(articles)[0] == "http://a.test/fast"
+    consumed.set()
+    assert [u for u, _ in articles] == ["http://a.test/slow"]
+
+
+def test_partial_batch_is_flushed_after_linger(monkeypatch):
+    second = threading.Event()
+    first_done = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(PageExtractor, "_pool", lambda self: pool)
+
+    def pages(url):
+        if url.endswith("slow"):
+            assert first_done.wait(5)
+        elif url.endswith("2"):
+            time.sleep(0.05)
+        return url.encode() + b" body text"
+
+    def extract(html):
+        if html.startswith(b"http://a.test/1"):
+            # The first batch is still busy when the second page arrives
+            assert second.wait(5), "partial batch waited for the busy extractor"
+            first_done.set()
+        else:
+            second.set()
+
+    helper, _ = _helper(
+        monkeypatch,
+        pages,
+        PageExtractor(processes=2, batch_size=4, linger=0.01),
+        extract=extract,
+    )
+    urls = ["http://a.test/1", "http://a.test/2", "http://a.test/slow"]
+
+    assert sorted(helper.urls_to_articles(urls)) == urls
+    pool.shutdown()
+
+
+def test_cached_text_skips_the_extractor(monkeypatch):
+    class Cache:
+        def get_text(self, url, extractor, body):
+            return "cached article text"
+
+    class CountingExtractor(PageExtractor):
+        def submit(self, items, *args):
+            raise AssertionError("cached text was sent to the extractor")
+
+    helper, calls = _helper(
+        monkeypatch, lambda url: b"page", CountingExtractor(processes=2)
+    )
+    helper.http_cache = Cache()
+
+    articles = helper.urls_to_snippets(["http://a.test/x"])
+    assert articles["http://a.test/x"]["snippets"] == ["cached art", "icle text"]
+    assert calls == []
+
+
+def test_download_enforces_max_page_bytes():
+    def handler(request):
+        size = 100 if request.url.path == "/big" else 10
+        return httpx.Response(200, content=b"x" * size)
+
+    helper = WebPageHelper(max_page_bytes=50)
+    helper.httpx_client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert helper.download_webpage("http://a.test/small") == b"x" * 10
+    assert helper.download_webpage("http://a.test/big") is None